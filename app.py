@@ -1,15 +1,13 @@
 import streamlit as st
+import io
 import os
 import tempfile
 import logging
-import json
 from pathlib import Path
-from src.converters.docx_converter import DocxConverter
-from src.converters.pptx_converter import PptxConverter
-from src.converters.html_converter import HtmlConverter
-from src.converters.image_converter import ImageConverter
-from src.converters.csv_converter import CsvConverter
-from src.converters.xml_json_converter import XmlJsonConverter
+from src.converters.registry import CONVERTERS, get_converter, normalize_result
+from src.utils.document_formatter import DocumentFormatter
+from src.tread.instrumentation import span
+from src.tread.monitoring import get_monitor
 from utils.system_check import verify_system_requirements
 
 # Configure logging
@@ -17,22 +15,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize converters
-converters = {
-    '.docx': DocxConverter(),
-    '.doc': DocxConverter(),
-    '.pptx': PptxConverter(),
-    '.ppt': PptxConverter(),
-    '.html': HtmlConverter(),
-    '.htm': HtmlConverter(),
-    '.jpg': ImageConverter(),
-    '.jpeg': ImageConverter(),
-    '.png': ImageConverter(),
-    '.tiff': ImageConverter(),
-    '.bmp': ImageConverter(),
-    '.csv': CsvConverter(),
-    '.json': XmlJsonConverter(),
-    '.xml': XmlJsonConverter()
-}
+converters = {extension: get_converter(extension) for extension in CONVERTERS}
 
 # Cache dictionary loading
 @st.cache_data
@@ -40,6 +23,22 @@ def load_cached_dictionary():
     from src.utils.medical_terms import load_medical_dictionary
     return load_medical_dictionary()
 
+# Load spaCy pipeline once per server process instead of on first upload
+@st.cache_resource
+def warm_up_nlp():
+    from src.utils.nlp_models import warm_up
+    warm_up()
+
+def render_download(write, result, **options) -> io.BytesIO:
+    """Stream a result writer straight into the in-memory download buffer"""
+    buffer = io.BytesIO()
+    stream = io.TextIOWrapper(buffer, encoding='utf-8', write_through=True)
+    with span('format', writer=write.__name__):
+        write(result, stream, **options)
+    stream.detach()
+    buffer.seek(0)
+    return buffer
+
 # Set page config
 st.set_page_config(
     page_title='Медицинский Конвертер Документов',
@@ -71,6 +70,8 @@ if not system_ok:
     st.error('⚠️ Система не готова к работе. Пожалуйста, установите необходимые компоненты.')
     st.stop()
 
+warm_up_nlp()
+
 # File uploader
 st.header('Выберите документы')
 
@@ -132,106 +133,60 @@ if uploaded_files:
             converter = converters.get(file_ext)
             
             if converter:
+                # Stage spans of this file are served to `pdf-monitor`
+                get_monitor().start_file_processing(uploaded_file.name)
+
                 # Process file
                 with st.spinner(f'Обработка {uploaded_file.name}...'):
-                    result = converter.convert(
+                    result = normalize_result(converter.convert(
                         tmp_path,
                         process_tables=process_tables,
                         extract_terms=highlight_terms
-                    )
+                    ))
                     
                     # Create result files
                     base_name = Path(uploaded_file.name).stem
                     
                     if output_format == 'TXT':
                         output_file = f"{base_name}_результат.txt"
-                        with open(output_file, 'w', encoding='utf-8') as f:
-                            f.write(result['text'])
-                            if process_tables and result.get('tables'):
-                                f.write('\n\nТАБЛИЦЫ:\n')
-                                for table in result['tables']:
-                                    for row in table:
-                                        f.write('\t'.join(str(cell) for cell in row) + '\n')
-                                    f.write('\n')
-                        
-                        with open(output_file, 'r', encoding='utf-8') as f:
-                            st.download_button(
-                                label=f"⬇️ Скачать TXT результат",
-                                data=f.read(),
-                                file_name=output_file,
-                                mime='text/plain'
-                            )
+                        st.download_button(
+                            label=f"⬇️ Скачать TXT результат",
+                            data=render_download(DocumentFormatter.write_plain_text, result,
+                                                 include_metadata=False, include_tables=process_tables),
+                            file_name=output_file,
+                            mime='text/plain'
+                        )
                     
                     elif output_format == 'HTML':
                         output_file = f"{base_name}_результат.html"
-                        with open(output_file, 'w', encoding='utf-8') as f:
-                            html_content = result['text']
-                            
-                            if highlight_terms:
-                                for term in result['terms']:
-                                    html_content = html_content.replace(
-                                        term['term'],
-                                        f'<span title="{term["definition"]}" '
-                                        f'style="background-color: #e6f3ff;">{term["term"]}</span>'
-                                    )
-                            
-                            if process_tables and result.get('tables'):
-                                html_content += '\n<h2>Таблицы:</h2>\n'
-                                for table in result['tables']:
-                                    html_content += '\n<table border="1">\n'
-                                    for row in table:
-                                        html_content += '<tr>'
-                                        for cell in row:
-                                            html_content += f'<td>{cell}</td>'
-                                        html_content += '</tr>\n'
-                                    html_content += '</table>\n'
-                            
-                            f.write(f"""<html>
-                            <head>
-                                <meta charset="utf-8">
-                                <style>
-                                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                                    table {{ border-collapse: collapse; margin: 10px 0; }}
-                                    td, th {{ padding: 8px; }}
-                                </style>
-                            </head>
-                            <body>{html_content}</body>
-                            </html>""")
-                        
-                        with open(output_file, 'r', encoding='utf-8') as f:
-                            st.download_button(
-                                label=f"⬇️ Скачать HTML результат",
-                                data=f.read(),
-                                file_name=output_file,
-                                mime='text/html'
-                            )
+                        st.download_button(
+                            label=f"⬇️ Скачать HTML результат",
+                            data=render_download(DocumentFormatter.write_html, result,
+                                                 include_tables=process_tables, highlight_terms=highlight_terms),
+                            file_name=output_file,
+                            mime='text/html'
+                        )
                     
                     else:  # JSON
                         output_file = f"{base_name}_результат.json"
-                        with open(output_file, 'w', encoding='utf-8') as f:
-                            # Filter results based on user settings
-                            if not process_tables:
-                                result.pop('tables', None)
-                            if not highlight_terms:
-                                result.pop('terms', None)
-                            
-                            json.dump(result, f, ensure_ascii=False, indent=2)
+                        # Filter results based on user settings
+                        if not process_tables:
+                            result.pop('tables', None)
+                        if not highlight_terms:
+                            result.pop('terms', None)
                         
-                        with open(output_file, 'r', encoding='utf-8') as f:
-                            st.download_button(
-                                label=f"⬇️ Скачать JSON результат",
-                                data=f.read(),
-                                file_name=output_file,
-                                mime='application/json'
-                            )
+                        st.download_button(
+                            label=f"⬇️ Скачать JSON результат",
+                            data=render_download(DocumentFormatter.write_json, result),
+                            file_name=output_file,
+                            mime='application/json'
+                        )
 
                 # Success message
                 st.success(f'✅ {uploaded_file.name} обработан успешно!')
 
             # Cleanup
             os.unlink(tmp_path)
-            if 'output_file' in locals():
-                os.unlink(output_file)
 
         except Exception as e:
             st.error(f'❌ Ошибка при обработке {uploaded_file.name}: {str(e)}')
@@ -0,0 +1,50 @@
+"""Compare OCR accuracy against the number of Tesseract passes.
+
+Every image in DATA_DIR needs a ground-truth text file next to it with
+the same name and a .txt extension (scan_01.png + scan_01.txt).
+
+Usage: python -m benchmarks.bench_ocr_variants path/to/samples --thresholds 60,70,80,90
+"""
+from pathlib import Path
+import time
+import click
+import cv2
+from src.utils.ocr_handler import run_ocr_variants, text_accuracy
+
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp'}
+
+
+def _load_samples(data_dir: Path):
+    for image_path in sorted(data_dir.iterdir()):
+        reference_path = image_path.with_suffix('.txt')
+        if image_path.suffix.lower() in IMAGE_SUFFIXES and reference_path.exists():
+            yield image_path, cv2.imread(str(image_path)), reference_path.read_text(encoding='utf-8')
+
+
+@click.command()
+@click.argument('data_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--thresholds', default='60,70,80,90', help='Comma-separated confidence thresholds')
+def main(data_dir: str, thresholds: str):
+    """Report mean accuracy, passes and time per strategy."""
+    samples = list(_load_samples(Path(data_dir)))
+    if not samples:
+        raise click.ClickException('No image/.txt pairs found')
+
+    strategies = [('all variants', float('inf'))]
+    strategies += [(f'early exit @{value}', float(value)) for value in thresholds.split(',')]
+
+    click.echo(f'{"strategy":>18} | {"accuracy":>8} | {"passes":>6} | {"sec/page":>8}')
+    for label, threshold in strategies:
+        accuracy = passes = elapsed = 0.0
+        for _, image, reference in samples:
+            start = time.perf_counter()
+            result = run_ocr_variants(image, confidence_threshold=threshold)
+            elapsed += time.perf_counter() - start
+            accuracy += text_accuracy(result['text'], reference)
+            passes += result['passes']
+        count = len(samples)
+        click.echo(f'{label:>18} | {accuracy / count:8.3f} | {passes / count:6.2f} | {elapsed / count:8.2f}')
+
+
+if __name__ == '__main__':
+    main()
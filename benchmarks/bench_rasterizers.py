@@ -0,0 +1,39 @@
+"""Compare PDF rasterization backends on the same document.
+
+Usage: python -m benchmarks.bench_rasterizers path/to/file.pdf --pages 20
+"""
+import time
+import click
+from src.utils.rasterizer import RASTERIZERS, get_rasterizer
+
+
+@click.command()
+@click.argument('pdf_path', type=click.Path(exists=True))
+@click.option('--pages', default=10, help='Number of pages to render')
+@click.option('--dpi', default=150, help='Render resolution')
+@click.option('--width', default=800, help='Target page width in pixels (0 to use dpi)')
+def main(pdf_path: str, pages: int, dpi: int, width: int):
+    """Render the first pages with every rasterizer and report timings."""
+    for name in RASTERIZERS:
+        try:
+            rasterizer = get_rasterizer(name)
+            total_pages = min(pages, rasterizer.page_count(pdf_path))
+        except Exception as e:
+            click.echo(f'{name:>10}: unavailable ({e})')
+            continue
+
+        start = time.perf_counter()
+        pixels = 0
+        for page_number in range(1, total_pages + 1):
+            pixels += rasterizer.render(pdf_path, page_number, dpi, width or None).size
+        elapsed = time.perf_counter() - start
+        rasterizer.close()
+
+        click.echo(
+            f'{name:>10}: {total_pages} pages in {elapsed:.2f}s '
+            f'({total_pages / elapsed:.1f} pages/s, {pixels / total_pages / 1e6:.2f} MPix/page)'
+        )
+
+
+if __name__ == '__main__':
+    main()
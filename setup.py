@@ -32,6 +32,8 @@ setup(
     entry_points={
         'console_scripts': [
             'pdf-monitor=src.cli.monitor:monitor',
+            'build-medical-dictionary=src.cli.build_dictionary:build_dictionary',
+            'medical-convert=src.cli.convert:convert',
         ],
     },
 )
\ No newline at end of file
@@ -1,36 +1,264 @@
+"""
+Staged asyncio pipeline with bounded queues between the stages
+
+Items flow through the stages (e.g. rasterize -> preprocess -> OCR ->
+post-process) via asyncio.Queue(maxsize=queue_size), so a slow stage
+holds back the ones before it instead of letting decoded pages pile up.
+Every stage has its own concurrency limit and runs on a thread pool, a
+process pool or directly on the event loop. Results are streamed as they
+become ready, in input order or in completion order.
+"""
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Callable, Any
 import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+from src.utils.page_engine import _ocr_page
+
+EXECUTORS = ('thread', 'process', 'inline')
+
+# End of input; each worker of a stage puts it back for its siblings
+_DONE = object()
+
+
+class Stage:
+    """One pipeline step: func is applied to each item by up to `concurrency` workers
+
+    executor: 'thread' for I/O and code that releases the GIL, 'process' for
+    CPU-bound Python (func and items must be picklable), 'inline' for cheap
+    functions and coroutine functions, which run on the event loop itself.
+    An Executor instance runs the stage on that pool instead; it is owned
+    by the caller and not shut down by AsyncProcessor.close().
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], concurrency: int = 1,
+                 executor: Union[str, Executor] = 'thread'):
+        if not isinstance(executor, Executor) and executor not in EXECUTORS:
+            raise ValueError(f'Unknown executor: {executor}')
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.name = name
+        self.func = func
+        self.concurrency = concurrency
+        self.executor = executor
+
+    def __repr__(self):
+        return f'Stage({self.name!r}, concurrency={self.concurrency}, executor={self.executor!r})'
+
+
+class StageError(Exception):
+    """A stage raised on one item; the original exception is __cause__"""
+
+    def __init__(self, stage: str, index: int, error: BaseException):
+        super().__init__(f'Stage {stage} failed on item {index}: {error}')
+        self.stage = stage
+        self.index = index
+        self.error = error
+
+
+class _Failed:
+    """Result slot of an item whose stage raised; later stages pass it through"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: StageError):
+        self.error = error
+
+
+async def _aiter(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def page_stages(workers: Optional[int] = None,
+                post_process: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                executor: Optional[Executor] = None) -> List[Stage]:
+    """Stages turning (pdf_path, page_number, options) tasks into page results
+
+    options is a PageOCREngine's options dict. Rendering, binarization and
+    OCR of a page run back to back in one worker process, so the page image
+    never crosses a process boundary; only the task and the text result are
+    pickled. executor is the process pool to use (e.g. the engine's),
+    otherwise AsyncProcessor creates one. post_process (e.g. plugins) runs
+    on a single thread, one page at a time.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    stages = [Stage('ocr_page', _ocr_page, workers, executor or 'process')]
+    if post_process is not None:
+        stages.append(Stage('post_process', post_process, 1, 'thread'))
+    return stages
+
 
 class AsyncProcessor:
-    def __init__(self, max_workers=None):
+    """Runs items through Stage pipelines; pools are kept for reuse until close()"""
+
+    def __init__(self, max_workers: Optional[int] = None, queue_size: Optional[int] = None):
         self.max_workers = max_workers or multiprocessing.cpu_count()
-        self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
-        self.loop = None
-
-    async def process_batch(self, items: List[Any], process_func: Callable) -> List[Any]:
-        if self.loop is None:
-            self.loop = asyncio.get_event_loop()
-        
-        tasks = []
-        for item in items:
-            task = self.loop.run_in_executor(self.executor, process_func, item)
-            tasks.append(task)
-        
-        results = await asyncio.gather(*tasks)
-        return results
+        self.queue_size = queue_size or self.max_workers * 2
+        self._executors: Dict[tuple, Executor] = {}
+
+    def _get_executor(self, stage: Stage) -> Optional[Executor]:
+        """Pool sized to the stage's concurrency, created on first use"""
+        if isinstance(stage.executor, Executor):
+            return stage.executor
+        if stage.executor == 'inline':
+            return None
+        key = (stage.name, stage.executor, stage.concurrency)
+        executor = self._executors.get(key)
+        if executor is None:
+            pool = ProcessPoolExecutor if stage.executor == 'process' else ThreadPoolExecutor
+            executor = self._executors[key] = pool(max_workers=stage.concurrency)
+        return executor
+
+    async def _worker(self, stage: Stage, executor: Optional[Executor],
+                      inbox: asyncio.Queue, outbox: asyncio.Queue, running: List[int]):
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await inbox.get()
+            if entry is _DONE:
+                await inbox.put(_DONE)
+                running[0] -= 1
+                if running[0] == 0:
+                    # Last worker of the stage: siblings have delivered everything
+                    await outbox.put(_DONE)
+                return
+
+            index, value = entry
+            if not isinstance(value, _Failed):
+                try:
+                    if asyncio.iscoroutinefunction(stage.func):
+                        value = await stage.func(value)
+                    elif executor is None:
+                        value = stage.func(value)
+                    else:
+                        value = await loop.run_in_executor(executor, stage.func, value)
+                except Exception as e:
+                    error = StageError(stage.name, index, e)
+                    error.__cause__ = e
+                    value = _Failed(error)
+            await outbox.put((index, value))
+
+    async def stream(self, items: Union[Iterable, AsyncIterable], stages: List[Stage],
+                     ordered: bool = True, return_exceptions: bool = False,
+                     queue_size: Optional[int] = None,
+                     max_in_flight: Optional[int] = None) -> AsyncIterator[Any]:
+        """
+        Yield the result of every item after the last stage
+
+        Args:
+            items: iterable or async iterable, consumed only as capacity frees up
+            stages: applied to each item in order
+            ordered: results in input order; False yields them as they complete
+            return_exceptions: yield a StageError in place of a failed item
+                instead of raising it (which cancels the pipeline)
+            queue_size: capacity of each queue between stages
+            max_in_flight: items taken from the input but not yielded yet,
+                including results waiting for an earlier item in ordered mode
+                (default: queue_size plus the concurrency of every stage)
+
+        Closing the generator early cancels everything still in flight;
+        work already running in a pool finishes but its result is dropped.
+        """
+        if not stages:
+            raise ValueError('At least one stage is required')
+        queue_size = queue_size or self.queue_size
+        max_in_flight = max_in_flight or queue_size + sum(stage.concurrency for stage in stages)
+        queues = [asyncio.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        window = asyncio.Semaphore(max_in_flight)
+        source_error = []
+
+        async def feed():
+            try:
+                index = 0
+                async for item in _aiter(items):
+                    await window.acquire()
+                    await queues[0].put((index, item))
+                    index += 1
+            except Exception as e:
+                source_error.append(e)
+            await queues[0].put(_DONE)
 
-    def process_batch_sync(self, items: List[Any], process_func: Callable) -> List[Any]:
+        tasks = [asyncio.create_task(feed())]
+        for i, stage in enumerate(stages):
+            executor = self._get_executor(stage)
+            running = [stage.concurrency]
+            tasks.extend(
+                asyncio.create_task(self._worker(stage, executor, queues[i], queues[i + 1], running))
+                for _ in range(stage.concurrency)
+            )
+
+        def unwrap(value):
+            if isinstance(value, _Failed):
+                if return_exceptions:
+                    return value.error
+                raise value.error
+            return value
+
+        waiting: Dict[int, Any] = {}
+        next_index = 0
+        try:
+            while True:
+                entry = await queues[-1].get()
+                if entry is _DONE:
+                    break
+                index, value = entry
+                if not ordered:
+                    window.release()
+                    yield unwrap(value)
+                    continue
+                waiting[index] = value
+                while next_index in waiting:
+                    value = waiting.pop(next_index)
+                    next_index += 1
+                    window.release()
+                    yield unwrap(value)
+            if source_error:
+                raise source_error[0]
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stream_pages(self, pdf_path: str, first_page: int, last_page: int, options: Dict[str, Any],
+                     post_process: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                     executor: Optional[Executor] = None, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """OCR results for pages first_page..last_page (inclusive) through page_stages()
+
+        Failed pages do not stop the stream: like PageOCREngine they come
+        back with an 'error' message and empty text.
+        """
+        tasks = ((pdf_path, page, options) for page in range(first_page, last_page + 1))
+        return self.stream(tasks, page_stages(self.max_workers, post_process, executor), **kwargs)
+
+    async def process_batch(self, items: Iterable[Any], process_func: Callable,
+                            executor: str = 'thread') -> List[Any]:
+        """Apply process_func to every item with at most max_workers running at once"""
+        stage = Stage('process', process_func, self.max_workers, executor)
         try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        self.loop = loop
-        return loop.run_until_complete(self.process_batch(items, process_func))
+            return [result async for result in self.stream(items, [stage])]
+        except StageError as e:
+            raise e.error
+
+    def process_batch_sync(self, items: Iterable[Any], process_func: Callable,
+                           executor: str = 'thread') -> List[Any]:
+        return asyncio.run(self.process_batch(items, process_func, executor))
+
+    def close(self):
+        """Shut down the stage pools"""
+        # Queued work was cancelled with its stream (shutdown(cancel_futures=) needs 3.9)
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        self._executors.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def __del__(self):
-        if self.executor:
-            self.executor.shutdown(wait=False)
\ No newline at end of file
+        if getattr(self, '_executors', None):
+            self.close()
@@ -1,42 +1,195 @@
-import streamlit as st
+from collections import OrderedDict
 from typing import Any, Dict
 import hashlib
 import json
 import os
+import threading
+import time
+from .utils.file_hash import file_digest
 
 class ResultCache:
-    def __init__(self, cache_dir: str = '.cache'):
+    """Two-tier result cache: in-process LRU in front of a shared disk tier
+
+    The memory tier keeps hot results up to memory_limit bytes. The disk
+    tier stores one JSON file per key and evicts least recently ('lru') or
+    least frequently ('lfu') used entries once disk_limit bytes is exceeded.
+    The disk tier can be shared by several processes.
+    """
+
+    def __init__(self, cache_dir: str = '.cache', memory_limit: int = 64 * 1024 * 1024,
+                 disk_limit: int = 1024 * 1024 * 1024, policy: str = 'lru'):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f'Unknown eviction policy: {policy}')
         self.cache_dir = cache_dir
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.policy = policy
         os.makedirs(cache_dir, exist_ok=True)
-    
+
+        self._lock = threading.RLock()
+        # key -> UTF-8 JSON; storing the encoding keeps callers from sharing objects
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_bytes = 0
+        # key -> [size, last_access, hits]
+        self._disk: Dict[str, list] = {}
+        self._disk_bytes = 0
+        self._counters = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'memory_evictions': 0,
+            'disk_evictions': 0
+        }
+        self._load_disk_index()
+
     def get_cache_key(self, content: bytes, context: Dict = None) -> str:
         """Generate cache key from content and context"""
         hasher = hashlib.sha256(content)
         if context:
             hasher.update(json.dumps(context, sort_keys=True).encode())
         return hasher.hexdigest()
-    
-    @staticmethod
-    @st.cache_data(ttl=3600)
-    def _cached_get(cache_dir: str, key: str) -> Any:
-        """Static cached method for getting results"""
-        cache_file = os.path.join(cache_dir, f'{key}.json')
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        return None
+
+    def get_file_cache_key(self, file_path: str, context: Dict = None, digest: str = None) -> str:
+        """Generate cache key from file without reading it into memory
+
+        Pass a digest already computed for this request to skip hashing.
+        """
+        hasher = hashlib.sha256((digest or file_digest(file_path)).encode())
+        if context:
+            hasher.update(json.dumps(context, sort_keys=True).encode())
+        return hasher.hexdigest()
+
+    def _cache_file(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _load_disk_index(self):
+        """Build disk tier index from file stats (files are not opened)"""
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json') and entry.is_file():
+                    stat = entry.stat()
+                    self._disk[entry.name[:-5]] = [stat.st_size, stat.st_mtime, 0]
+                    self._disk_bytes += stat.st_size
 
     def get(self, key: str) -> Any:
-        """Get cached result"""
-        return self._cached_get(self.cache_dir, key)
-    
+        """Get cached result, or None on miss"""
+        with self._lock:
+            encoded = self._memory.get(key)
+            if encoded is not None:
+                self._memory.move_to_end(key)
+                self._counters['memory_hits'] += 1
+                self._touch_disk(key)
+                return json.loads(encoded)
+
+        # Disk reads happen outside the lock; the file may also come from another process
+        try:
+            with open(self._cache_file(key), 'rb') as f:
+                encoded = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._counters['misses'] += 1
+                self._forget_disk(key)
+            return None
+
+        with self._lock:
+            self._counters['disk_hits'] += 1
+            if key not in self._disk:
+                self._disk[key] = [len(encoded), time.time(), 0]
+                self._disk_bytes += self._disk[key][0]
+            self._touch_disk(key)
+            self._remember(key, encoded)
+        return json.loads(encoded)
+
     def set(self, key: str, value: Any):
-        """Cache result"""
-        cache_file = os.path.join(self.cache_dir, f'{key}.json')
-        with open(cache_file, 'w') as f:
-            json.dump(value, f)
-    
+        """Cache result in both tiers"""
+        encoded = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        size = len(encoded)
+
+        cache_file = self._cache_file(key)
+        tmp_file = f'{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp_file, cache_file)
+
+        with self._lock:
+            self._forget_disk(key)
+            self._disk[key] = [size, time.time(), 0]
+            self._disk_bytes += size
+            self._remember(key, encoded)
+            self._evict_disk()
+
     def clear(self):
         """Clear cache"""
-        for file in os.listdir(self.cache_dir):
-            os.remove(os.path.join(self.cache_dir, file))
\ No newline at end of file
+        with self._lock:
+            for file in os.listdir(self.cache_dir):
+                if file.endswith('.json'):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, file))
+                    except FileNotFoundError:
+                        pass
+            self._memory.clear()
+            self._memory_bytes = 0
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit ratio, tier sizes and eviction counters"""
+        with self._lock:
+            counters = dict(self._counters)
+            lookups = counters['memory_hits'] + counters['disk_hits'] + counters['misses']
+            hits = counters['memory_hits'] + counters['disk_hits']
+            return {
+                **counters,
+                'hit_ratio': hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes
+            }
+
+    def _touch_disk(self, key: str):
+        entry = self._disk.get(key)
+        if entry is not None:
+            entry[1] = time.time()
+            entry[2] += 1
+
+    def _forget_disk(self, key: str):
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[0]
+
+    def _remember(self, key: str, encoded: bytes):
+        """Put result into the memory tier, evicting least recently used"""
+        size = len(encoded)
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        if size > self.memory_limit:
+            return
+        self._memory[key] = encoded
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._counters['memory_evictions'] += 1
+
+    def _evict_disk(self):
+        """Shrink disk tier to 90% of its quota so eviction is not run on every set"""
+        if self._disk_bytes <= self.disk_limit:
+            return
+
+        if self.policy == 'lfu':
+            order = sorted(self._disk.items(), key=lambda item: (item[1][2], item[1][1]))
+        else:
+            order = sorted(self._disk.items(), key=lambda item: item[1][1])
+
+        target = self.disk_limit * 0.9
+        for key, (size, _, _) in order:
+            if self._disk_bytes <= target:
+                break
+            try:
+                os.remove(self._cache_file(key))
+            except FileNotFoundError:
+                pass
+            self._forget_disk(key)
+            self._counters['disk_evictions'] += 1
@@ -0,0 +1,29 @@
+import click
+from rich.console import Console
+from src.utils.medical_dictionary import (
+    DEFAULT_ARTIFACT, PATTERN_SOURCES, TERM_SOURCES, compile_dictionary
+)
+
+console = Console()
+
+@click.command()
+@click.option('--output', '-o', type=click.Path(dir_okay=False), default=str(DEFAULT_ARTIFACT),
+              help='Compiled dictionary file')
+@click.option('--terms', '-t', 'term_sources', multiple=True, type=click.Path(exists=True),
+              help='Term source (.txt "term|category|definition" or .json); repeatable')
+@click.option('--patterns', '-p', 'pattern_sources', multiple=True, type=click.Path(exists=True),
+              help='Regex pattern source; repeatable')
+def build_dictionary(output: str, term_sources: tuple, pattern_sources: tuple):
+    """Compile medical dictionaries into a memory-mappable artifact."""
+    summary = compile_dictionary(
+        output,
+        term_sources=term_sources or TERM_SOURCES,
+        pattern_sources=pattern_sources or PATTERN_SOURCES
+    )
+    console.print(
+        f"Compiled {summary['terms']} terms and {summary['patterns']} patterns "
+        f"into {output} ({summary['bytes']} bytes)"
+    )
+
+if __name__ == '__main__':
+    build_dictionary()
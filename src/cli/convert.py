@@ -0,0 +1,230 @@
+import glob
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, Tuple
+import click
+from rich.console import Console
+from src.converters.registry import CONVERTERS, get_converter, normalize_result
+from src.tread.config import TREAD_CONFIG
+from src.tread.instrumentation import get_instrumentation, span
+from src.tread.monitoring import get_monitor
+from src.utils.document_formatter import DocumentFormatter
+from src.utils.file_hash import hash_file
+
+console = Console()
+
+# Output format -> (file extension, DocumentFormatter writer)
+OUTPUT_FORMATS = {
+    'json': ('json', DocumentFormatter.write_json),
+    'txt': ('txt', DocumentFormatter.write_plain_text),
+    'md': ('md', DocumentFormatter.write_markdown),
+    'html': ('html', DocumentFormatter.write_html),
+}
+MANIFEST_NAME = '.convert-manifest.jsonl'
+
+
+def iter_input_files(inputs: Iterable[str], recursive: bool = True) -> Iterator[str]:
+    """Supported files from paths, directories and glob patterns, each once"""
+    seen = set()
+
+    def candidates(item: str) -> Iterator[str]:
+        if os.path.isdir(item):
+            if recursive:
+                for root, dirs, files in os.walk(item):
+                    dirs.sort()
+                    for name in sorted(files):
+                        yield os.path.join(root, name)
+            else:
+                for name in sorted(os.listdir(item)):
+                    yield os.path.join(item, name)
+        elif glob.has_magic(item):
+            yield from sorted(glob.iglob(item, recursive=True))
+        else:
+            yield item
+
+    for item in inputs:
+        for path in candidates(item):
+            if not os.path.isfile(path) or Path(path).suffix.lower() not in CONVERTERS:
+                continue
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                yield path
+
+
+def load_manifest(manifest_path: str) -> Set[str]:
+    """Content hashes of files a previous run completed"""
+    done = set()
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)['hash'])
+                except (ValueError, KeyError):
+                    # A line cut short by an interrupted run
+                    continue
+    return done
+
+
+def convert_to_file(path: str, digest: str, output_dir: str, output_format: str) -> str:
+    """Worker job: convert one file and write it to output_dir; returns the output path"""
+    extension, write = OUTPUT_FORMATS[output_format]
+    result = normalize_result(get_converter(Path(path).suffix).convert(path))
+    # The hash prefix keeps same-named inputs from different folders apart
+    output_path = os.path.join(output_dir, f'{Path(path).stem}-{digest[:12]}.{extension}')
+    partial_path = output_path + '.part'
+    with open(partial_path, 'w', encoding='utf-8') as f, span('format', format=output_format):
+        write(result, f)
+    os.replace(partial_path, output_path)
+    return output_path
+
+
+def convert_to_record(path: str, digest: str) -> str:
+    """Worker job: convert one file into a JSONL record"""
+    result = normalize_result(get_converter(Path(path).suffix).convert(path))
+    with span('format', format='jsonl'):
+        return DocumentFormatter.to_json({'source': path, 'hash': digest, 'result': result}, pretty=False)
+
+
+def run_timed(job: Callable, *args) -> Tuple[Any, Dict[str, float]]:
+    """Worker wrapper: job's result and the seconds spent per stage
+
+    Spans recorded in a worker process stay in that process; like
+    page_engine results, the timings travel back with the result so the
+    parent can record them in the monitor it serves.
+    """
+    recorder = get_instrumentation()
+    last = recorder.spans.latest()
+    value = job(*args)
+    timings: Dict[str, float] = {}
+    for recorded in recorder.recent_spans(last.seq if last else 0):
+        timings[recorded.stage] = timings.get(recorded.stage, 0.0) + recorded.duration
+    return value, timings
+
+
+def run_batch(inputs: Iterable[str], output: str, output_format: str = 'json',
+              workers: Optional[int] = None, queue_size: Optional[int] = None,
+              manifest_path: Optional[str] = None, recursive: bool = True) -> Dict[str, int]:
+    """
+    Convert files through a bounded job queue
+
+    output ending in .jsonl collects one record per file in that file,
+    anything else is a directory with one output_format file per input.
+    At most queue_size files are hashed and queued ahead of the workers;
+    workers=0 converts in this process. Completed content hashes go to the
+    manifest, and files whose content is already there are skipped.
+    If a worker process dies (crash, OOM kill), the files queued in that
+    pool count as failed and the pool is replaced for the remaining files.
+    Stage timings of every file are recorded in the process monitor
+    (get_monitor()), which `pdf-monitor` can watch while the batch runs.
+    """
+    jsonl = output.endswith('.jsonl')
+    if jsonl:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+    else:
+        Path(output).mkdir(parents=True, exist_ok=True)
+    manifest_path = manifest_path or (output + '.manifest' if jsonl else os.path.join(output, MANIFEST_NAME))
+    done = load_manifest(manifest_path)
+
+    monitor = get_monitor()
+    workers = TREAD_CONFIG['num_workers'] if workers is None else workers
+    queue_size = queue_size or max(1, workers) * 2
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    summary = {'converted': 0, 'skipped': 0, 'failed': 0}
+    pending: Dict[Future, Tuple[str, str]] = {}
+
+    def submit(path: str, digest: str) -> Future:
+        nonlocal executor
+        job, args = (convert_to_record, (path, digest)) if jsonl else \
+            (convert_to_file, (path, digest, output, output_format))
+        if executor is not None:
+            try:
+                return executor.submit(run_timed, job, *args)
+            except BrokenProcessPool:
+                # Its queued files fail in collect(); the rest get a fresh pool
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+                return executor.submit(run_timed, job, *args)
+        future = Future()
+        try:
+            # In-process spans already go to this process's recorder
+            future.set_result((job(*args), {}))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def collect(futures: Iterable[Future]):
+        for future in futures:
+            path, digest = pending.pop(future)
+            try:
+                value, timings = future.result()
+            except Exception as e:
+                summary['failed'] += 1
+                console.print(f'[red]✗ {path}: {e}[/red]')
+                continue
+            monitor.instrumentation.record_timings(timings, file=os.path.basename(path))
+            if jsonl:
+                results.write(value + '\n')
+                results.flush()
+            # Manifest last: a file counts as done only once its output is written
+            manifest.write(json.dumps({'hash': digest, 'source': path,
+                                       'output': output if jsonl else value}, ensure_ascii=False) + '\n')
+            manifest.flush()
+            summary['converted'] += 1
+            console.print(f'[green]✓[/green] {path}')
+
+    results = open(output, 'a', encoding='utf-8') if jsonl else None
+    try:
+        with open(manifest_path, 'a', encoding='utf-8') as manifest:
+            for path in iter_input_files(inputs, recursive):
+                digest = hash_file(path)
+                if digest in done:
+                    summary['skipped'] += 1
+                    continue
+                # Same content under another name in this run
+                done.add(digest)
+                while len(pending) >= queue_size:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+                pending[submit(path, digest)] = (path, digest)
+            collect(list(pending))
+    finally:
+        if executor is not None:
+            # Interrupted run: drop queued files (shutdown(cancel_futures=) needs 3.9)
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+        if results is not None:
+            results.close()
+    return summary
+
+
+@click.command()
+@click.argument('inputs', nargs=-1, required=True)
+@click.option('--output', '-o', required=True, type=click.Path(),
+              help='Output directory, or a .jsonl file for one record per document')
+@click.option('--format', '-f', 'output_format', type=click.Choice(list(OUTPUT_FORMATS)), default='json',
+              help='Output file format (directory output)')
+@click.option('--workers', '-w', type=int, default=None,
+              help='Worker processes (default TREAD_CONFIG num_workers; 0 converts in-process)')
+@click.option('--queue-size', type=int, default=None,
+              help='Files queued ahead of the workers (default 2 per worker)')
+@click.option('--manifest', 'manifest_path', type=click.Path(dir_okay=False), default=None,
+              help='Manifest of completed content hashes (default next to the output)')
+@click.option('--recursive/--no-recursive', default=True, help='Descend into subdirectories')
+def convert(inputs: tuple, output: str, output_format: str, workers: Optional[int],
+            queue_size: Optional[int], manifest_path: Optional[str], recursive: bool):
+    """Convert files, directories or glob patterns in batch; rerun to resume."""
+    summary = run_batch(inputs, output, output_format, workers, queue_size, manifest_path, recursive)
+    console.print(
+        f"Converted {summary['converted']}, skipped {summary['skipped']} already done, "
+        f"failed {summary['failed']}"
+    )
+    if summary['failed']:
+        raise SystemExit(1)
+
+if __name__ == '__main__':
+    convert()
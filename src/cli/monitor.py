@@ -1,12 +1,15 @@
 import click
+import json
 import time
+from collections import deque
 from pathlib import Path
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskID
-from src.tread.monitoring import TREADMonitor
+from src.tread.config import TREAD_CONFIG
+from src.tread.instrumentation import fetch_snapshot
 
 console = Console()
 
@@ -44,6 +47,41 @@ def create_stats_table(stats: dict) -> Table:
     
     return table
 
+def create_stages_table(stages: dict) -> Table:
+    """Create rich table with per-stage timing totals"""
+    table = Table(show_header=True, header_style="bold magenta")
+
+    table.add_column("Stage", style="blue")
+    table.add_column("Count", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Total", justify="right")
+
+    for stage, totals in sorted(stages.items(), key=lambda item: -item[1]['total_sec']):
+        table.add_row(
+            stage,
+            str(totals['count']),
+            f"{totals['mean_ms']:.1f}ms",
+            f"{totals['max_ms']:.1f}ms",
+            f"{totals['total_sec']:.2f}s"
+        )
+
+    return table
+
+def create_spans_table(spans) -> Table:
+    """Create rich table with the most recent spans"""
+    table = Table(show_header=True, header_style="bold magenta")
+
+    table.add_column("Stage", style="blue")
+    table.add_column("Duration", justify="right")
+    table.add_column("Details")
+
+    for span in spans:
+        details = ' '.join(f"{key}={value}" for key, value in span['attrs'].items())
+        table.add_row(span['stage'], f"{span['duration'] * 1000:.1f}ms", details)
+
+    return table
+
 def create_warning_panel(stats: dict) -> Panel:
     """Create panel with performance warnings"""
     warnings = []
@@ -65,19 +103,46 @@ def create_warning_panel(stats: dict) -> Panel:
     )
 
 @click.command()
-@click.argument('file_path', type=click.Path(exists=True))
+@click.option('--host', default='127.0.0.1', help='Host of the processing process')
+@click.option('--port', type=int, default=None,
+              help='Monitor port of the processing process (default TREAD_CONFIG monitor_port)')
 @click.option('--refresh-rate', default=1.0, help='Stats refresh rate in seconds')
+@click.option('--spans', 'span_count', default=10, help='Number of recent spans to show')
 @click.option('--save-metrics/--no-save-metrics', default=True,
-              help='Save metrics to file')
-def monitor(file_path: str, refresh_rate: float, save_metrics: bool):
-    """Monitor PDF processing performance."""
-    monitor = TREADMonitor()
-    monitor.start_file_processing(file_path)
+              help='Save the last stats to the log directory on exit')
+def monitor(host: str, port: int, refresh_rate: float, span_count: int, save_metrics: bool):
+    """Monitor a running processing process live."""
+    port = port or TREAD_CONFIG['monitor_port']
+    recent = deque(maxlen=span_count)
+    last_seq = 0
+    pid = None
+    snapshot = {}
     
     with Live(console=console, refresh_per_second=4) as live:
         try:
             while True:
-                stats = monitor.get_current_stats()
+                try:
+                    snapshot = fetch_snapshot(host, port, since=last_seq)
+                except OSError:
+                    live.update(Panel(
+                        f"Waiting for a processing process on {host}:{port}...",
+                        title="TREAD Performance Monitor",
+                        border_style="red"
+                    ))
+                    time.sleep(refresh_rate)
+                    continue
+
+                if snapshot['pid'] != pid:
+                    # Another processing process: its span numbers start over
+                    pid = snapshot['pid']
+                    recent.clear()
+                    if last_seq:
+                        last_seq = 0
+                        continue
+                recent.extend(snapshot['spans'])
+                if recent:
+                    last_seq = recent[-1]['seq']
+                stats = snapshot['stats']
                 
                 # Create display elements
                 table = create_stats_table(stats)
@@ -89,11 +154,13 @@ def monitor(file_path: str, refresh_rate: float, save_metrics: bool):
                         Table(
                             table,
                             warnings,
+                            create_stages_table(snapshot['stages']),
+                            create_spans_table(recent),
                             show_header=False,
                             show_edge=False,
                             padding=1
                         ),
-                        title="TREAD Performance Monitor",
+                        title=f"TREAD Performance Monitor (pid {snapshot['pid']})",
                         border_style="blue"
                     )
                 )
@@ -102,9 +169,13 @@ def monitor(file_path: str, refresh_rate: float, save_metrics: bool):
                 
         except KeyboardInterrupt:
             console.print("\n\nMonitoring stopped.")
-            if save_metrics:
-                monitor.save_metrics()
-                console.print("Metrics saved to log directory.")
+            if save_metrics and snapshot.get('stats'):
+                log_dir = Path("logs/tread")
+                log_dir.mkdir(parents=True, exist_ok=True)
+                metrics_file = log_dir / f"metrics_{int(time.time())}.json"
+                with open(metrics_file, 'w') as f:
+                    json.dump({**snapshot['stats'], 'resources': snapshot['resources']}, f, indent=2)
+                console.print(f"Metrics saved to {metrics_file}.")
 
 if __name__ == '__main__':
     monitor()
\ No newline at end of file
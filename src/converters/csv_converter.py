@@ -1,12 +1,97 @@
+import os
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List
 from .base_converter import BaseConverter
-from ..utils.medical_terms import extract_medical_terms
+from ..tread.instrumentation import instrumented
+from ..utils.medical_terms import extract_medical_terms_batch
+
+class CsvRowStream:
+    """Table rows of a CSV file (header first), re-read chunk by chunk on every iteration
+
+    Only one chunk of rows is held in memory at a time. Missing values are None.
+    """
+
+    def __init__(self, file_path: str, dtypes: Dict[str, str], chunksize: int):
+        self.file_path = file_path
+        self.dtypes = dtypes
+        self.chunksize = chunksize
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        yield list(self.dtypes)
+        for chunk in pd.read_csv(self.file_path, dtype=self.dtypes, chunksize=self.chunksize):
+            yield from chunk.astype(object).where(chunk.notna(), None).values.tolist()
+
+def iter_text_pieces(values: Iterable[str], limit: int) -> Iterator[str]:
+    """Cell values joined with newlines into pieces of at most limit chars"""
+    parts = []
+    size = 0
+    for value in values:
+        # A single oversized cell is cut into limit-sized slices
+        for start in range(0, max(len(value), 1), limit):
+            part = value[start:start + limit]
+            if size + len(part) > limit and parts:
+                yield '\n'.join(parts)
+                parts = []
+                size = 0
+            parts.append(part)
+            size += len(part) + 1
+    if parts:
+        yield '\n'.join(parts)
+
+class _TermCollector:
+    """Terms of text pieces, each with its own cell as context, capped at max_terms"""
+
+    def __init__(self, max_terms: int):
+        self.max_terms = max_terms
+        self.terms = []
+        self.truncated = False
+
+    def add(self, pieces: List[str]):
+        if self.truncated or not pieces:
+            return
+        for piece, piece_terms in zip(pieces, extract_medical_terms_batch(pieces)):
+            for term in piece_terms:
+                if len(self.terms) >= self.max_terms:
+                    self.truncated = True
+                    return
+                if 'start' in term:
+                    # The cell, not the whole piece: pieces have no sentence boundaries
+                    start = piece.rfind('\n', 0, term['start']) + 1
+                    end = piece.find('\n', term['end'])
+                    term['context'] = piece[start:end if end != -1 else len(piece)]
+                self.terms.append(term)
 
 class CsvConverter(BaseConverter):
     """Converter for CSV files with medical data support"""
 
+    # Files above this size are converted in chunked mode by default
+    CHUNKED_THRESHOLD = 64 * 1024 * 1024
+    CHUNK_SIZE = 50_000
+    # Rows used to infer column dtypes for chunked mode
+    SAMPLE_ROWS = 10_000
+    # Rows rendered into 'text' in chunked mode
+    PREVIEW_ROWS = 50
+    # Chars per text handed to spaCy, well below nlp.max_length (1,000,000)
+    TEXT_CHUNK = 100_000
+    # Terms kept per file; metadata['terms_truncated'] tells when more were found
+    MAX_TERMS = 10_000
+
+    @instrumented('convert')
     def convert(self, file_path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Convert CSV file
+
+        kwargs:
+            chunked: stream the file in chunks with bounded memory
+                (default: files larger than CHUNKED_THRESHOLD)
+            chunksize: rows per chunk in chunked mode
+        """
+        chunked = kwargs.get('chunked')
+        if chunked is None:
+            chunked = os.path.getsize(file_path) > self.CHUNKED_THRESHOLD
+        if chunked:
+            return self._convert_chunked(file_path, kwargs.get('chunksize') or self.CHUNK_SIZE)
+
         # Read CSV file
         df = pd.read_csv(file_path)
         
@@ -14,10 +99,8 @@ class CsvConverter(BaseConverter):
         text = df.to_string()
         
         # Extract medical terms from all text columns
-        terms = []
-        for column in df.select_dtypes(include=['object']).columns:
-            column_text = ' '.join(df[column].dropna().astype(str))
-            terms.extend(extract_medical_terms(column_text))
+        terms = _TermCollector(self.MAX_TERMS)
+        terms.add(self._text_pieces(df, df.select_dtypes(include=['object']).columns))
         
         # Convert DataFrame to list of lists for table representation
         tables = [df.columns.tolist()]
@@ -28,7 +111,8 @@ class CsvConverter(BaseConverter):
             'columns': df.columns.tolist(),
             'rows': len(df),
             'dtypes': df.dtypes.astype(str).to_dict(),
-            'has_nulls': df.isnull().any().to_dict()
+            'has_nulls': df.isnull().any().to_dict(),
+            'terms_truncated': terms.truncated
         }
         
         # Document structure
@@ -43,9 +127,102 @@ class CsvConverter(BaseConverter):
             'text': text,
             'metadata': metadata,
             'tables': [tables],
-            'terms': terms,
+            'terms': terms.terms,
             'structure': structure
         }
     
+    def _text_pieces(self, frame: pd.DataFrame, columns) -> List[str]:
+        """Text of the given columns, row by row, in pieces of at most TEXT_CHUNK chars"""
+        pieces = []
+        for column in columns:
+            pieces.extend(iter_text_pieces(frame[column].dropna().astype(str), self.TEXT_CHUNK))
+        return pieces
+
+    def _infer_dtypes(self, file_path: str) -> Dict[str, str]:
+        """Explicit dtypes from a sample: Int64/float64 for numbers, object for the rest"""
+        sample = pd.read_csv(file_path, nrows=self.SAMPLE_ROWS)
+        dtypes = {}
+        for column, dtype in sample.dtypes.items():
+            if pd.api.types.is_bool_dtype(dtype):
+                dtypes[column] = 'object'
+            elif pd.api.types.is_integer_dtype(dtype):
+                # Nullable: a later chunk may have gaps the sample did not
+                dtypes[column] = 'Int64'
+            elif pd.api.types.is_float_dtype(dtype):
+                dtypes[column] = 'float64'
+            else:
+                dtypes[column] = 'object'
+        return dtypes
+
+    def _convert_chunked(self, file_path: str, chunksize: int) -> Dict[str, Any]:
+        """One pass over the file: metadata, terms and a text preview; tables stay lazy"""
+        dtypes = self._infer_dtypes(file_path)
+        try:
+            scan = self._scan_chunks(file_path, dtypes, chunksize)
+        except (ValueError, TypeError):
+            # A value past the sample does not fit its inferred dtype
+            dtypes = {column: 'object' for column in dtypes}
+            scan = self._scan_chunks(file_path, dtypes, chunksize)
+
+        rows = scan['rows']
+        preview = scan['preview']
+        text = preview.to_string()
+        if rows > len(preview):
+            text += f'\n... ({rows - len(preview)} more rows)'
+
+        columns = list(dtypes)
+        text_columns = [column for column, dtype in dtypes.items() if dtype == 'object']
+        metadata = {
+            'columns': columns,
+            'rows': rows,
+            'dtypes': dict(dtypes),
+            'has_nulls': scan['has_nulls'],
+            'terms_truncated': scan['terms'].truncated,
+            'chunked': True,
+            'chunksize': chunksize
+        }
+        structure = {
+            'column_count': len(columns),
+            'row_count': rows,
+            'numeric_columns': [column for column in columns if column not in text_columns],
+            'text_columns': text_columns
+        }
+
+        return {
+            'text': text,
+            'metadata': metadata,
+            'tables': [CsvRowStream(file_path, dtypes, chunksize)],
+            'terms': scan['terms'].terms,
+            'structure': structure
+        }
+
+    def _scan_chunks(self, file_path: str, dtypes: Dict[str, str], chunksize: int) -> Dict[str, Any]:
+        text_columns = [column for column, dtype in dtypes.items() if dtype == 'object']
+        rows = 0
+        has_nulls = {column: False for column in dtypes}
+        preview_frames = []
+        preview_rows = 0
+        terms = _TermCollector(self.MAX_TERMS)
+
+        for chunk in pd.read_csv(file_path, dtype=dtypes, chunksize=chunksize):
+            rows += len(chunk)
+            for column, nulls in chunk.isnull().any().items():
+                has_nulls[column] = has_nulls[column] or bool(nulls)
+
+            if preview_rows < self.PREVIEW_ROWS:
+                # Copy, so the preview does not keep the whole chunk alive
+                head = chunk.head(self.PREVIEW_ROWS - preview_rows).copy()
+                preview_frames.append(head)
+                preview_rows += len(head)
+
+            # Terms are extracted per chunk, so only one chunk of text is built at a time
+            terms.add(self._text_pieces(chunk, text_columns))
+
+        if preview_frames:
+            preview = pd.concat(preview_frames, ignore_index=True)
+        else:
+            preview = pd.DataFrame(columns=list(dtypes))
+        return {'rows': rows, 'has_nulls': has_nulls, 'preview': preview, 'terms': terms}
+
     def get_supported_formats(self) -> list:
-        return ['.csv']
\ No newline at end of file
+        return ['.csv']
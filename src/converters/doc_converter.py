@@ -1,57 +1,64 @@
 """
-Legacy DOC format converter
+Legacy DOC/PPT format converters
 """
-from typing import Optional
-import win32com.client
+import io
 import os
 from .base_converter import BaseConverter
+from ..tread.instrumentation import instrumented
+from .docx_converter import DocxConverter
+from .pptx_converter import PptxConverter
 from ..errors import ConversionError
+from ..utils.office_pool import get_office_pool
+
+class LegacyOfficeConverter(BaseConverter):
+    """Converts a legacy Office file to OOXML in memory with headless
+    LibreOffice and hands the result to the OOXML converter"""
+
+    target = ''
+    format_name = ''
+    ooxml_converter_class = None
 
-class DocConverter(BaseConverter):
-    """Converter for legacy .doc format using Win32COM"""
-    
     def __init__(self):
         super().__init__()
-        self.word = None
-
-    def _init_word(self):
-        """Initialize Word application if not already initialized"""
-        if self.word is None:
-            try:
-                self.word = win32com.client.Dispatch('Word.Application')
-                self.word.Visible = False
-            except Exception as e:
-                raise ConversionError(f"Failed to initialize Word: {str(e)}")
-
-    def _cleanup_word(self):
-        """Close Word application"""
-        if self.word:
-            try:
-                self.word.Quit()
-            except:
-                pass
-            self.word = None
-
-    def convert(self, file_path: str) -> str:
+        self.ooxml_converter = self.ooxml_converter_class()
+
+    @instrumented('convert')
+    def convert(self, file_path: str, **kwargs):
         """
-        Convert DOC file to text
-        
+        Convert legacy Office file
+
         Args:
-            file_path: Path to DOC file
-            
+            file_path: Path to the file
+            timeout: seconds LibreOffice may spend on the document
+                (default TREAD_CONFIG['office_timeout']); other kwargs are
+                passed to the OOXML converter
+
         Returns:
-            Extracted text content
+            What the OOXML converter returns for the converted document
         """
         if not os.path.exists(file_path):
             raise ConversionError(f"File not found: {file_path}")
 
+        # ConversionError from the pool (timeouts, LibreOffice failures) passes through
+        data = get_office_pool().convert(file_path, self.target, timeout=kwargs.pop('timeout', None))
         try:
-            self._init_word()
-            doc = self.word.Documents.Open(file_path)
-            text = doc.Content.Text
-            doc.Close()
-            return text
+            return self.ooxml_converter.convert(io.BytesIO(data), **kwargs)
         except Exception as e:
-            raise ConversionError(f"Failed to convert DOC file: {str(e)}")
-        finally:
-            self._cleanup_word()
\ No newline at end of file
+            raise ConversionError(f"Failed to convert {self.format_name} file: {str(e)}")
+
+    def get_supported_formats(self) -> list:
+        return [f'.{self.format_name.lower()}']
+
+class DocConverter(LegacyOfficeConverter):
+    """Converter for legacy .doc format (text, as DocxConverter returns it)"""
+
+    target = 'docx'
+    format_name = 'DOC'
+    ooxml_converter_class = DocxConverter
+
+class PptConverter(LegacyOfficeConverter):
+    """Converter for legacy .ppt presentations"""
+
+    target = 'pptx'
+    format_name = 'PPT'
+    ooxml_converter_class = PptxConverter
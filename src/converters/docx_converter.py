@@ -1,34 +1,44 @@
 import docx
 from typing import Dict, Any
 from .base_converter import BaseConverter
+from ..tread.instrumentation import instrumented
 from ..utils.medical_terms import extract_medical_terms
 from ..utils.table_extractor import extract_tables
+from ..utils.ooxml_reader import read_docx, OOXML_ERRORS
 
 class DocxConverter(BaseConverter):
     """Converter for DOCX documents"""
 
+    @instrumented('convert')
     def convert(self, file_path: str, **kwargs) -> str:
         """
         Convert DOCX file to text
         
         Args:
-            file_path: Path to DOCX file
+            file_path: Path to DOCX file (or a binary file-like object)
+            fast: read word/document.xml straight from the zip in one pass
+                (default True); python-docx is used if that fails
             
         Returns:
             Extracted text content
         """
-        doc = docx.Document(file_path)
-        
+        content = None
+        if kwargs.get('fast', True):
+            try:
+                content = read_docx(file_path)
+            except OOXML_ERRORS:
+                if hasattr(file_path, 'seek'):
+                    file_path.seek(0)
+        if content is None:
+            content = self._read_with_python_docx(file_path)
+
         # Extract text with formatting
-        paragraphs = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
+        paragraphs = [paragraph for paragraph in content['paragraphs'] if paragraph.strip()]
         
         # Extract tables
         table_texts = []
-        for table in doc.tables:
-            rows = []
-            for row in table.rows:
-                row_data = [cell.text.strip() for cell in row.cells]
-                rows.append(' | '.join(row_data))
+        for table in content['tables']:
+            rows = [' | '.join(cell.strip() for cell in row) for row in table]
             if rows:
                 table_texts.append('\n'.join(rows))
         
@@ -38,6 +48,26 @@ class DocxConverter(BaseConverter):
             all_text += '\n\nТаблицы:\n' + '\n\n'.join(table_texts)
         
         return all_text
+
+    @staticmethod
+    def _read_with_python_docx(file_path) -> dict:
+        """Same result as read_docx, through python-docx"""
+        doc = docx.Document(file_path)
+        tables = []
+        for table in doc.tables:
+            # Merged cells repeat in row.cells (and across rows); their text
+            # is computed once per <w:tc>
+            texts = {}
+            rows = []
+            for row in table.rows:
+                row_data = []
+                for cell in row.cells:
+                    if cell._tc not in texts:
+                        texts[cell._tc] = cell.text
+                    row_data.append(texts[cell._tc])
+                rows.append(row_data)
+            tables.append(rows)
+        return {'paragraphs': [paragraph.text for paragraph in doc.paragraphs], 'tables': tables}
     
     def get_supported_formats(self) -> list:
         return ['.docx']  # Removed .doc since it's handled separately
\ No newline at end of file
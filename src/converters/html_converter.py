@@ -1,14 +1,177 @@
 from bs4 import BeautifulSoup
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import requests
 from .base_converter import BaseConverter
+from ..tread.instrumentation import instrumented
 from ..utils.medical_terms import extract_medical_terms
-from ..utils.table_extractor import extract_tables
+from ..utils.table_extractor import extract_tables_from_html
+
+try:
+    from lxml import etree
+    import lxml.html
+except ImportError:
+    etree = None
+
+SKIPPED_TAGS = {'script', 'style'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+META_FIELDS = {'description': 'meta_description', 'keywords': 'meta_keywords'}
+
+
+class _Cell:
+    """Text of an open table cell or heading"""
+
+    __slots__ = ('parts', 'strip')
+
+    def __init__(self, strip: bool):
+        self.parts = []
+        self.strip = strip
+
+    def add(self, text: str):
+        self.parts.append(text.strip() if self.strip else text)
+
+    def text(self) -> str:
+        return ''.join(self.parts)
+
+
+def _parse_lxml(html_content: str) -> Dict[str, Any]:
+    """Text, tables, headings, links, images and meta tags in one lxml tree walk
+
+    Mirrors the BeautifulSoup path: rows and cells of nested tables also
+    belong to the enclosing table (as find_all('tr') would return them).
+    """
+    # huge_tree lifts libxml2's limits on text node size and nesting depth (256)
+    parser = lxml.html.HTMLParser(encoding='utf-8', huge_tree=True)
+    root = lxml.html.document_fromstring(html_content.encode('utf-8'), parser=parser)
+
+    strings = []
+    tables = []
+    headings = []
+    links = images = 0
+    title = None
+    meta = dict.fromkeys(META_FIELDS.values())
+
+    # Open elements whose text is being collected
+    open_tables: List[List[List[_Cell]]] = []
+    open_rows: List[List[_Cell]] = []
+    open_cells: List[_Cell] = []
+    open_headings: List[_Cell] = []
+
+    def add_text(text: Optional[str]):
+        if text:
+            strings.append(text)
+            for cell in open_cells:
+                cell.add(text)
+            for heading in open_headings:
+                heading.add(text)
+
+    # Explicit stack of (element, children iterator or None before its start);
+    # deep documents must not hit the recursion limit
+    stack = [(root, None)]
+    while stack:
+        elem, children = stack[-1]
+        if children is None:
+            tag = elem.tag if isinstance(elem.tag, str) else None
+            if tag in SKIPPED_TAGS or tag is None:
+                # Comments and script/style contents are not text; their tails are
+                stack.pop()
+                add_text(elem.tail)
+                continue
+            children = iter(elem)
+            stack[-1] = (elem, children)
+            if tag == 'table':
+                table = []
+                tables.append(table)
+                open_tables.append(table)
+            elif tag == 'tr':
+                row = []
+                for table in open_tables:
+                    table.append(row)
+                open_rows.append(row)
+            elif tag in ('td', 'th'):
+                cell = _Cell(strip=True)
+                for row in open_rows:
+                    row.append(cell)
+                open_cells.append(cell)
+            elif tag in HEADING_TAGS:
+                heading = _Cell(strip=False)
+                headings.append(heading)
+                open_headings.append(heading)
+            elif tag == 'a':
+                links += 1
+            elif tag == 'img':
+                images += 1
+            elif tag == 'title' and title is None:
+                title = elem.text if len(elem) == 0 else None
+            elif tag == 'meta':
+                field = META_FIELDS.get(elem.get('name'))
+                if field and meta[field] is None and elem.get('content') is not None:
+                    meta[field] = elem.get('content')
+            add_text(elem.text)
+
+        child = next(children, None)
+        if child is not None:
+            stack.append((child, None))
+            continue
+
+        stack.pop()
+        tag = elem.tag
+        if tag == 'table':
+            open_tables.pop()
+        elif tag == 'tr':
+            open_rows.pop()
+        elif tag in ('td', 'th'):
+            open_cells.pop()
+        elif tag in HEADING_TAGS:
+            open_headings.pop()
+        add_text(elem.tail)
+
+    return {
+        'text': '\n'.join(strings),
+        'tables': [[[cell.text() for cell in row] for row in table] for table in tables],
+        'title': title,
+        'meta': meta,
+        'headings': [heading.text() for heading in headings],
+        'links': links,
+        'images': images,
+    }
+
+
+def _parse_soup(html_content: str) -> Dict[str, Any]:
+    """Same fields as _parse_lxml, with BeautifulSoup's pure-Python parser"""
+    soup = BeautifulSoup(html_content, 'html.parser')
+
+    # Remove scripts and styles
+    for script in soup(list(SKIPPED_TAGS)):
+        script.decompose()
+
+    meta = {}
+    for name, field in META_FIELDS.items():
+        tag = soup.find('meta', {'name': name})
+        meta[field] = tag.get('content') if tag else None
+
+    return {
+        'text': soup.get_text(separator='\n'),
+        'tables': extract_tables_from_html(soup.find_all('table')),
+        'title': soup.title.string if soup.title else None,
+        'meta': meta,
+        'headings': [h.get_text() for h in soup.find_all(sorted(HEADING_TAGS))],
+        'links': len(soup.find_all('a')),
+        'images': len(soup.find_all('img')),
+    }
+
 
 class HtmlConverter(BaseConverter):
     """Converter for HTML documents"""
 
+    @instrumented('convert')
     def convert(self, file_path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Convert HTML document
+
+        kwargs:
+            parser: 'lxml' (default when installed) walks the lxml tree once;
+                'html.parser' uses BeautifulSoup
+        """
         # Handle both local files and URLs
         if file_path.startswith('http'):
             response = requests.get(file_path)
@@ -16,43 +179,34 @@ class HtmlConverter(BaseConverter):
         else:
             with open(file_path, 'r', encoding='utf-8') as f:
                 html_content = f.read()
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Remove scripts and styles
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Extract text
-        text = soup.get_text(separator='\n')
-        
-        # Extract tables
-        tables = []
-        for table in soup.find_all('table'):
-            table_data = []
-            for row in table.find_all('tr'):
-                row_data = [cell.get_text(strip=True) for cell in row.find_all(['td', 'th'])]
-                table_data.append(row_data)
-            tables.append(table_data)
-        
+
+        parsed = None
+        if kwargs.get('parser', 'lxml') == 'lxml' and etree is not None:
+            try:
+                parsed = _parse_lxml(html_content)
+            except (etree.ParserError, ValueError):
+                # e.g. an empty document; BeautifulSoup copes with those
+                parsed = None
+        if parsed is None:
+            parsed = _parse_soup(html_content)
+
+        text = parsed['text']
+        tables = parsed['tables']
+
         # Extract metadata
-        metadata = {
-            'title': soup.title.string if soup.title else None,
-            'meta_description': soup.find('meta', {'name': 'description'})['content'] if soup.find('meta', {'name': 'description'}) else None,
-            'meta_keywords': soup.find('meta', {'name': 'keywords'})['content'] if soup.find('meta', {'name': 'keywords'}) else None
-        }
-        
+        metadata = {'title': parsed['title'], **parsed['meta']}
+
         # Extract medical terms
         terms = extract_medical_terms(text)
-        
+
         # Document structure
         structure = {
-            'headings': [h.get_text() for h in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])],
-            'links': len(soup.find_all('a')),
-            'images': len(soup.find_all('img')),
+            'headings': parsed['headings'],
+            'links': parsed['links'],
+            'images': parsed['images'],
             'tables': len(tables)
         }
-        
+
         return {
             'text': text,
             'metadata': metadata,
@@ -60,6 +214,6 @@ class HtmlConverter(BaseConverter):
             'terms': terms,
             'structure': structure
         }
-    
+
     def get_supported_formats(self) -> list:
-        return ['.html', '.htm']
\ No newline at end of file
+        return ['.html', '.htm']
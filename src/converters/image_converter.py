@@ -1,7 +1,8 @@
-import pytesseract
 from PIL import Image
 from typing import Dict, Any
 from .base_converter import BaseConverter
+from ..tread.instrumentation import instrumented, span
+from ..utils.ocr_backends import get_ocr_backend
 
 class ImageConverter(BaseConverter):
     """Converter for image files (jpg, png, etc.)"""
@@ -9,6 +10,7 @@ class ImageConverter(BaseConverter):
     def __init__(self):
         self.supported_formats = ['jpg', 'jpeg', 'png', 'bmp', 'tiff']
     
+    @instrumented('convert')
     def convert(self, file_path: str, **kwargs) -> Dict[str, Any]:
         """
         Convert image to text using OCR
@@ -24,7 +26,8 @@ class ImageConverter(BaseConverter):
         image = Image.open(file_path)
         
         # Perform OCR
-        text = pytesseract.image_to_string(image, lang='eng+rus')
+        with span('ocr'):
+            text = get_ocr_backend().image_to_string(image, lang='eng+rus')
         
         # Extract metadata
         metadata = {
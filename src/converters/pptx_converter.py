@@ -1,57 +1,81 @@
 from pptx import Presentation
 from typing import Dict, Any
 from .base_converter import BaseConverter
+from ..tread.instrumentation import instrumented
 from ..utils.medical_terms import extract_medical_terms
 from ..utils.table_extractor import extract_tables
+from ..utils.ooxml_reader import read_pptx, OOXML_ERRORS
 
 class PptxConverter(BaseConverter):
     """Converter for PPTX presentations"""
 
+    @instrumented('convert')
     def convert(self, file_path: str, **kwargs) -> Dict[str, Any]:
-        prs = Presentation(file_path)
-        
+        """
+        Convert PPTX presentation
+
+        kwargs:
+            fast: read the slide parts straight from the zip, one pass per
+                part (default True); python-pptx is used if that fails
+        """
+        content = None
+        if kwargs.get('fast', True):
+            try:
+                content = read_pptx(file_path)
+            except OOXML_ERRORS:
+                if hasattr(file_path, 'seek'):
+                    file_path.seek(0)
+        if content is None:
+            content = self._read_with_python_pptx(file_path)
+        slides = content['slides']
+
         # Extract text from slides
-        text_content = []
-        for slide in prs.slides:
-            slide_text = []
-            for shape in slide.shapes:
-                if hasattr(shape, 'text'):
-                    slide_text.append(shape.text)
-            text_content.append('\n'.join(slide_text))
-        
+        text_content = ['\n'.join(slide['texts']) for slide in slides]
         text = '\n\n=== Новый слайд ===\n\n'.join(text_content)
         
         # Extract tables
-        tables = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if shape.has_table:
-                    table_data = []
-                    for row in shape.table.rows:
-                        row_data = [cell.text for cell in row.cells]
-                        table_data.append(row_data)
-                    tables.append(table_data)
+        tables = [table for slide in slides for table in slide['tables']]
         
         # Extract medical terms
         terms = extract_medical_terms(text)
         
         # Document structure
         structure = {
-            'total_slides': len(prs.slides),
+            'total_slides': len(slides),
             'tables_count': len(tables),
-            'has_notes': any(slide.has_notes_slide for slide in prs.slides)
+            'has_notes': any(slide['has_notes'] for slide in slides)
         }
         
         return {
             'text': text,
             'metadata': {
-                'slide_count': len(prs.slides),
-                'title': prs.core_properties.title
+                'slide_count': len(slides),
+                'title': content['title']
             },
             'tables': tables,
             'terms': terms,
             'structure': structure
         }
+
+    @staticmethod
+    def _read_with_python_pptx(file_path) -> Dict[str, Any]:
+        """Same result as read_pptx, through python-pptx (one walk over the shapes)"""
+        prs = Presentation(file_path)
+        slides = []
+        for slide in prs.slides:
+            texts = []
+            tables = []
+            for shape in slide.shapes:
+                if hasattr(shape, 'text'):
+                    texts.append(shape.text)
+                if shape.has_table:
+                    tables.append([[cell.text for cell in row.cells] for row in shape.table.rows])
+            has_notes = slide.has_notes_slide
+            notes = None
+            if has_notes and slide.notes_slide.notes_text_frame is not None:
+                notes = slide.notes_slide.notes_text_frame.text
+            slides.append({'texts': texts, 'tables': tables, 'notes': notes, 'has_notes': has_notes})
+        return {'title': prs.core_properties.title, 'slides': slides}
     
     def get_supported_formats(self) -> list:
-        return ['.pptx', '.ppt']
\ No newline at end of file
+        return ['.pptx']  # .ppt is converted to PPTX by PptConverter
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+File extension -> converter map shared by the Streamlit app and the CLI
+"""
+import importlib
+import os
+from typing import Any, Dict, Tuple
+from .base_converter import BaseConverter
+
+# Extension -> (module in src.converters, class); imported on first use, so
+# a process only loads the converters (and their dependencies) it needs
+CONVERTERS: Dict[str, Tuple[str, str]] = {
+    '.docx': ('docx_converter', 'DocxConverter'),
+    '.doc': ('doc_converter', 'DocConverter'),
+    '.pptx': ('pptx_converter', 'PptxConverter'),
+    '.ppt': ('doc_converter', 'PptConverter'),
+    '.html': ('html_converter', 'HtmlConverter'),
+    '.htm': ('html_converter', 'HtmlConverter'),
+    '.jpg': ('image_converter', 'ImageConverter'),
+    '.jpeg': ('image_converter', 'ImageConverter'),
+    '.png': ('image_converter', 'ImageConverter'),
+    '.tiff': ('image_converter', 'ImageConverter'),
+    '.bmp': ('image_converter', 'ImageConverter'),
+    '.csv': ('csv_converter', 'CsvConverter'),
+    '.json': ('xml_json_converter', 'XmlJsonConverter'),
+    '.xml': ('xml_json_converter', 'XmlJsonConverter'),
+}
+
+_instances: Dict[tuple, BaseConverter] = {}
+
+
+def get_converter(extension: str) -> BaseConverter:
+    """Get process-wide converter for a file extension ('.docx' or 'docx')"""
+    extension = extension.lower()
+    if not extension.startswith('.'):
+        extension = '.' + extension
+    if extension not in CONVERTERS:
+        raise ValueError(f'Unsupported file format: {extension}')
+    module_name, class_name = CONVERTERS[extension]
+    # Keyed by pid: converters may hold engines that must not cross a fork
+    key = (module_name, class_name, os.getpid())
+    if key not in _instances:
+        module = importlib.import_module(f'{__package__}.{module_name}')
+        _instances[key] = getattr(module, class_name)()
+    return _instances[key]
+
+
+def normalize_result(result: Any) -> Dict[str, Any]:
+    """Converter result as a dict; DocxConverter and DocConverter return plain text"""
+    return result if isinstance(result, dict) else {'text': result}
@@ -1,15 +1,189 @@
 import json
+import os
+import xml.etree.ElementTree as ET
 import xmltodict
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Tuple
 from .base_converter import BaseConverter
+from ..tread.instrumentation import instrumented
 from ..utils.medical_terms import extract_medical_terms
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# (prefix, event, value) as produced by ijson.parse
+JsonEvent = Tuple[str, str, Any]
+
+
+def parse_json_events(file_path: str) -> Iterator[JsonEvent]:
+    """Stream events from a JSON file with ijson"""
+    if ijson is None:
+        # json.load would read the whole file (and recurse) on every pass
+        raise ImportError('ijson is required for streaming JSON conversion')
+    with open(file_path, 'rb') as f:
+        yield from ijson.parse(f)
+
+
+def _build_items(events: Iterator[JsonEvent], item_prefix: str) -> Iterator[Any]:
+    """Assemble every value found at item_prefix from an event stream"""
+    stack = []
+    key = None
+    for prefix, event, value in events:
+        if not stack and prefix != item_prefix:
+            continue
+        if event == 'map_key':
+            key = value
+            continue
+        if event in ('start_map', 'start_array'):
+            container = {} if event == 'start_map' else []
+            if stack:
+                _attach(stack[-1], key, container)
+            stack.append(container)
+            continue
+        if event in ('end_map', 'end_array'):
+            container = stack.pop()
+            if not stack:
+                yield container
+            continue
+        if stack:
+            _attach(stack[-1], key, value)
+        else:
+            yield value
+
+
+def _attach(container, key, value):
+    if isinstance(container, dict):
+        container[key] = value
+    else:
+        container.append(value)
+
+
+def _local_name(tag: str) -> str:
+    """Tag without its '{namespace}' part"""
+    return tag.rsplit('}', 1)[-1]
+
+
+class StructuredTable:
+    """Rows of one homogeneous record array, re-read from the file on every iteration
+
+    The first row is the header. Only one record is held in memory at a time.
+    """
+
+    def __init__(self, file_path: str, file_format: str, path: str, headers: List[str]):
+        self.file_path = file_path
+        self.format = file_format
+        self.path = path
+        self.headers = headers
+
+    def __iter__(self) -> Iterator[List[str]]:
+        yield list(self.headers)
+        if self.format == 'json':
+            prefix = f'{self.path}.item' if self.path else 'item'
+            for record in _build_items(parse_json_events(self.file_path), prefix):
+                if isinstance(record, dict):
+                    yield [str(record.get(header, '')) for header in self.headers]
+        else:
+            yield from self._iter_xml_rows()
+
+    def _iter_xml_rows(self) -> Iterator[List[str]]:
+        stack = []
+        for event, elem in ET.iterparse(self.file_path, events=('start', 'end')):
+            if event == 'start':
+                parent_path = stack[-1][1] if stack else ''
+                path = f'{parent_path}/{_local_name(elem.tag)}'
+                # Record subtrees are kept until the record itself is done
+                if stack and not parent_path.startswith(self.path + '/') and parent_path != self.path:
+                    _drop_previous_siblings(stack[-1][0], elem)
+                stack.append((elem, path))
+                continue
+            _, path = stack.pop()
+            if path == self.path:
+                yield _xml_record_row(elem, self.headers)
+                del elem[:]
+
+
+def _drop_previous_siblings(parent, elem) -> List[str]:
+    """Remove the finished children before elem from parent, returning their tails
+
+    iterparse may have built elements past the current event already, so
+    children are located by identity rather than taken from the end.
+    """
+    for index, child in enumerate(parent):
+        if child is elem:
+            tails = [child.tail for child in parent[:index] if child.tail]
+            del parent[:index]
+            return tails
+    return []
+
+
+def _xml_record_row(elem, headers: List[str]) -> List[str]:
+    attributes = {f'@{_local_name(name)}': value for name, value in elem.attrib.items()}
+    children = {}
+    for child in elem:
+        children.setdefault(_local_name(child.tag), ''.join(child.itertext()).strip())
+    row = []
+    for header in headers:
+        if header in attributes:
+            row.append(attributes[header])
+        elif header == '#text':
+            row.append((elem.text or '').strip())
+        else:
+            row.append(children.get(header, ''))
+    return row
+
+
+class _TermBuffer:
+    """Collects text fragments and extracts terms once TEXT_CHUNK chars are buffered"""
+
+    TEXT_CHUNK = 100_000
+
+    def __init__(self):
+        self.terms = []
+        self._parts = []
+        self._size = 0
+
+    def add(self, text: str):
+        if text:
+            self._parts.append(text)
+            self._size += len(text) + 1
+            if self._size >= self.TEXT_CHUNK:
+                self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.terms.extend(extract_medical_terms(' '.join(self._parts)))
+            self._parts = []
+            self._size = 0
+
+
 class XmlJsonConverter(BaseConverter):
     """Converter for XML and JSON files"""
 
+    # Files above this size are converted in streaming mode by default
+    STREAMING_THRESHOLD = 64 * 1024 * 1024
+    # Characters of the source kept as 'text' in streaming mode
+    PREVIEW_CHARS = 10_000
+
+    @instrumented('convert')
     def convert(self, file_path: str, **kwargs) -> Dict[str, Any]:
+        """
+        Convert XML or JSON file
+
+        kwargs:
+            streaming: parse the file as an event stream with bounded memory
+                (default: files larger than STREAMING_THRESHOLD); JSON
+                streaming needs ijson and raises ImportError without it
+        """
         file_ext = file_path.lower().split('.')[-1]
-        
+
+        streaming = kwargs.get('streaming')
+        if streaming is None:
+            streaming = (os.path.getsize(file_path) > self.STREAMING_THRESHOLD
+                         and (file_ext != 'json' or ijson is not None))
+        if streaming:
+            return self._convert_streaming(file_path, file_ext)
+
         # Read and parse file
         with open(file_path, 'r', encoding='utf-8') as f:
             if file_ext == 'json':
@@ -19,22 +193,22 @@ class XmlJsonConverter(BaseConverter):
                 xml_content = f.read()
                 data = xmltodict.parse(xml_content)
                 text = xml_content
-        
+
         # Convert to string for term extraction
         if isinstance(data, dict):
             flat_text = json.dumps(data, ensure_ascii=False)
         else:
             flat_text = str(data)
-        
+
         # Extract medical terms
         terms = extract_medical_terms(flat_text)
-        
+
         # Create tables from structured data
         tables = self._extract_tables_from_data(data)
-        
+
         # Document structure
         structure = self._analyze_structure(data)
-        
+
         return {
             'text': text,
             'metadata': {
@@ -46,11 +220,151 @@ class XmlJsonConverter(BaseConverter):
             'terms': terms,
             'structure': structure
         }
-    
+
+    def _convert_streaming(self, file_path: str, file_ext: str) -> Dict[str, Any]:
+        """One event-driven pass: structure stats, record tables and terms
+
+        Memory is bounded by the largest record, not by the file. Tables are
+        StructuredTable streams (one per record path) that re-read the file;
+        'text' is a preview of the source.
+        """
+        if file_ext == 'json':
+            structure, tables = self._scan_json(file_path)
+        else:
+            structure, tables = self._scan_xml(file_path)
+        terms = structure.pop('_terms')
+
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read(self.PREVIEW_CHARS)
+        size = os.path.getsize(file_path)
+        if len(text.encode('utf-8')) < size:
+            text += f'\n... ({size} bytes total)'
+
+        return {
+            'text': text,
+            'metadata': {
+                'format': file_ext.upper(),
+                'size': size,
+                'structure': structure,
+                'streaming': True
+            },
+            'tables': tables,
+            'terms': terms,
+            'structure': structure
+        }
+
+    def _scan_json(self, file_path: str) -> Tuple[Dict, List[StructuredTable]]:
+        structure = {'type': None, 'depth': 0, 'array_counts': 0, 'object_counts': 0}
+        terms = _TermBuffer()
+        # Open containers: [kind, prefix, collecting headers for table]
+        stack = []
+        # Array prefix -> {'headers', 'homogeneous', 'rows'}
+        tables = {}
+
+        for prefix, event, value in parse_json_events(file_path):
+            if event == 'map_key':
+                if stack[-1][2] is not None:
+                    stack[-1][2].append(value)
+                continue
+            if event in ('end_map', 'end_array'):
+                stack.pop()
+                continue
+
+            # A value starts: container or scalar
+            depth = len(stack)
+            structure['depth'] = max(structure['depth'], depth)
+            if structure['type'] is None:
+                structure['type'] = {'start_map': 'dict', 'start_array': 'list'}.get(
+                    event, type(value).__name__)
+
+            headers = None
+            parent = stack[-1] if stack else None
+            if parent is not None and parent[0] == 'array':
+                table = tables.setdefault(parent[1], {'headers': None, 'homogeneous': True, 'rows': 0})
+                if event == 'start_map':
+                    table['rows'] += 1
+                    if table['headers'] is None:
+                        headers = table['headers'] = []
+                else:
+                    table['homogeneous'] = False
+
+            if event == 'start_map':
+                structure['object_counts'] += 1
+                stack.append(['map', prefix, headers])
+            elif event == 'start_array':
+                structure['array_counts'] += 1
+                stack.append(['array', prefix, None])
+            elif event == 'string':
+                terms.add(value)
+
+        terms.flush()
+        structure['_terms'] = terms.terms
+        record_tables = [
+            StructuredTable(file_path, 'json', path, table['headers'])
+            for path, table in tables.items()
+            if table['homogeneous'] and table['rows']
+        ]
+        return structure, record_tables
+
+    def _scan_xml(self, file_path: str) -> Tuple[Dict, List[StructuredTable]]:
+        structure = {'type': 'dict', 'depth': 0, 'array_counts': 0, 'object_counts': 0}
+        terms = _TermBuffer()
+        # Open elements: (element, path, child path counts, headers)
+        stack = []
+        # Record path -> headers of its first record
+        record_headers = {}
+        # Paths of elements that repeat under one parent
+        repeated = []
+
+        for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                parent_path = stack[-1][1] if stack else ''
+                name = _local_name(elem.tag)
+                path = f'{parent_path}/{name}'
+                if stack:
+                    _, _, counts, headers = stack[-1]
+                    counts[path] = counts.get(path, 0) + 1
+                    if counts[path] == 2 and path not in repeated:
+                        repeated.append(path)
+                    if name not in headers:
+                        headers.append(name)
+                    # A sibling's tail is complete once the next sibling starts;
+                    # earlier siblings are not needed after that
+                    for tail in _drop_previous_siblings(stack[-1][0], elem):
+                        terms.add(tail.strip())
+                structure['depth'] = max(structure['depth'], len(stack))
+                headers = [f'@{_local_name(attribute)}' for attribute in elem.attrib]
+                stack.append((elem, path, {}, headers))
+                continue
+
+            _, path, counts, headers = stack.pop()
+            structure['array_counts'] += sum(1 for count in counts.values() if count > 1)
+            text = (elem.text or '').strip()
+            terms.add(text)
+            if counts or elem.attrib:
+                structure['object_counts'] += 1
+                if path not in record_headers:
+                    if text:
+                        headers.insert(len(elem.attrib), '#text')
+                    record_headers[path] = headers
+
+            for child in elem:
+                terms.add((child.tail or '').strip())
+            del elem[:]
+
+        terms.flush()
+        structure['_terms'] = terms.terms
+        record_tables = [
+            StructuredTable(file_path, 'xml', path, record_headers[path])
+            for path in repeated
+            if path in record_headers
+        ]
+        return structure, record_tables
+
     def _extract_tables_from_data(self, data: Dict) -> list:
         """Extract tabular data from nested structures"""
         tables = []
-        
+
         def process_item(item):
             if isinstance(item, list) and all(isinstance(x, dict) for x in item):
                 # If we have a list of similar objects, convert to table
@@ -66,10 +380,10 @@ class XmlJsonConverter(BaseConverter):
             elif isinstance(item, list):
                 for value in item:
                     process_item(value)
-        
+
         process_item(data)
         return tables
-    
+
     def _analyze_structure(self, data: Dict) -> Dict:
         """Analyze the structure of the data"""
         structure = {
@@ -78,10 +392,10 @@ class XmlJsonConverter(BaseConverter):
             'array_counts': 0,
             'object_counts': 0
         }
-        
+
         def analyze_item(item, depth=0):
             structure['depth'] = max(structure['depth'], depth)
-            
+
             if isinstance(item, dict):
                 structure['object_counts'] += 1
                 for value in item.values():
@@ -90,9 +404,9 @@ class XmlJsonConverter(BaseConverter):
                 structure['array_counts'] += 1
                 for value in item:
                     analyze_item(value, depth + 1)
-        
+
         analyze_item(data)
         return structure
-    
+
     def get_supported_formats(self) -> list:
         return ['.json', '.xml']
@@ -19,4 +19,8 @@ class PluginError(ProcessingError):
 
 class FileProcessingError(ProcessingError):
     """Raised when file processing fails"""
-    pass
\ No newline at end of file
+    pass
+
+class ConversionError(ProcessingError):
+    """Raised when a document cannot be converted to another format"""
+    pass
@@ -15,6 +15,10 @@ class PluginManager:
         if name not in self.plugins:
             raise PluginError(f'Plugin {name} not found')
         return self.plugins[name]
+
+    def get_plugins(self) -> List[BasePlugin]:
+        """Get all enabled plugins in registration order"""
+        return [plugin for plugin in self.plugins.values() if plugin.enabled]
     
     def process_content(self, content: any, context: Dict = None) -> Dict:
         """Process content through all enabled plugins"""
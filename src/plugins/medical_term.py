@@ -1,37 +1,159 @@
 from .base import BasePlugin
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 import re
+from ..utils.medical_dictionary import get_medical_dictionary
+
+# Backreferences point at the wrong group once a pattern is wrapped into the
+# combined alternation, and named groups may clash between patterns, so such
+# patterns are scanned alone
+SEPARATE_SCAN = re.compile(r'\\[1-9]|\(\?P[<=]')
+# Global inline flags are only allowed at the very start of a pattern
+LEADING_FLAGS = re.compile(r'^\(\?([aiLmsux]+)\)')
+WORD_BOUNDARY = r'\b'
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Whether '|' splits the whole pattern (outside groups and classes)"""
+    depth = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            i += 2
+            continue
+        if in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+            # ']' right after '[' or '[^' is a literal
+            if pattern[i + 1:i + 2] == '^':
+                i += 1
+            if pattern[i + 1:i + 2] == ']':
+                i += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+        i += 1
+    return False
+
+def _first_literal(pattern: str) -> Optional[str]:
+    """Letter or digit every match of pattern starts with, if evident"""
+    if not pattern or not pattern[0].isalnum():
+        return None
+    # 'a?', 'a*', 'a{0,2}' may match without the character
+    if pattern[1:2] in ('?', '*') or pattern[1:3] in ('{0', '{,'):
+        return None
+    return pattern[0]
 
 class MedicalTermPlugin(BasePlugin):
     def __init__(self):
         super().__init__()
         self.medical_terms = self._load_medical_terms()
+        self._combined, self._separate = self._compile_terms(self.medical_terms)
 
     def process(self, content: Union[str, bytes], context: Dict = None) -> Dict:
+        """Find all configured terms in one scan of the content
+
+        Matches do not overlap: where several patterns match at the same
+        position, the one listed first wins (patterns sharing a first
+        letter are tried together, in order, at the place of the first).
+        """
         if isinstance(content, bytes):
             content = content.decode('utf-8', errors='ignore')
-            
+
         found_terms = []
-        for term in self.medical_terms:
+        if self._combined is not None:
+            for match in self._combined.finditer(content):
+                term = self.medical_terms[int(match.lastgroup[1:])]
+                found_terms.append(self._found(match, term))
+
+        for regex, term in self._separate:
+            found_terms.extend(self._found(match, term) for match in regex.finditer(content))
+        if self._separate:
+            found_terms.sort(key=lambda found: found['position'])
+
+        return {'terms': found_terms}
+
+    @staticmethod
+    def _found(match: re.Match, term: Dict) -> Dict:
+        return {
+            'term': match.group(),
+            'position': match.start(),
+            'category': term['category'],
+            'description': term.get('description', '')
+        }
+
+    @staticmethod
+    def _compile_terms(terms: List[Dict]) -> Tuple[Optional[re.Pattern], List[Tuple[re.Pattern, Dict]]]:
+        """Compile patterns into one named-group alternation
+
+        Group t<i> marks terms[i]. Invalid patterns are reported and skipped.
+        """
+        alternatives = []
+        separate = []
+        for index, term in enumerate(terms):
+            pattern = term['pattern']
             try:
-                matches = re.finditer(term['pattern'], content, re.IGNORECASE)
-                for match in matches:
-                    found_terms.append({
-                        'term': match.group(),
-                        'position': match.start(),
-                        'category': term['category'],
-                        'description': term.get('description', '')
-                    })
-            except Exception:
-                print('Error processing a medical term.')
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                print(f'Invalid medical term pattern {pattern!r}: {e}')
                 continue
-                
-        return {'terms': found_terms}
+            if SEPARATE_SCAN.search(pattern):
+                separate.append((regex, term))
+                continue
+            # '(?x)abc' becomes '(?x:abc)' so it can sit inside the alternation
+            pattern = LEADING_FLAGS.sub(lambda flags: f'(?{flags.group(1)}:', pattern, count=1)
+            if pattern != term['pattern']:
+                pattern += ')'
+            alternatives.append((index, pattern))
+
+        if not alternatives:
+            return None, separate
+
+        # re has no multi-pattern prefilter: every alternative is tried at
+        # every position. Patterns are bucketed by their leading \b and first
+        # literal character, so one lookahead rejects a whole bucket and one
+        # \b check covers a run of bucketed patterns.
+        buckets = {}
+        for index, pattern in alternatives:
+            # 'a|b' starts with 'a' only in its first branch: never hoisted or bucketed
+            alternation = _has_top_level_alternation(pattern)
+            hoisted = pattern.startswith(WORD_BOUNDARY) and not alternation
+            if hoisted:
+                pattern = pattern[len(WORD_BOUNDARY):]
+            first = None if alternation else _first_literal(pattern)
+            key = (hoisted, first.casefold()) if first else (hoisted, index)
+            buckets.setdefault(key, (first, []))[1].append(f'(?P<t{index}>{pattern})')
+
+        runs = []
+        for (hoisted, _), (first, groups) in buckets.items():
+            body = '|'.join(groups)
+            if first:
+                body = f'(?={re.escape(first)})(?:{body})'
+            if runs and runs[-1][0] == hoisted:
+                runs[-1][1].append(body)
+            else:
+                runs.append((hoisted, [body]))
+
+        combined = '|'.join(
+            f'{WORD_BOUNDARY}(?:{"|".join(bodies)})' if hoisted else '|'.join(bodies)
+            for hoisted, bodies in runs
+        )
+        return re.compile(combined, re.IGNORECASE), separate
 
     def _load_medical_terms(self) -> List[Dict]:
-        # TODO: Load from configuration
-        return [
+        terms = [
             {'pattern': r'\b\w*itis\b', 'category': 'inflammation'},
             {'pattern': r'\b\w*oma\b', 'category': 'tumor'},
             {'pattern': r'\b\w*ectomy\b', 'category': 'surgical_removal'}
-        ]
\ No newline at end of file
+        ]
+        # Patterns from data/patterns, compiled into the shared dictionary artifact
+        try:
+            terms.extend(get_medical_dictionary().patterns())
+        except (OSError, ValueError) as e:
+            print(f'Error loading medical patterns: {e}')
+        return terms
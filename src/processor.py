@@ -1,28 +1,38 @@
-import gc
 import os
 import numpy as np
 from datetime import datetime
 from PIL import Image
 from pdf2image import convert_from_path
-import pytesseract
 import streamlit as st
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+from src.async_processor import AsyncProcessor, StageError
 from src.errors import ProcessingError
 from src.plugin_manager import PluginManager
-from time import sleep
-import win32com.client
+from src.tread.instrumentation import get_instrumentation, span
+from src.tread.monitoring import TREADMonitor, get_monitor
+from src.utils.ocr_backends import get_ocr_backend
+from src.utils.page_engine import PageOCREngine
+from src.converters.doc_converter import DocConverter, PptConverter
 import subprocess
 from pathlib import Path
 import tempfile
 
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, num_workers: Optional[int] = None, rasterizer: Optional[str] = None):
         self.plugin_manager = PluginManager()
-        self.word = None
-        self.powerpoint = None
+        self.page_engine = PageOCREngine(num_workers=num_workers, rasterizer=rasterizer)
+        self.async_processor = AsyncProcessor(max_workers=self.page_engine.num_workers)
         self.temp_dir = Path(tempfile.mkdtemp())
 
+    @property
+    def monitor(self) -> TREADMonitor:
+        # Общий для процесса монитор: создается при первой обработке файла
+        return get_monitor()
+
     def cleanup(self):
+        self.page_engine.shutdown()
+        self.async_processor.close()
+
         try:
             # Очистка временных файлов
             if self.temp_dir.exists():
@@ -35,49 +45,17 @@ class DocumentProcessor:
         except:
             pass
 
-        if self.word:
-            try:
-                self.word.Quit()
-            except:
-                pass
-            self.word = None
-        
-        if self.powerpoint:
-            try:
-                self.powerpoint.Quit()
-            except:
-                pass
-            self.powerpoint = None
-
     def convert_doc(self, file_path: str) -> str:
+        # Через пул headless LibreOffice (office_pool): DOC -> DOCX в памяти
         try:
-            if not self.word:
-                self.word = win32com.client.Dispatch('Word.Application')
-                self.word.Visible = False
-            
-            doc = self.word.Documents.Open(file_path)
-            text = doc.Content.Text
-            doc.Close()
-            return text
+            return DocConverter().convert(file_path)
         except Exception as e:
             raise ProcessingError(f'Ошибка конвертации DOC файла: {str(e)}')
 
     def convert_ppt(self, file_path: str) -> str:
+        # Через пул headless LibreOffice (office_pool): PPT -> PPTX в памяти
         try:
-            if not self.powerpoint:
-                self.powerpoint = win32com.client.Dispatch('PowerPoint.Application')
-            
-            ppt = self.powerpoint.Presentations.Open(file_path)
-            text_parts = []
-            
-            for slide in ppt.Slides:
-                for shape in slide.Shapes:
-                    if hasattr(shape, 'TextFrame'):
-                        if shape.TextFrame.HasText:
-                            text_parts.append(shape.TextFrame.TextRange.Text)
-            
-            ppt.Close()
-            return '\n'.join(text_parts)
+            return PptConverter().convert(file_path)['text']
         except Exception as e:
             raise ProcessingError(f'Ошибка конвертации PPT файла: {str(e)}')
 
@@ -86,11 +64,14 @@ class DocumentProcessor:
             pdf_path = file_path.rsplit('.', 1)[0] + '.pdf'
             subprocess.run(['ddjvu', '-format=pdf', file_path, pdf_path], check=True)
             
-            images = convert_from_path(pdf_path)
+            with span('rasterize', file=os.path.basename(file_path)):
+                images = convert_from_path(pdf_path)
             text_parts = []
-            for image in images:
-                text = pytesseract.image_to_string(image, lang='eng+rus')
+            for page, image in enumerate(images, 1):
+                with span('ocr', page=page):
+                    text = get_ocr_backend().image_to_string(image, lang='eng+rus')
                 text_parts.append(text)
+                self.monitor.log_page_processed(len(text.encode('utf-8')))
             
             os.unlink(pdf_path)
             return '\n\n'.join(text_parts)
@@ -99,99 +80,125 @@ class DocumentProcessor:
         except Exception as e:
             raise ProcessingError(f'Ошибка обработки DJVU файла: {str(e)}')
 
+    def _apply_plugins(self, text: str) -> str:
+        # Обработка текста плагинами
+        processed_text = text
+        for plugin in self.plugin_manager.get_plugins():
+            try:
+                processed_text = plugin.process_text(processed_text)
+            except Exception as e:
+                st.warning(f'Ошибка плагина {plugin.__class__.__name__}: {str(e)}')
+        return processed_text
+
+    def _process_page_result(self, page_result: dict) -> dict:
+        # Растеризация и OCR шли в рабочих процессах: их длительности приходят вместе с результатом
+        get_instrumentation().record_timings(page_result.pop('timings', {}), page=page_result['page'])
+        if 'error' in page_result:
+            # Ошибка одной страницы не прерывает обработку остальных
+            st.warning(f'Ошибка обработки страницы {page_result["page"]}: {page_result["error"]}')
+            self.monitor.log_page_processed(0)
+            return page_result
+
+        with span('plugins', page=page_result['page']):
+            page_result['text'] = self._apply_plugins(page_result['text'])
+        self.monitor.log_page_processed(len(page_result['text'].encode('utf-8')))
+        return page_result
+
+    def _iter_page_range(self, pdf_path: str, first_page: int, last_page: int,
+                         window: Optional[int] = None) -> Iterator[dict]:
+        # Растеризация и OCR страниц выполняются параллельно в пуле процессов
+        for page_result in self.page_engine.iter_pages(pdf_path, first_page, last_page, window):
+            yield self._process_page_result(page_result)
+
     def process_pdf_in_chunks(self, pdf_path: str, first_page: int, last_page: int) -> List[dict]:
         try:
-            # Конвертируем только указанный диапазон страниц
-            images = convert_from_path(
-                pdf_path,
-                first_page=first_page,
-                last_page=last_page,
-                dpi=150,
-                thread_count=2,
-                grayscale=True,
-                size=(800, None),
-                fmt='png',  # Используем PNG для лучшего качества
-                output_folder=str(self.temp_dir),  # Сохраняем во временную директорию
-                paths_only=True  # Возвращаем только пути к файлам
-            )
-            
-            results = []
-            for img_path in images:
-                try:
-                    # Загружаем и обрабатываем одно изображение
-                    with Image.open(img_path) as img:
-                        img = img.convert('L')
-                        img = img.point(lambda p: p > 127 and 255)
-                        
-                        text = pytesseract.image_to_string(
-                            img,
-                            lang='eng+rus',
-                            config='--psm 6 --oem 3 -c tessedit_do_invert=0'
-                        )
-                        
-                        # Обработка текста плагинами
-                        processed_text = text
-                        for plugin in self.plugin_manager.get_plugins():
-                            try:
-                                processed_text = plugin.process_text(processed_text)
-                            except Exception as e:
-                                st.warning(f'Ошибка плагина {plugin.__class__.__name__}: {str(e)}')
-                        
-                        results.append({'text': processed_text})
-                finally:
-                    # Удаляем временный файл изображения
-                    try:
-                        Path(img_path).unlink()
-                    except:
-                        pass
-            
-            return results
+            return list(self._iter_page_range(pdf_path, first_page, last_page))
         except Exception as e:
             raise ProcessingError(f'Ошибка обработки страниц {first_page}-{last_page}: {str(e)}')
 
-    def process_large_pdf(self, file_path: str, chunk_size: int = 10) -> Dict:
+    def get_page_count(self, file_path: str) -> int:
+        return self.page_engine.page_count(file_path)
+
+    def iter_pages(self, file_path: str, window: Optional[int] = None) -> Iterator[dict]:
+        """Выдает результат каждой страницы PDF сразу после OCR и плагинов
+
+        Страницы выдаются по порядку; в обработке одновременно находится не
+        более window страниц, поэтому потребление памяти не зависит от
+        размера документа.
+        """
+        try:
+            total_pages = self.get_page_count(file_path)
+            self.monitor.start_file_processing(file_path)
+            yield from self._iter_page_range(file_path, 1, total_pages, window)
+        except ProcessingError:
+            raise
+        except Exception as e:
+            raise ProcessingError(f'Ошибка обработки PDF: {str(e)}')
+
+    async def aiter_pages(self, file_path: str, window: Optional[int] = None) -> AsyncIterator[dict]:
+        """Асинхронный вариант iter_pages, не блокирующий цикл событий
+
+        OCR страницы (растеризация, бинаризация, распознавание в одном
+        процессе пула page_engine) и плагины - стадии конвейера AsyncProcessor
+        с ограниченными очередями между ними; window - не более стольких
+        страниц в обработке одновременно.
+        """
+        try:
+            total_pages = self.get_page_count(file_path)
+            self.monitor.start_file_processing(file_path)
+        except Exception as e:
+            raise ProcessingError(f'Ошибка обработки PDF: {str(e)}')
+
+        pages = self.async_processor.stream_pages(
+            file_path, 1, total_pages, self.page_engine.options,
+            post_process=self._process_page_result, executor=self.page_engine.executor,
+            max_in_flight=window
+        )
+        try:
+            async for page_result in pages:
+                yield page_result
+        except StageError as e:
+            raise ProcessingError(f'Ошибка обработки PDF: {str(e)}')
+        finally:
+            await pages.aclose()
+
+    def process_large_pdf(self, file_path: str, chunk_size: Optional[int] = None) -> Dict:
         try:
             # Создаем контейнеры для отображения прогресса
             status_text = st.empty()
             progress_bar = st.progress(0)
-            chunk_progress = st.empty()
+            page_progress = st.empty()
             
             # Получаем общее количество страниц
-            from pdf2image.pdf2image import pdfinfo_from_path
-            pdf_info = pdfinfo_from_path(file_path)
-            total_pages = pdf_info['Pages']
+            total_pages = self.get_page_count(file_path)
+            self.monitor.start_file_processing(file_path)
             
             status_text.text(f'Найдено страниц: {total_pages}')
             all_results = []
             
-            # Обрабатываем PDF по частям
-            for start_page in range(1, total_pages + 1, chunk_size):
-                end_page = min(start_page + chunk_size - 1, total_pages)
-                
-                chunk_progress.text(f'Обработка страниц {start_page}-{end_page} из {total_pages}')
-                
-                # Обрабатываем текущую порцию страниц
-                chunk_results = self.process_pdf_in_chunks(file_path, start_page, end_page)
-                all_results.extend(chunk_results)
-                
-                # Обновляем прогресс
-                progress = len(all_results) / total_pages
-                progress_bar.progress(progress)
+            # chunk_size - число страниц, одновременно находящихся в обработке
+            for page_result in self._iter_page_range(file_path, 1, total_pages, chunk_size):
+                all_results.append(page_result)
                 
-                # Принудительно очищаем память
-                gc.collect()
-                sleep(0.1)  # Небольшая пауза для обновления UI
+                # Обновляем прогресс по мере готовности страниц
+                page_progress.text(f'Обработано страниц: {len(all_results)} из {total_pages}')
+                progress_bar.progress(len(all_results) / total_pages)
             
             status_text.text('Обработка завершена!')
             progress_bar.progress(1.0)
-            chunk_progress.empty()
+            page_progress.empty()
             
             return {
                 'pages': all_results,
                 'metadata': {
                     'processed_at': datetime.now().isoformat(),
                     'total_pages': total_pages,
-                    'optimization': 'chunk_processing'
+                    'optimization': 'page_streaming',
+                    'num_workers': self.page_engine.num_workers,
+                    'failed_pages': [r['page'] for r in all_results if 'error' in r],
+                    'text_layer_pages': sum(
+                        1 for r in all_results if r.get('metadata', {}).get('source') == 'text_layer'
+                    )
                 }
             }
         except Exception as e:
@@ -202,6 +209,7 @@ class DocumentProcessor:
     def process_document(self, file_path: str, file_type: str) -> Dict:
         try:
             file_type = file_type.lower()
+            self.monitor.start_file_processing(file_path)
             
             if file_type == 'pdf':
                 file_size = os.path.getsize(file_path) / (1024 * 1024)  # В МБ
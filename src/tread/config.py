@@ -7,9 +7,22 @@ TREAD_CONFIG = {
     'medical_weight': 1.5,
     'use_cache': True,
     'cache_size': 1000,
+    'page_cache_path': '.cache/tread_pages.db',
+    'page_cache_max_bytes': 256 * 1024 * 1024,
     'num_workers': 4,
     'ocr_dpi': 300,
+    'rasterizer': 'pdf2image',  # or 'pymupdf' (in-memory, no poppler subprocess)
+    'use_text_layer': True,
+    'text_layer_min_chars': 50,
+    'text_layer_min_valid_ratio': 0.9,
     'ocr_lang': 'eng+rus',
+    'ocr_backend': 'auto',  # 'tesserocr' (persistent engine), 'pytesseract' or 'auto'
+    'office_pool_size': 2,  # headless LibreOffice listeners for .doc/.ppt
+    'office_timeout': 120,  # seconds per legacy document
+    'soffice_path': 'soffice',
+    'monitor_port': 8765,  # localhost port for pdf-monitor; None disables the server
+    'monitor_buffer_size': 1000,  # spans/samples kept in each ring buffer
+    'monitor_sample_interval': 1.0,  # seconds between CPU/memory samples
     'enhance_medical': True,
     'image_quality': 90,
     'max_image_size': 2000,
@@ -0,0 +1,258 @@
+"""
+Timing spans and resource samples for the live monitor
+
+Processing code wraps its stages in span('rasterize'), span('ocr'), ...
+Finished spans go into a fixed-size ring buffer next to running per-stage
+totals, so recording costs two clock reads and a deque append no matter
+how long the process runs. Work done in worker processes (page_engine)
+returns its timings with the result and is recorded by the parent with
+record_timings().
+
+ResourceSampler polls CPU and memory on a background thread, off the
+processing path. MonitorServer answers each request line from a local
+client with one JSON line (spans, stage totals, TREADMonitor stats);
+`pdf-monitor` polls it with fetch_snapshot().
+"""
+import functools
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import psutil
+from .config import TREAD_CONFIG
+
+
+@dataclass
+class Span:
+    seq: int  # increasing per process, lets clients fetch only new spans
+    stage: str
+    start: float  # wall clock, seconds
+    duration: float  # seconds
+    pid: int
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+class RingBuffer:
+    """Thread-safe fixed-size buffer; the oldest entries are dropped when full"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def append(self, item: Any):
+        with self._lock:
+            self._items.append(item)
+
+    def snapshot(self) -> List[Any]:
+        with self._lock:
+            return list(self._items)
+
+    def latest(self) -> Optional[Any]:
+        with self._lock:
+            return self._items[-1] if self._items else None
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class Instrumentation:
+    """Per-process span recorder"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.spans = RingBuffer(capacity or TREAD_CONFIG['monitor_buffer_size'])
+        # stage -> [count, total seconds, max seconds]; kept after spans are dropped
+        self._totals: Dict[str, List[float]] = {}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, duration: float, start: Optional[float] = None, **attrs) -> Span:
+        """Record a finished span"""
+        with self._lock:
+            self._seq += 1
+            span = Span(self._seq, stage, time.time() - duration if start is None else start,
+                        duration, os.getpid(), attrs)
+            totals = self._totals.setdefault(stage, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] = max(totals[2], duration)
+            self.spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, stage: str, **attrs) -> Iterator[Dict[str, Any]]:
+        """Time the block as one span; attributes may be added to the yielded dict"""
+        start = time.time()
+        started = time.perf_counter()
+        try:
+            yield attrs
+        except Exception as e:
+            attrs['error'] = type(e).__name__
+            raise
+        finally:
+            self.record(stage, time.perf_counter() - started, start, **attrs)
+
+    def record_timings(self, timings: Dict[str, float], **attrs):
+        """Record stage durations measured elsewhere (e.g. in a worker process)"""
+        for stage, duration in timings.items():
+            self.record(stage, duration, **attrs)
+
+    def recent_spans(self, since: int = 0) -> List[Span]:
+        """Spans still in the buffer with seq greater than since"""
+        return [span for span in self.spans.snapshot() if span.seq > since]
+
+    def stage_stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                stage: {
+                    'count': int(count),
+                    'total_sec': total,
+                    'mean_ms': total / count * 1000,
+                    'max_ms': longest * 1000
+                }
+                for stage, (count, total, longest) in self._totals.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+            self.spans.clear()
+
+
+_instances: Dict[int, Instrumentation] = {}
+
+
+def get_instrumentation() -> Instrumentation:
+    """Process-wide recorder"""
+    # Keyed by pid: a forked worker starts with an empty buffer of its own
+    pid = os.getpid()
+    if pid not in _instances:
+        _instances[pid] = Instrumentation()
+    return _instances[pid]
+
+
+def span(stage: str, **attrs):
+    """Context manager timing a block into the process-wide recorder"""
+    return get_instrumentation().span(stage, **attrs)
+
+
+def instrumented(stage: str) -> Callable:
+    """Decorator for convert(self, file_path, ...) methods: one span per call"""
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, file_path, *args, **kwargs):
+            with span(stage, converter=type(self).__name__, file=os.path.basename(str(file_path))):
+                return method(self, file_path, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class ResourceSampler:
+    """Samples CPU and process memory on a daemon thread into a ring buffer"""
+
+    def __init__(self, interval: Optional[float] = None, capacity: Optional[int] = None):
+        self.interval = interval or TREAD_CONFIG['monitor_sample_interval']
+        self.samples = RingBuffer(capacity or TREAD_CONFIG['monitor_buffer_size'])
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self) -> Dict[str, float]:
+        sample = {
+            'time': time.time(),
+            'cpu_percent': psutil.cpu_percent(),
+            'memory_mb': self._process.memory_info().rss / 1024 / 1024
+        }
+        self.samples.append(sample)
+        return sample
+
+    def latest(self) -> Dict[str, float]:
+        """Most recent sample (taken now if there is none yet)"""
+        return self.samples.latest() or self.sample()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self.sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='tread-sampler', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class _SnapshotHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # One request per line: {"since": <last seen span seq>}
+        for line in self.rfile:
+            try:
+                since = int(json.loads(line).get('since', 0))
+            except (ValueError, AttributeError):
+                since = 0
+            payload = json.dumps(self.server.snapshot(since), ensure_ascii=False, default=str)
+            self.wfile.write(payload.encode('utf-8') + b'\n')
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class MonitorServer:
+    """Serves snapshot(since) to monitor clients on a localhost TCP port"""
+
+    def __init__(self, snapshot: Callable[[int], Dict[str, Any]], host: str = '127.0.0.1',
+                 port: Optional[int] = None):
+        self.snapshot = snapshot
+        self.host = host
+        self.port = TREAD_CONFIG['monitor_port'] if port is None else port
+        self._server = None
+
+    @property
+    def address(self):
+        return self._server.server_address if self._server else (self.host, self.port)
+
+    def start(self):
+        """Bind and serve on a daemon thread; OSError if the port is taken"""
+        if self._server is not None:
+            return
+        self._server = _Server((self.host, self.port), _SnapshotHandler)
+        self._server.snapshot = self.snapshot
+        threading.Thread(target=self._server.serve_forever, name='tread-monitor', daemon=True).start()
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def fetch_snapshot(host: str = '127.0.0.1', port: Optional[int] = None, since: int = 0,
+                   timeout: float = 2.0) -> Dict[str, Any]:
+    """Ask a MonitorServer for its current snapshot"""
+    port = TREAD_CONFIG['monitor_port'] if port is None else port
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.sendall(json.dumps({'since': since}).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError('Monitor closed the connection')
+    return json.loads(line)
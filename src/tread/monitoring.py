@@ -1,10 +1,13 @@
-import psutil
+import os
 import time
+from collections import deque
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 import json
-from dataclasses import dataclass
+from .config import TREAD_CONFIG
+from .instrumentation import Instrumentation, MonitorServer, ResourceSampler, get_instrumentation
 
 @dataclass
 class ProcessingMetrics:
@@ -17,15 +20,25 @@ class ProcessingMetrics:
     optimization_ratio: float
 
 class TREADMonitor:
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None,
+                 instrumentation: Optional[Instrumentation] = None,
+                 sampler: Optional[ResourceSampler] = None):
         self.start_time = time.time()
         self.log_dir = Path("logs/tread")
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self._setup_logging()
-        self.metrics = []
+        # Ring buffer: a long-running process keeps only the latest metrics
+        self.metrics = deque(maxlen=TREAD_CONFIG['monitor_buffer_size'])
         self.processed_pages = 0
         self.processed_bytes = 0
         self.current_file = None
+        self.instrumentation = instrumentation or get_instrumentation()
+        # CPU/memory are sampled in the background, not on every page; the
+        # thread is started by get_monitor()/serve(), so short-lived
+        # monitors (tests, scripts) do not leave it running
+        self.sampler = sampler or ResourceSampler()
+        self.initial_memory = self.sampler.latest()['memory_mb']
+        self.server = None
 
     def _setup_logging(self):
         self.logger = logging.getLogger('tread_pdf_monitor')
@@ -41,7 +54,9 @@ class TREADMonitor:
         """Start monitoring new file processing"""
         self.current_file = Path(file_path)
         self.start_time = time.time()
-        self.initial_memory = psutil.Process().memory_info().rss / 1024 / 1024
+        self.processed_pages = 0
+        self.processed_bytes = 0
+        self.initial_memory = self.sampler.latest()['memory_mb']
         
         self.logger.info(f"Started processing {file_path}")
         self.logger.info(f"Initial memory usage: {self.initial_memory:.2f}MB")
@@ -54,14 +69,15 @@ class TREADMonitor:
         current_time = time.time()
         elapsed_time = current_time - self.start_time
         
-        current_memory = psutil.Process().memory_info().rss / 1024 / 1024
+        resources = self.sampler.latest()
+        current_memory = resources['memory_mb']
         memory_diff = current_memory - self.initial_memory
         
         metrics = ProcessingMetrics(
             memory_usage=current_memory,
-            cpu_usage=psutil.cpu_percent(),
+            cpu_usage=resources['cpu_percent'],
             processing_time=elapsed_time,
-            pages_per_second=self.processed_pages / elapsed_time,
+            pages_per_second=self.processed_pages / max(elapsed_time, 1e-6),
             bytes_processed=self.processed_bytes,
             ocr_accuracy=ocr_confidence,
             optimization_ratio=self.processed_bytes / (memory_diff + 1)
@@ -73,7 +89,7 @@ class TREADMonitor:
     def _log_metrics(self, metrics: ProcessingMetrics):
         """Log current metrics to file"""
         self.logger.info(
-            f"File: {self.current_file.name} | "
+            f"File: {self.current_file.name if self.current_file else None} | "
             f"Pages: {self.processed_pages} | "
             f"Memory: {metrics.memory_usage:.2f}MB | "
             f"CPU: {metrics.cpu_usage:.1f}% | "
@@ -96,9 +112,36 @@ class TREADMonitor:
             'pages_per_second': latest.pages_per_second,
             'bytes_processed': latest.bytes_processed,
             'ocr_accuracy': latest.ocr_accuracy,
-            'optimization_ratio': latest.optimization_ratio
+            'optimization_ratio': latest.optimization_ratio,
+            'stages': self.instrumentation.stage_stats()
+        }
+
+    def snapshot(self, since: int = 0) -> Dict[str, Any]:
+        """Stats, stage totals, resources and spans newer than `since` for the live monitor"""
+        return {
+            'pid': os.getpid(),
+            'stats': self.get_current_stats(),
+            'stages': self.instrumentation.stage_stats(),
+            'resources': self.sampler.latest(),
+            'spans': [asdict(span) for span in self.instrumentation.recent_spans(since)]
         }
 
+    def serve(self, port: Optional[int] = None) -> MonitorServer:
+        """Expose snapshot() to `pdf-monitor` on a localhost port"""
+        if self.server is None:
+            self.sampler.start()
+            server = MonitorServer(self.snapshot, port=port)
+            server.start()
+            self.server = server
+        return self.server
+
+    def close(self):
+        """Stop the sampler thread and the monitor server"""
+        self.sampler.stop()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+
     def generate_report(self) -> str:
         """Generate detailed performance report"""
         stats = self.get_current_stats()
@@ -142,4 +185,23 @@ class TREADMonitor:
         with open(metrics_file, 'w') as f:
             json.dump(stats, f, indent=2)
         
-        self.logger.info(f"Metrics saved to {metrics_file}")
\ No newline at end of file
+        self.logger.info(f"Metrics saved to {metrics_file}")
+
+
+_monitors: Dict[int, TREADMonitor] = {}
+
+
+def get_monitor() -> TREADMonitor:
+    """Process-wide monitor, served on TREAD_CONFIG['monitor_port'] when set"""
+    pid = os.getpid()
+    monitor = _monitors.get(pid)
+    if monitor is None:
+        monitor = _monitors[pid] = TREADMonitor()
+        monitor.sampler.start()
+        if TREAD_CONFIG['monitor_port'] is not None:
+            try:
+                monitor.serve()
+            except OSError as e:
+                # Another process already serves the port: run without live monitoring
+                monitor.logger.warning(f"Monitor server not started: {e}")
+    return monitor
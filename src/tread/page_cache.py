@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from .config import TREAD_CONFIG
+
+
+class PageCache:
+    """Persistent content-addressed cache of page OCR results
+
+    Entries are keyed by a hash of the rasterized page bytes and the OCR
+    configuration, so identical pages are recognized once no matter which
+    document they come from. The cache lives in a SQLite file shared by
+    all processes and runs, and is bounded both by entry count and by the
+    total size of stored results (least recently used entries go first).
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.path = path or TREAD_CONFIG['page_cache_path']
+        # An explicit 0 is a valid (empty) budget, not "use the default"
+        self.max_entries = TREAD_CONFIG['cache_size'] if max_entries is None else max_entries
+        self.max_bytes = TREAD_CONFIG['page_cache_max_bytes'] if max_bytes is None else max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    @staticmethod
+    def make_key(page_bytes: bytes, ocr_config: str) -> str:
+        """Build cache key from rasterized page bytes and OCR config string"""
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(ocr_config.encode('utf-8'))
+        hasher.update(b'\0')
+        hasher.update(page_bytes)
+        return hasher.hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database lazily, once per process"""
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS pages ('
+                'key TEXT PRIMARY KEY, result TEXT NOT NULL, '
+                'size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages(last_access)')
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Get cached page result, or None on miss"""
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute('SELECT result FROM pages WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute('UPDATE pages SET last_access = ? WHERE key = ?', (time.time(), key))
+            conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, result: Dict) -> None:
+        """Store page result and evict least recently used entries over budget"""
+        payload = json.dumps(result, ensure_ascii=False)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO pages (key, result, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, payload, size, time.time())
+            )
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        count, total = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages').fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        expired = []
+        for key, size in conn.execute('SELECT key, size FROM pages ORDER BY last_access'):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            expired.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany('DELETE FROM pages WHERE key = ?', expired)
+        self.evictions += len(expired)
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and current cache size"""
+        with self._lock:
+            count, total = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': count,
+            'bytes': total
+        }
+
+    def clear(self) -> None:
+        """Remove all cached pages"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute('DELETE FROM pages')
+            conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -4,31 +4,63 @@ import pytesseract
 from PIL import Image
 import pdf2image
 from .config import TREAD_CONFIG
+from .instrumentation import span
+from .page_cache import PageCache
+from ..utils.ocr_backends import get_ocr_backend
 
 class TREADProcessor:
     def __init__(self, config: Optional[Dict] = None):
-        self.config = config or TREAD_CONFIG
-        self.cache = {}
+        self.config = {**TREAD_CONFIG, **(config or {})}
+        self.cache = PageCache(
+            path=self.config['page_cache_path'],
+            max_entries=self.config['cache_size'],
+            max_bytes=self.config['page_cache_max_bytes']
+        ) if self.config['use_cache'] else None
         self._init_ocr()
 
     def _init_ocr(self):
+        self.ocr_config = f"--oem 1 --psm 3 -l {self.config['ocr_lang']} --dpi {self.config['ocr_dpi']}"
         if self.config['enhance_medical']:
             pytesseract.pytesseract.tesseract_cmd = 'tesseract'
-            self.ocr_config = f"--oem 1 --psm 3 -l {self.config['ocr_lang']} --dpi {self.config['ocr_dpi']}"
 
     def process_pdf(self, pdf_path: str) -> Dict:
-        images = self._pdf_to_images(pdf_path)
+        with span('rasterize'):
+            images = self._pdf_to_images(pdf_path)
         results = []
         
         for image in images:
+            if self.cache is None:
+                results.append(self._process_page(image))
+                continue
+
             cache_key = self._get_cache_key(image)
-            if cache_key in self.cache:
-                results.append(self.cache[cache_key])
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                results.append(cached)
                 continue
             
             page_result = self._process_page(image)
-            if self.config['use_cache']:
-                self.cache[cache_key] = page_result
+            self.cache.set(cache_key, page_result)
             results.append(page_result)
             
-        return self._merge_results(results)
\ No newline at end of file
+        return self._merge_results(results)
+
+    def _pdf_to_images(self, pdf_path: str) -> List[Image.Image]:
+        return pdf2image.convert_from_path(pdf_path, dpi=self.config['ocr_dpi'])
+
+    def _get_cache_key(self, image: Image.Image) -> str:
+        # Mode and size are part of the key: equal bytes may encode different images
+        ocr_config = f"{self.ocr_config} {image.mode} {image.size[0]}x{image.size[1]}"
+        return PageCache.make_key(image.tobytes(), ocr_config)
+
+    def _process_page(self, image: Image.Image) -> Dict:
+        backend = get_ocr_backend(self.config['ocr_backend'])
+        with span('ocr'):
+            return {'text': backend.image_to_string(image, lang=self.config['ocr_lang'], config=self.ocr_config)}
+
+    def _merge_results(self, results: List[Dict]) -> Dict:
+        return {
+            'text': '\n\n'.join(result['text'] for result in results),
+            'pages': results,
+            'cache': self.cache.stats() if self.cache is not None else None
+        }
@@ -1,3 +1,3 @@
-from .medical_terms import extract_medical_terms
+from .medical_terms import extract_medical_terms, extract_medical_terms_batch
 
-__all__ = ['extract_medical_terms']
+__all__ = ['extract_medical_terms', 'extract_medical_terms_batch']
@@ -0,0 +1,215 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+import logging
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Base class for CacheManager storage backends"""
+
+    def __init__(self, ttl: timedelta):
+        self.ttl = ttl
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return stored value, or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store value; it expires after the backend TTL"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove value, return True if it existed"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all values"""
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Remove expired values, return number of removed entries"""
+        pass
+
+
+class DirectoryBackend(CacheBackend):
+    """One JSON file per entry (the original CacheManager layout)"""
+
+    def __init__(self, cache_dir: str, ttl: timedelta):
+        super().__init__(ttl)
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _get_cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_expired(self, cached: Dict[str, Any]) -> bool:
+        cached_time = datetime.fromisoformat(cached['_cached_at'])
+        return datetime.now() - cached_time > self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        cache_path = self._get_cache_path(key)
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return None
+
+        if self._is_expired(cached):
+            self.delete(key)
+            return None
+
+        del cached['_cached_at']
+        return cached
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        cache_path = self._get_cache_path(key)
+        value_with_time = value.copy()
+        value_with_time['_cached_at'] = datetime.now().isoformat()
+
+        # Write to a temporary file first so readers never see partial JSON
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value_with_time, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+    def delete(self, key: str) -> bool:
+        try:
+            os.remove(self._get_cache_path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> None:
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.json'):
+                os.remove(os.path.join(self.cache_dir, filename))
+
+    def purge_expired(self) -> int:
+        removed = 0
+        # Entries are written once, so a file modified within the TTL cannot
+        # be expired yet; only stale files need to be opened and parsed
+        stale_before = time.time() - self.ttl.total_seconds()
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    if entry.stat().st_mtime > stale_before:
+                        continue
+                    with open(entry.path, 'r', encoding='utf-8') as f:
+                        cached = json.load(f)
+                    if self._is_expired(cached):
+                        os.remove(entry.path)
+                        removed += 1
+                        logger.debug(f"Removed expired cache file: {entry.name}")
+                except FileNotFoundError:
+                    continue
+                except Exception as e:
+                    logger.error(f"Error during cleanup of {entry.name}: {str(e)}")
+        return removed
+
+
+class SQLiteBackend(CacheBackend):
+    """Indexed SQLite store with an expiry column and compressed values"""
+
+    def __init__(self, path: str, ttl: timedelta, compression: str = 'zstd'):
+        super().__init__(ttl)
+        self.path = path
+        if compression == 'zstd' and zstandard is None:
+            compression = 'zlib'
+        self.compression = compression
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_expires_at ON entries(expires_at)')
+        self._conn.commit()
+
+    def _encode(self, value: Dict[str, Any]) -> bytes:
+        raw = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # First byte tags the codec so a store can be reopened with another setting
+        if self.compression == 'zstd':
+            return b's' + zstandard.ZstdCompressor().compress(raw)
+        if self.compression == 'zlib':
+            return b'z' + zlib.compress(raw)
+        return b'n' + raw
+
+    @staticmethod
+    def _decode(blob: bytes) -> Dict[str, Any]:
+        codec, payload = blob[:1], blob[1:]
+        if codec == b's':
+            if zstandard is None:
+                raise RuntimeError('zstandard is required to read this cache entry')
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif codec == b'z':
+            payload = zlib.decompress(payload)
+        return json.loads(payload.decode('utf-8'))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value FROM entries WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        blob = self._encode(value)
+        expires_at = time.time() + self.ttl.total_seconds()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, blob, expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM entries WHERE expires_at <= ?', (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+
+def create_backend(name: str, cache_dir: str, ttl: timedelta) -> CacheBackend:
+    """Create backend by name ('directory' or 'sqlite')"""
+    if name == 'directory':
+        return DirectoryBackend(cache_dir, ttl)
+    if name == 'sqlite':
+        return SQLiteBackend(os.path.join(cache_dir, 'cache.db'), ttl)
+    raise ValueError(f"Unknown cache backend: {name}")
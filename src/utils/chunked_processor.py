@@ -1,38 +1,71 @@
 import os
-from typing import BinaryIO, Generator
+from typing import Any, BinaryIO, Dict, Generator
 import streamlit as st
 from PIL import Image
 import io
-from pdf2image import convert_from_bytes
-import pytesseract
+import tempfile
 import time
+from .ocr_backends import get_ocr_backend
+from .rasterizer import get_rasterizer
+from .text_layer import assess_text_layer, is_usable_text_layer, iter_page_texts
+from ..tread.config import TREAD_CONFIG
 
 class ChunkedProcessor:
     """Process large files in chunks to prevent memory issues"""
     
     CHUNK_SIZE = 5 * 1024 * 1024  # 5MB chunks
+    OCR_DPI = 200
     
     @staticmethod
-    def process_pdf_in_chunks(file_data: bytes, progress_callback=None) -> Generator[str, None, None]:
-        """Process PDF file in chunks"""
+    def iter_pdf_pages(file_data: bytes, progress_callback=None) -> Generator[Dict[str, Any], None, None]:
+        """Process PDF page by page, OCR only pages without a usable text layer
+
+        Yields dicts with 'text' and 'metadata'; metadata['source'] is
+        'text_layer' or 'ocr' depending on the path the page took.
+        The PDF is written to a temporary file once, on the first page that
+        needs OCR, and every such page is rasterized from that file, instead
+        of handing the whole document to the renderer for each page.
+        """
+        page_texts = list(iter_page_texts(file_data))
+        total_pages = len(page_texts)
+        pdf_path = None
+        
         try:
-            # Convert PDF bytes to images in memory
-            images = convert_from_bytes(file_data, fmt='png')
-            total_images = len(images)
-            
-            for i, image in enumerate(images):
-                # Process each image
-                text = pytesseract.image_to_string(image, lang='eng+rus')
+            for i, layer_text in enumerate(page_texts):
+                metadata = assess_text_layer(layer_text)
+                if is_usable_text_layer(metadata):
+                    metadata['source'] = 'text_layer'
+                    text = layer_text
+                else:
+                    # Image-only page: rasterize just this page
+                    metadata['source'] = 'ocr'
+                    if pdf_path is None:
+                        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+                            f.write(file_data)
+                        pdf_path = f.name
+                    image = get_rasterizer(TREAD_CONFIG['rasterizer']).render(
+                        pdf_path, i + 1, ChunkedProcessor.OCR_DPI)
+                    text = get_ocr_backend().image_to_string(image, lang='eng+rus')
+                    
+                    # Add small delay to prevent freezing
+                    time.sleep(0.1)
                 
                 # Update progress
                 if progress_callback:
-                    progress = (i + 1) / total_images
-                    progress_callback(progress, f"Обработка страницы {i+1}/{total_images}")
-                
-                # Add small delay to prevent freezing
-                time.sleep(0.1)
+                    progress = (i + 1) / total_pages
+                    progress_callback(progress, f"Обработка страницы {i+1}/{total_pages}")
                 
-                yield text
+                yield {'text': text, 'metadata': metadata}
+        finally:
+            if pdf_path is not None:
+                os.unlink(pdf_path)
+    
+    @staticmethod
+    def process_pdf_in_chunks(file_data: bytes, progress_callback=None) -> Generator[str, None, None]:
+        """Process PDF file in chunks"""
+        try:
+            for page in ChunkedProcessor.iter_pdf_pages(file_data, progress_callback):
+                yield page['text']
                 
         except Exception as e:
             st.error(f"Ошибка при обработке PDF: {str(e)}")
@@ -57,7 +90,7 @@ class ChunkedProcessor:
                 progress_callback(0.75, "Распознавание текста...")
             
             # Extract text
-            text = pytesseract.image_to_string(image, lang='eng+rus')
+            text = get_ocr_backend().image_to_string(image, lang='eng+rus')
             
             if progress_callback:
                 progress_callback(1.0, "Обработка завершена")
@@ -66,4 +99,4 @@ class ChunkedProcessor:
             
         except Exception as e:
             st.error(f"Ошибка при обработке изображения: {str(e)}")
-            return ""
\ No newline at end of file
+            return ""
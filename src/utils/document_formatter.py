@@ -1,13 +1,42 @@
-from typing import Dict, List, Any
+from typing import Dict, Iterator, List, Any, TextIO
 from bs4 import BeautifulSoup
+from html import escape
 import json
+from .highlighter import TermHighlighter
 
 class DocumentFormatter:
-    """Class for document formatting and conversion"""
-    
+    """Class for document formatting and conversion
+
+    Every format has three forms: iter_* yields the output in chunks (one
+    page of text at a time), write_* streams it into a text file-like
+    object, and to_* returns it as a single string.
+    """
+
     @staticmethod
-    def to_html(data: Dict[str, Any], include_styles: bool = True) -> str:
-        """Convert processed document data to HTML format"""
+    def iter_pages(data: Dict[str, Any]) -> Iterator[str]:
+        """Yield document text page by page ('pages' if present, else 'text')"""
+        if data.get('pages'):
+            for page in data['pages']:
+                yield page.get('text', '') if isinstance(page, dict) else str(page)
+        elif 'text' in data:
+            yield data['text']
+
+    @staticmethod
+    def _iter_page_lines(data: Dict[str, Any]) -> Iterator[str]:
+        """Pages as lines; the empty line between them gives a blank-line separator"""
+        for number, page in enumerate(DocumentFormatter.iter_pages(data)):
+            if number:
+                yield ''
+            yield page
+
+    @staticmethod
+    def _has_text(data: Dict[str, Any]) -> bool:
+        return bool(data.get('pages')) or 'text' in data
+
+    @staticmethod
+    def iter_html(data: Dict[str, Any], include_styles: bool = True, include_tables: bool = True,
+                  highlight_terms: bool = True) -> Iterator[str]:
+        """Yield HTML output in chunks"""
         # Basic CSS styles
         styles = """
         <style>
@@ -23,139 +52,226 @@ class DocumentFormatter:
             .metadata { color: #7F8C8D; font-size: 0.9em; }
         </style>
         """ if include_styles else ""
-        
+
         # Start HTML document
-        html = f"""<html>
+        yield f"""<html>
         <head>
             <meta charset="utf-8">
             {styles}
         </head>
         <body>"""
-        
+
         # Add metadata if available
         if 'metadata' in data:
-            html += '<div class="metadata">'
+            yield '<div class="metadata">'
             for key, value in data['metadata'].items():
-                html += f'<p><strong>{key}:</strong> {value}</p>'
-            html += '</div>'
-        
-        # Add main text with highlighted terms
-        if 'text' in data:
-            text = data['text']
-            
-            # Highlight terms
-            if 'terms' in data:
-                for term in data['terms']:
-                    text = text.replace(
-                        term['term'],
-                        f'<span class="term" title="{term.get("definition", "")}">{term["term"]}</span>'
-                    )
-            
-            html += f'<div class="content">{text}</div>'
-        
+                yield f'<p><strong>{escape(str(key))}:</strong> {escape(str(value))}</p>'
+            yield '</div>'
+
+        # Add main text with highlighted terms (escaped in the same pass)
+        if DocumentFormatter._has_text(data):
+            highlighter = TermHighlighter(data.get('terms', []) if highlight_terms else [], {'class': 'term'})
+            yield '<div class="content">'
+            for number, page in enumerate(DocumentFormatter.iter_pages(data)):
+                if number:
+                    yield '\n\n'
+                yield ''.join(highlighter.iter_html(page))
+            yield '</div>'
+
         # Add tables if present
-        if 'tables' in data and data['tables']:
-            html += '<h2>Таблицы:</h2>'
+        if include_tables and 'tables' in data and data['tables']:
+            yield '<h2>Таблицы:</h2>'
             for table in data['tables']:
-                html += '<table>'
+                yield '<table>'
                 for i, row in enumerate(table):
-                    html += '<tr>'
                     cell_tag = 'th' if i == 0 else 'td'
-                    for cell in row:
-                        html += f'<{cell_tag}>{cell}</{cell_tag}>'
-                    html += '</tr>'
-                html += '</table>'
-        
+                    cells = ''.join(f'<{cell_tag}>{escape(str(cell))}</{cell_tag}>' for cell in row)
+                    yield f'<tr>{cells}</tr>'
+                yield '</table>'
+
         # Close HTML document
-        html += '</body></html>'
-        
-        return html
-    
+        yield '</body></html>'
+
+    @staticmethod
+    def write_html(data: Dict[str, Any], stream: TextIO, include_styles: bool = True,
+                   include_tables: bool = True, highlight_terms: bool = True):
+        """Write HTML output to stream chunk by chunk"""
+        for chunk in DocumentFormatter.iter_html(data, include_styles, include_tables, highlight_terms):
+            stream.write(chunk)
+
+    @staticmethod
+    def to_html(data: Dict[str, Any], include_styles: bool = True, include_tables: bool = True,
+                highlight_terms: bool = True) -> str:
+        """Convert processed document data to HTML format"""
+        return ''.join(DocumentFormatter.iter_html(data, include_styles, include_tables, highlight_terms))
+
+    @staticmethod
+    def _is_lazy(value: Any) -> bool:
+        """Row streams (chunked CSV, streaming XML/JSON tables) and other non-JSON iterables"""
+        return not isinstance(value, (str, bytes, dict, list, tuple)) and hasattr(value, '__iter__')
+
+    @staticmethod
+    def _contains_lazy(value: Any) -> bool:
+        if isinstance(value, dict):
+            return any(DocumentFormatter._contains_lazy(item) for item in value.values())
+        if isinstance(value, (list, tuple)):
+            return any(DocumentFormatter._contains_lazy(item) for item in value)
+        return DocumentFormatter._is_lazy(value)
+
+    @staticmethod
+    def _iter_json_value(value: Any, indent: Any, level: int) -> Iterator[str]:
+        """Encode value like json.dumps, but iterate lazy tables one row at a time"""
+        def newline(depth: int) -> str:
+            return '\n' + ' ' * (indent * depth) if indent else ''
+
+        if not DocumentFormatter._contains_lazy(value):
+            encoded = json.dumps(value, ensure_ascii=False, indent=indent)
+            yield encoded.replace('\n', newline(level)) if indent and level else encoded
+            return
+
+        separator = ',' if indent else ', '
+        if isinstance(value, dict):
+            yield '{'
+            for number, (key, item) in enumerate(value.items()):
+                if not isinstance(key, str):
+                    # Same key conversion as json (1 -> "1", None -> "null")
+                    key = json.dumps(key)
+                yield (separator if number else '') + newline(level + 1) + json.dumps(key, ensure_ascii=False) + ': '
+                yield from DocumentFormatter._iter_json_value(item, indent, level + 1)
+            yield newline(level) + '}'
+            return
+
+        empty = True
+        for number, item in enumerate(value):
+            yield (separator if number else '[') + newline(level + 1)
+            yield from DocumentFormatter._iter_json_value(item, indent, level + 1)
+            empty = False
+        yield '[]' if empty else newline(level) + ']'
+
+    @staticmethod
+    def iter_json(data: Dict[str, Any], pretty: bool = True) -> Iterator[str]:
+        """Yield JSON output in chunks; lazy tables are encoded row by row"""
+        return DocumentFormatter._iter_json_value(data, 2 if pretty else None, 0)
+
+    @staticmethod
+    def write_json(data: Dict[str, Any], stream: TextIO, pretty: bool = True):
+        """Write JSON output to stream without materializing lazy tables"""
+        for chunk in DocumentFormatter.iter_json(data, pretty):
+            stream.write(chunk)
+
     @staticmethod
     def to_json(data: Dict[str, Any], pretty: bool = True) -> str:
         """Convert processed document data to JSON format"""
-        return json.dumps(data, ensure_ascii=False, indent=2 if pretty else None)
-    
+        return ''.join(DocumentFormatter.iter_json(data, pretty))
+
     @staticmethod
-    def to_plain_text(data: Dict[str, Any], include_metadata: bool = True) -> str:
-        """Convert processed document data to plain text format"""
-        text_parts = []
-        
+    def iter_plain_text(data: Dict[str, Any], include_metadata: bool = True,
+                        include_tables: bool = True) -> Iterator[str]:
+        """Yield plain text output line by line (a page of text is one chunk)"""
         # Add metadata if requested
         if include_metadata and 'metadata' in data:
-            text_parts.append('МЕТАДАННЫЕ:')
+            yield 'МЕТАДАННЫЕ:'
             for key, value in data['metadata'].items():
-                text_parts.append(f'{key}: {value}')
-            text_parts.append('\n')
-        
+                yield f'{key}: {value}'
+            yield '\n'
+
         # Add main text
-        if 'text' in data:
-            text_parts.append('ТЕКСТ:')
-            text_parts.append(data['text'])
-            text_parts.append('\n')
-        
+        if DocumentFormatter._has_text(data):
+            yield 'ТЕКСТ:'
+            yield from DocumentFormatter._iter_page_lines(data)
+            yield '\n'
+
         # Add tables
-        if 'tables' in data and data['tables']:
-            text_parts.append('ТАБЛИЦЫ:')
+        if include_tables and 'tables' in data and data['tables']:
+            yield 'ТАБЛИЦЫ:'
             for i, table in enumerate(data['tables'], 1):
-                text_parts.append(f'\nТаблица {i}:')
+                yield f'\nТаблица {i}:'
                 for row in table:
-                    text_parts.append('\t'.join(str(cell) for cell in row))
-                text_parts.append('')
-        
+                    yield '\t'.join(str(cell) for cell in row)
+                yield ''
+
         # Add terms
         if 'terms' in data and data['terms']:
-            text_parts.append('МЕДИЦИНСКИЕ ТЕРМИНЫ:')
+            yield 'МЕДИЦИНСКИЕ ТЕРМИНЫ:'
             for term in data['terms']:
-                text_parts.append(f"- {term['term']}")
+                yield f"- {term['term']}"
                 if 'definition' in term and term['definition']:
-                    text_parts.append(f"  Определение: {term['definition']}")
+                    yield f"  Определение: {term['definition']}"
                 if 'context' in term and term['context']:
-                    text_parts.append(f"  Контекст: {term['context']}")
-                text_parts.append('')
-        
-        return '\n'.join(text_parts)
-    
+                    yield f"  Контекст: {term['context']}"
+                yield ''
+
     @staticmethod
-    def to_markdown(data: Dict[str, Any]) -> str:
-        """Convert processed document data to Markdown format"""
-        md_parts = []
-        
+    def write_plain_text(data: Dict[str, Any], stream: TextIO, include_metadata: bool = True,
+                         include_tables: bool = True):
+        """Write plain text output to stream"""
+        DocumentFormatter._write_lines(
+            DocumentFormatter.iter_plain_text(data, include_metadata, include_tables), stream)
+
+    @staticmethod
+    def to_plain_text(data: Dict[str, Any], include_metadata: bool = True, include_tables: bool = True) -> str:
+        """Convert processed document data to plain text format"""
+        return '\n'.join(DocumentFormatter.iter_plain_text(data, include_metadata, include_tables))
+
+    @staticmethod
+    def iter_markdown(data: Dict[str, Any]) -> Iterator[str]:
+        """Yield Markdown output line by line (a page of text is one chunk)"""
         # Add metadata
         if 'metadata' in data:
-            md_parts.append('# Метаданные\n')
+            yield '# Метаданные\n'
             for key, value in data['metadata'].items():
-                md_parts.append(f'**{key}:** {value}  ')
-            md_parts.append('\n')
-        
+                yield f'**{key}:** {value}  '
+            yield '\n'
+
         # Add main text
-        if 'text' in data:
-            md_parts.append('# Текст\n')
-            md_parts.append(data['text'])
-            md_parts.append('\n')
-        
+        if DocumentFormatter._has_text(data):
+            yield '# Текст\n'
+            yield from DocumentFormatter._iter_page_lines(data)
+            yield '\n'
+
         # Add tables
         if 'tables' in data and data['tables']:
-            md_parts.append('# Таблицы\n')
+            yield '# Таблицы\n'
             for table in data['tables']:
+                # Tables may be lazy row streams: read them front to back once
+                rows = iter(table)
+                header = next(rows, None)
+                if header is None:
+                    continue
                 # Add header row
-                md_parts.append('| ' + ' | '.join(str(cell) for cell in table[0]) + ' |')
+                yield '| ' + ' | '.join(str(cell) for cell in header) + ' |'
                 # Add separator
-                md_parts.append('| ' + ' | '.join(['---' for _ in table[0]]) + ' |')
+                yield '| ' + ' | '.join(['---' for _ in header]) + ' |'
                 # Add data rows
-                for row in table[1:]:
-                    md_parts.append('| ' + ' | '.join(str(cell) for cell in row) + ' |')
-                md_parts.append('\n')
-        
+                for row in rows:
+                    yield '| ' + ' | '.join(str(cell) for cell in row) + ' |'
+                yield '\n'
+
         # Add terms
         if 'terms' in data and data['terms']:
-            md_parts.append('# Медицинские термины\n')
+            yield '# Медицинские термины\n'
             for term in data['terms']:
-                md_parts.append(f"* **{term['term']}**")
+                yield f"* **{term['term']}**"
                 if 'definition' in term and term['definition']:
-                    md_parts.append(f"  * Определение: {term['definition']}")
+                    yield f"  * Определение: {term['definition']}"
                 if 'context' in term and term['context']:
-                    md_parts.append(f"  * Контекст: ```{term['context']}```")
-                md_parts.append('')
-        
-        return '\n'.join(md_parts)
\ No newline at end of file
+                    yield f"  * Контекст: ```{term['context']}```"
+                yield ''
+
+    @staticmethod
+    def write_markdown(data: Dict[str, Any], stream: TextIO):
+        """Write Markdown output to stream"""
+        DocumentFormatter._write_lines(DocumentFormatter.iter_markdown(data), stream)
+
+    @staticmethod
+    def to_markdown(data: Dict[str, Any]) -> str:
+        """Convert processed document data to Markdown format"""
+        return '\n'.join(DocumentFormatter.iter_markdown(data))
+
+    @staticmethod
+    def _write_lines(lines: Iterator[str], stream: TextIO):
+        """Write lines joined by newlines, as '\\n'.join would"""
+        for number, line in enumerate(lines):
+            if number:
+                stream.write('\n')
+            stream.write(line)
@@ -0,0 +1,88 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Tuple
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def _new_hasher():
+    """xxh3 when available (much faster), BLAKE2b from the stdlib otherwise"""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=20)
+
+
+def hash_stream(stream: BinaryIO, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Hash binary stream in fixed-size chunks without loading it into memory"""
+    hasher = _new_hasher()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        read = stream.readinto(buffer)
+        if not read:
+            break
+        hasher.update(view[:read])
+    return hasher.hexdigest()
+
+
+def hash_file(file_path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Hash file content in chunks"""
+    with open(file_path, 'rb', buffering=0) as f:
+        return hash_stream(f, chunk_size)
+
+
+class FileDigestIndex:
+    """Remembers file digests keyed by (path, size, mtime, inode)
+
+    A file whose stat signature has not changed since it was last hashed
+    reuses the stored digest instead of being read again.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int, int], str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+        return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+    def digest(self, file_path: str) -> str:
+        """Get content digest of file, hashing it only if it changed"""
+        path = os.path.abspath(file_path)
+        signature = self._signature(os.stat(path))
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                return entry[1]
+
+        digest = hash_file(path)
+
+        with self._lock:
+            self._entries[path] = (signature, digest)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return digest
+
+    def forget(self, file_path: str) -> None:
+        """Drop stored digest for file"""
+        with self._lock:
+            self._entries.pop(os.path.abspath(file_path), None)
+
+
+_default_index = FileDigestIndex()
+
+
+def file_digest(file_path: str) -> str:
+    """Get content digest of file using the process-wide index"""
+    return _default_index.digest(file_path)
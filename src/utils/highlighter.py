@@ -0,0 +1,78 @@
+import html
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .term_matcher import TermMatcher
+
+# (start, end, term dict)
+Span = Tuple[int, int, Dict[str, Any]]
+
+
+def merge_spans(spans: Iterable[Span]) -> List[Span]:
+    """Sort spans and merge overlaps; a merged span keeps its first term"""
+    merged = []
+    for start, end, term in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if merged and start < merged[-1][1]:
+            last_start, last_end, last_term = merged[-1]
+            merged[-1] = (last_start, max(last_end, end), last_term)
+        else:
+            merged.append((start, end, term))
+    return merged
+
+
+class TermHighlighter:
+    """Renders texts as escaped HTML with found terms wrapped in spans
+
+    attributes are added to each span (e.g. {'class': 'term'}); the term
+    definition goes into its title. One instance can render many texts
+    (pages) and builds its term matcher only once.
+    """
+
+    def __init__(self, terms: Iterable[Dict[str, Any]], attributes: Optional[Dict[str, str]] = None):
+        self.terms = [term for term in terms if term.get('term')]
+        self._attributes = ''.join(
+            f' {name}="{html.escape(value, quote=True)}"' for name, value in (attributes or {}).items()
+        )
+        self._matcher = None
+
+    def spans(self, text: str) -> List[Span]:
+        """Merged term spans in text
+
+        Offsets from term extraction ('start'/'end') are used when they point
+        at the term's surface form ('matched', else 'term') in this text; otherwise terms are located with a single
+        matcher pass.
+        """
+        spans = []
+        unlocated = False
+        for term in self.terms:
+            start, end = term.get('start'), term.get('end')
+            if start is not None and end is not None and text[start:end] == term.get('matched', term['term']):
+                spans.append((start, end, term))
+            else:
+                unlocated = True
+
+        if unlocated:
+            if self._matcher is None:
+                by_term = {}
+                for term in self.terms:
+                    by_term.setdefault(term['term'], term)
+                self._matcher = TermMatcher(by_term)
+            spans.extend((start, end, term) for start, end, _, term in self._matcher.iter_matches(text))
+        return merge_spans(spans)
+
+    def iter_html(self, text: str) -> Iterator[str]:
+        """Yield HTML pieces of text in order"""
+        position = 0
+        for start, end, term in self.spans(text):
+            yield html.escape(text[position:start], quote=False)
+            title = html.escape(str(term.get('definition') or ''), quote=True)
+            yield f'<span{self._attributes} title="{title}">{html.escape(text[start:end], quote=False)}</span>'
+            position = end
+        yield html.escape(text[position:], quote=False)
+
+    def highlight(self, text: str) -> str:
+        return ''.join(self.iter_html(text))
+
+
+def highlight_terms(text: str, terms: Iterable[Dict[str, Any]],
+                    attributes: Optional[Dict[str, str]] = None) -> str:
+    """Render text as escaped HTML with every term occurrence wrapped in a span"""
+    return TermHighlighter(terms, attributes).highlight(text)
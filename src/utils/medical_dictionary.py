@@ -0,0 +1,272 @@
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from .term_matcher import normalize_term
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+TERM_SOURCES = (
+    ROOT_DIR / 'data' / 'dictionaries' / 'medical_terms_ru.txt',
+    ROOT_DIR / 'src' / 'data' / 'dictionaries' / 'medical_terms.json'
+)
+PATTERN_SOURCES = (
+    ROOT_DIR / 'data' / 'patterns' / 'medical_patterns.txt',
+)
+DEFAULT_ARTIFACT = ROOT_DIR / '.cache' / 'medical_dictionary.bin'
+
+# Layout: header | term records | pattern records | UTF-8 string table.
+# Term records are sorted by normalized term, so lookups are a binary search
+# over the mapped file and nothing is parsed at load time.
+MAGIC = b'MEDDICT1'
+HEADER = struct.Struct('<8sII')
+# (key, term, category, definition) as (offset, length) pairs
+TERM_RECORD = struct.Struct('<8I')
+# (pattern, category, description)
+PATTERN_RECORD = struct.Struct('<6I')
+
+
+def _is_placeholder(line: str) -> bool:
+    """'[More terms continue...]' style lines left in the source files"""
+    return line.startswith('[') and line.endswith('...]')
+
+
+def parse_term_file(path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (term, category, definition) from a 'term|category|definition' file"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#') or _is_placeholder(line):
+                continue
+            parts = [part.strip() for part in line.split('|', 2)]
+            parts += [''] * (3 - len(parts))
+            if parts[0]:
+                yield parts[0], parts[1], parts[2]
+
+
+def parse_term_json(path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (term, category, definition) from {term: {category, definition}} JSON"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    for term, entry in data.items():
+        if isinstance(entry, dict):
+            yield term, entry.get('category', ''), entry.get('definition', '')
+        else:
+            yield term, '', str(entry)
+
+
+def parse_pattern_file(path) -> Iterator[Tuple[str, str, str]]:
+    """Yield (pattern, category, description) from a 'regex  # description' file
+
+    The last comment-only line above a pattern ('# Prefixes') is its category.
+    Patterns that do not compile are skipped.
+    """
+    category = ''
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or _is_placeholder(line):
+                continue
+            if line.startswith('#'):
+                category = line.lstrip('#').strip().lower()
+                continue
+            match = re.match(r'^(.*?)\s+#\s*(.*)$', line)
+            pattern, description = match.groups() if match else (line, '')
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                logger.warning(f'Skipping invalid pattern {pattern!r} in {path}: {e}')
+                continue
+            yield pattern, category, description
+
+
+def _parse_terms(path) -> Iterator[Tuple[str, str, str]]:
+    if str(path).endswith('.json'):
+        return parse_term_json(path)
+    return parse_term_file(path)
+
+
+def compile_dictionary(output_path=DEFAULT_ARTIFACT, term_sources: Sequence = TERM_SOURCES,
+                       pattern_sources: Sequence = PATTERN_SOURCES) -> Dict[str, int]:
+    """Compile dictionary sources into the binary artifact
+
+    The first source wins when a term (after normalization) appears twice.
+    The file is written atomically, so running workers never map a partial file.
+    """
+    terms = {}
+    for source in term_sources:
+        if os.path.exists(source):
+            for term, category, definition in _parse_terms(source):
+                key = normalize_term(term)
+                if key and key not in terms:
+                    terms[key] = (term, category, definition)
+
+    patterns = []
+    for source in pattern_sources:
+        if os.path.exists(source):
+            patterns.extend(parse_pattern_file(source))
+
+    strings = bytearray()
+    interned = {}
+
+    def add_string(value: str) -> Tuple[int, int]:
+        ref = interned.get(value)
+        if ref is None:
+            encoded = value.encode('utf-8')
+            ref = interned[value] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return ref
+
+    term_records = b''.join(
+        TERM_RECORD.pack(*add_string(key), *add_string(term),
+                         *add_string(category), *add_string(definition))
+        for key, (term, category, definition) in sorted(terms.items())
+    )
+    pattern_records = b''.join(
+        PATTERN_RECORD.pack(*add_string(pattern), *add_string(category), *add_string(description))
+        for pattern, category, description in patterns
+    )
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f'{output_path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(terms), len(patterns)))
+        f.write(term_records)
+        f.write(pattern_records)
+        f.write(strings)
+    os.replace(tmp_path, output_path)
+
+    return {'terms': len(terms), 'patterns': len(patterns), 'bytes': output_path.stat().st_size}
+
+
+class MedicalDictionary(Mapping):
+    """Read-only view of a compiled dictionary artifact
+
+    The file is memory-mapped: every process maps the same page-cache pages,
+    so N workers share one copy. Maps term -> {'category', 'definition'};
+    lookups are case-insensitive and treat hyphens and spaces alike.
+    """
+
+    def __init__(self, path=DEFAULT_ARTIFACT):
+        self.path = str(path)
+        with open(self.path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size:
+                raise ValueError(f'Not a compiled medical dictionary: {self.path}')
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self._term_count, self._pattern_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f'Not a compiled medical dictionary: {self.path}')
+        self._terms_offset = HEADER.size
+        self._patterns_offset = self._terms_offset + self._term_count * TERM_RECORD.size
+        self._strings_offset = self._patterns_offset + self._pattern_count * PATTERN_RECORD.size
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _term_record(self, index: int) -> tuple:
+        return TERM_RECORD.unpack_from(self._mm, self._terms_offset + index * TERM_RECORD.size)
+
+    def _find(self, key: str) -> Optional[int]:
+        low, high = 0, self._term_count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._term_record(middle)
+            current = self._string(record[0], record[1])
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return middle
+        return None
+
+    def _entry(self, record: tuple) -> Dict[str, str]:
+        return {
+            'category': self._string(record[4], record[5]),
+            'definition': self._string(record[6], record[7])
+        }
+
+    def lookup(self, term: str) -> Optional[Dict[str, str]]:
+        """Entry for term with its dictionary spelling, or None"""
+        index = self._find(normalize_term(term))
+        if index is None:
+            return None
+        record = self._term_record(index)
+        return {'term': self._string(record[2], record[3]), **self._entry(record)}
+
+    def __getitem__(self, term: str) -> Dict[str, str]:
+        index = self._find(normalize_term(term))
+        if index is None:
+            raise KeyError(term)
+        return self._entry(self._term_record(index))
+
+    def __contains__(self, term) -> bool:
+        return isinstance(term, str) and self._find(normalize_term(term)) is not None
+
+    def __len__(self) -> int:
+        return self._term_count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._term_count):
+            record = self._term_record(index)
+            yield self._string(record[2], record[3])
+
+    def items(self) -> Iterable[Tuple[str, Dict[str, str]]]:
+        for index in range(self._term_count):
+            record = self._term_record(index)
+            yield self._string(record[2], record[3]), self._entry(record)
+
+    def patterns(self) -> List[Dict[str, str]]:
+        """Regex patterns as [{'pattern', 'category', 'description'}]"""
+        result = []
+        for index in range(self._pattern_count):
+            record = PATTERN_RECORD.unpack_from(
+                self._mm, self._patterns_offset + index * PATTERN_RECORD.size)
+            result.append({
+                'pattern': self._string(record[0], record[1]),
+                'category': self._string(record[2], record[3]),
+                'description': self._string(record[4], record[5])
+            })
+        return result
+
+    def close(self):
+        self._mm.close()
+
+
+def _is_stale(artifact: Path, sources: Iterable) -> bool:
+    if not artifact.exists():
+        return True
+    built = artifact.stat().st_mtime_ns
+    return any(os.path.exists(source) and os.stat(source).st_mtime_ns > built for source in sources)
+
+
+_dictionaries: Dict[str, MedicalDictionary] = {}
+_lock = threading.Lock()
+
+
+def get_medical_dictionary(path=DEFAULT_ARTIFACT, auto_build: bool = True) -> MedicalDictionary:
+    """Get process-wide mapped dictionary, compiling it first if missing or stale
+
+    With auto_build the default sources are compared by mtime against the
+    artifact; pass auto_build=False to use a prebuilt file as is.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    with _lock:
+        dictionary = _dictionaries.get(key)
+        if dictionary is None:
+            if auto_build and _is_stale(path, (*TERM_SOURCES, *PATTERN_SOURCES)):
+                compile_dictionary(path)
+            dictionary = _dictionaries[key] = MedicalDictionary(path)
+        return dictionary
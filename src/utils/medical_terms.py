@@ -1,52 +1,101 @@
-import spacy
 import re
-from typing import Dict, List, Tuple
+from bisect import bisect_right
+from typing import Any, Dict, List, Tuple, Union
+from .medical_dictionary import get_medical_dictionary
+from .nlp_models import pipe_texts
+from .term_matcher import TermMatcher
+
+# Базовый словарь (перекрывает определения из скомпилированного)
+BASE_TERMS = {
+    'гипергликемия': 'Повышенный уровень глюкозы в крови',
+    'ретинопатия': 'Поражение сетчатки глаза',
+}
 
 def load_medical_dictionary():
     """
     Загружает расширенный словарь медицинских терминов
     """
+    terms_dict = {}
+
+    # Скомпилированный словарь из data/ (отображается в память, не разбирается заново)
+    try:
+        for term, entry in get_medical_dictionary().items():
+            terms_dict[term] = entry['definition']
+    except (OSError, ValueError) as e:
+        print(f"Error loading compiled medical dictionary: {str(e)}")
+
     # Базовый словарь
-    terms_dict = {
-        'гипергликемия': 'Повышенный уровень глюкозы в крови',
-        'ретинопатия': 'Поражение сетчатки глаза',
-        # Добавьте больше терминов
-    }
+    terms_dict.update(BASE_TERMS)
     
     return terms_dict
 
-def add_term_variations(terms_dict: Dict[str, str]) -> Dict[str, str]:
+_matcher = None
+
+def get_term_matcher() -> TermMatcher:
     """
-    Добавляет вариации написания терминов
+    Возвращает автомат поиска по словарю, собранный один раз на процесс
+
+    Определения терминов из скомпилированного словаря в автомат не копируются:
+    их значение None, и find_terms_in_context читает определение из
+    отображённого в память файла (общие страницы для всех процессов).
+    В каждом процессе остаются только сам автомат (переходы по символам)
+    и написания терминов.
     """
-    variations = {}
-    for term, definition in terms_dict.items():
-        # Добавляем вариации с дефисом
-        if ' ' in term:
-            variations[term.replace(' ', '-')] = definition
-        
-        # Добавляем вариации с разным регистром
-        variations[term.title()] = definition
-        variations[term.upper()] = definition
-    
-    return {**terms_dict, **variations}
+    global _matcher
+    if _matcher is None:
+        terms = {}
+        try:
+            terms = dict.fromkeys(get_medical_dictionary())
+        except (OSError, ValueError) as e:
+            print(f"Error loading compiled medical dictionary: {str(e)}")
+        terms.update(BASE_TERMS)
+        _matcher = TermMatcher(terms)
+    return _matcher
 
-def find_terms_in_context(doc, terms_dict: Dict[str, str]) -> List[Dict[str, str]]:
+def _lookup_definition(term: str) -> str:
+    """
+    Определение термина из скомпилированного словаря
+    """
+    entry = get_medical_dictionary().lookup(term)
+    return entry['definition'] if entry else ''
+
+def find_terms_in_context(doc, terms: Union[TermMatcher, Dict[str, str]]) -> List[Dict[str, Any]]:
     """
     Находит медицинские термины с учётом контекста
+
+    Весь текст документа проходит через автомат один раз; каждое вхождение
+    привязывается к своему предложению по смещению. Значение None в автомате
+    означает, что определение берётся из скомпилированного словаря.
     """
+    matcher = terms if isinstance(terms, TermMatcher) else TermMatcher(terms)
+    sentences = list(doc.sents)
+    sentence_starts = [sent.start_char for sent in sentences]
+
+    # Doc.text and Span.text rebuild the string from every token: take it once,
+    # and one context string per sentence, shared by all terms in it
+    text = doc.text
+    contexts = {}
+
+    def context(start: int) -> str:
+        if not sentences:
+            return text
+        index = bisect_right(sentence_starts, start) - 1
+        if index not in contexts:
+            sent = sentences[index]
+            contexts[index] = text[sent.start_char:sent.end_char]
+        return contexts[index]
+
     found_terms = []
-    for sent in doc.sents:
-        sent_text = sent.text.lower()
-        for term, definition in terms_dict.items():
-            term_lower = term.lower()
-            if term_lower in sent_text:
-                found_terms.append({
-                    'term': term,
-                    'definition': definition,
-                    'context': sent.text
-                })
-    
+    for start, end, term, definition in matcher.find(text):
+        found_terms.append({
+            'term': term,
+            'matched': text[start:end],
+            'definition': _lookup_definition(term) if definition is None else definition,
+            'context': context(start),
+            'start': start,
+            'end': end
+        })
+
     return found_terms
 
 def extract_medical_terms(text: str) -> List[Dict[str, str]]:
@@ -59,25 +108,28 @@ def extract_medical_terms(text: str) -> List[Dict[str, str]]:
     Returns:
         List[Dict[str, str]]: Список найденных терминов с их определениями
     """
+    return extract_medical_terms_batch([text])[0]
+
+def extract_medical_terms_batch(texts: List[str], batch_size: int = 64) -> List[List[Dict[str, str]]]:
+    """
+    Извлекает медицинские термины из нескольких текстов (колонок, страниц)
+
+    Тексты проходят через spaCy пакетами (nlp.pipe), модель загружается
+    один раз на процесс.
+
+    Returns:
+        List[List[Dict[str, str]]]: Термины для каждого текста в исходном порядке
+    """
     try:
-        # Загружаем словарь
-        terms_dict = load_medical_dictionary()
-        terms_dict = add_term_variations(terms_dict)
-        
-        # Загружаем модель spacy
-        try:
-            nlp = spacy.load("ru_core_news_lg")
-        except:
-            nlp = spacy.load("ru_core_news_sm")
-            
-        # Обрабатываем текст
-        doc = nlp(text)
-        
-        # Ищем термины
-        found_terms = find_terms_in_context(doc, terms_dict)
+        # Автомат по словарю (строится один раз)
+        matcher = get_term_matcher()
         
-        return found_terms
+        # Обрабатываем тексты пакетами
+        return [
+            find_terms_in_context(doc, matcher)
+            for doc in pipe_texts(texts, batch_size=batch_size)
+        ]
         
     except Exception as e:
         print(f"Error in extract_medical_terms: {str(e)}")
-        return []
\ No newline at end of file
+        return [[] for _ in texts]
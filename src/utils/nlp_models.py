@@ -0,0 +1,65 @@
+import os
+import threading
+from typing import Dict, Optional, Sequence
+import spacy
+
+# Tried in order; a blank Russian pipeline is used when none is installed
+SPACY_MODELS = ('ru_core_news_lg', 'ru_core_news_md', 'ru_core_news_sm')
+
+# Term extraction only needs tokens and sentence boundaries: everything else
+# is excluded at load time, so its weights are never read into memory
+EXCLUDED_COMPONENTS = ['tok2vec', 'tagger', 'morphologizer', 'parser',
+                       'attribute_ruler', 'lemmatizer', 'ner']
+
+_models: Dict[tuple, 'spacy.language.Language'] = {}
+_lock = threading.Lock()
+
+
+def _load(name: Optional[str]) -> 'spacy.language.Language':
+    nlp = None
+    if name:
+        nlp = spacy.load(name, exclude=EXCLUDED_COMPONENTS)
+    else:
+        for candidate in SPACY_MODELS:
+            try:
+                nlp = spacy.load(candidate, exclude=EXCLUDED_COMPONENTS)
+                break
+            except OSError:
+                continue
+        if nlp is None:
+            nlp = spacy.blank('ru')
+
+    # Trained senter ships disabled in the core pipelines
+    if 'senter' in nlp.disabled:
+        nlp.enable_pipe('senter')
+    if not nlp.has_pipe('senter') and not nlp.has_pipe('sentencizer'):
+        nlp.add_pipe('sentencizer')
+    return nlp
+
+
+def get_nlp(name: Optional[str] = None) -> 'spacy.language.Language':
+    """Get process-wide sentence-splitting pipeline, loading it on first use
+
+    name is a spaCy package; by default the first installed of SPACY_MODELS.
+    """
+    # Keyed by pid: each worker process loads its own copy once
+    key = (name, os.getpid())
+    nlp = _models.get(key)
+    if nlp is None:
+        with _lock:
+            nlp = _models.get(key)
+            if nlp is None:
+                nlp = _models[key] = _load(name)
+    return nlp
+
+
+def warm_up(name: Optional[str] = None):
+    """Load the pipeline ahead of time (worker initializer / app startup)"""
+    nlp = get_nlp(name)
+    # First call allocates tokenizer caches and component buffers
+    nlp('Прогрев.')
+
+
+def pipe_texts(texts: Sequence[str], batch_size: int = 64, name: Optional[str] = None):
+    """Yield Doc objects for texts, processed in batches"""
+    return get_nlp(name).pipe(texts, batch_size=batch_size)
@@ -0,0 +1,213 @@
+import os
+import shlex
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+import numpy as np
+from PIL import Image
+import pytesseract
+from ..tread.config import TREAD_CONFIG
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+ImageLike = Union[Image.Image, np.ndarray]
+
+
+def parse_tesseract_config(config: str) -> Dict[str, Any]:
+    """Parse tesseract command line options (--psm, --oem, -l, --dpi, -c)"""
+    options = {'variables': {}}
+    args = shlex.split(config or '')
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = args[i + 1] if i + 1 < len(args) else None
+        if arg == '--psm':
+            options['psm'] = int(value)
+        elif arg == '--oem':
+            options['oem'] = int(value)
+        elif arg == '-l':
+            options['lang'] = value
+        elif arg == '--dpi':
+            options['dpi'] = int(value)
+        elif arg == '-c' and value and '=' in value:
+            key, _, var = value.partition('=')
+            options['variables'][key] = var
+        else:
+            i += 1
+            continue
+        i += 2
+    return options
+
+
+class OCRBackend(ABC):
+    """Common interface of OCR engines"""
+
+    name = ''
+
+    @abstractmethod
+    def image_to_string(self, image: ImageLike, lang: str = 'eng+rus', config: str = '') -> str:
+        """Recognize text on a PIL image or a grayscale/RGB uint8 array"""
+        pass
+
+    @abstractmethod
+    def recognize(self, image: ImageLike, lang: str = 'eng+rus', config: str = '') -> Dict[str, Any]:
+        """Recognize text and score it in one pass
+
+        Returns {'text': str, 'confidence': float}, where confidence is the
+        mean per-word Tesseract confidence (0-100, -1 if no words found).
+        """
+        pass
+
+    def close(self):
+        """Release engine resources"""
+        pass
+
+
+class PytesseractBackend(OCRBackend):
+    """Runs the tesseract CLI per call (models reload, image goes through a temp file)"""
+
+    name = 'pytesseract'
+
+    def image_to_string(self, image: ImageLike, lang: str = 'eng+rus', config: str = '') -> str:
+        if 'lang' in parse_tesseract_config(config):
+            # -l in config wins, as with the tesserocr backend
+            lang = None
+        return pytesseract.image_to_string(image, lang=lang, config=config)
+
+    def recognize(self, image: ImageLike, lang: str = 'eng+rus', config: str = '') -> Dict[str, Any]:
+        if 'lang' in parse_tesseract_config(config):
+            lang = None
+        data = pytesseract.image_to_data(image, lang=lang, config=config,
+                                         output_type=pytesseract.Output.DICT)
+        # Rebuild text line by line from the word boxes (reading order)
+        lines = {}
+        confidences = []
+        for i, word in enumerate(data['text']):
+            confidence = float(data['conf'][i])
+            if confidence < 0 or not word.strip():
+                continue
+            line_key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            lines.setdefault(line_key, []).append(word)
+            confidences.append(confidence)
+        return {
+            'text': '\n'.join(' '.join(words) for words in lines.values()),
+            'confidence': sum(confidences) / len(confidences) if confidences else -1.0
+        }
+
+
+class TesserocrBackend(OCRBackend):
+    """Long-lived Tesseract API handles fed with raw image buffers
+
+    Handles are pooled per (lang, oem, psm, -c variables): a call borrows an
+    idle handle and returns it afterwards, so language models load once and
+    short-lived thread pools reuse the same handles. At most max_idle
+    handles per key are kept; extra ones made under higher concurrency are
+    ended when returned.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, max_idle: Optional[int] = None):
+        if tesserocr is None:
+            raise ImportError('tesserocr is required for the tesserocr OCR backend')
+        self.max_idle = max_idle or os.cpu_count() or 1
+        self._idle: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _create_api(self, lang: str, oem: int, psm: int, variables: Dict[str, str]):
+        # OEM/PSM in tesserocr are constant namespaces: the values are plain ints
+        api = tesserocr.PyTessBaseAPI(lang=lang, oem=oem, psm=psm)
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+        return api
+
+    def _acquire(self, key: tuple):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        lang, oem, psm, variables = key
+        return self._create_api(lang, oem, psm, dict(variables))
+
+    def _release(self, key: tuple, api):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append(api)
+                return
+        api.End()
+
+    def image_to_string(self, image: ImageLike, lang: str = 'eng+rus', config: str = '') -> str:
+        return self._run(image, lang, config, with_confidence=False)['text']
+
+    def recognize(self, image: ImageLike, lang: str = 'eng+rus', config: str = '') -> Dict[str, Any]:
+        return self._run(image, lang, config, with_confidence=True)
+
+    def _run(self, image: ImageLike, lang: str, config: str, with_confidence: bool) -> Dict[str, Any]:
+        options = parse_tesseract_config(config)
+        lang = options.get('lang', lang)
+        # Variables are part of the key: once set they stick to the handle
+        key = (lang, options.get('oem', 3), options.get('psm', 3), tuple(sorted(options['variables'].items())))
+        api = self._acquire(key)
+        try:
+            return self._recognize_with(api, image, options, with_confidence)
+        finally:
+            self._release(key, api)
+
+    @staticmethod
+    def _recognize_with(api, image: ImageLike, options: Dict[str, Any], with_confidence: bool) -> Dict[str, Any]:
+        if isinstance(image, np.ndarray):
+            pixels = np.ascontiguousarray(image, dtype=np.uint8)
+            height, width = pixels.shape[:2]
+            bytes_per_pixel = 1 if pixels.ndim == 2 else pixels.shape[2]
+            api.SetImageBytes(pixels.tobytes(), width, height, bytes_per_pixel, width * bytes_per_pixel)
+        else:
+            api.SetImage(image)
+
+        if 'dpi' in options:
+            api.SetSourceResolution(options['dpi'])
+
+        try:
+            result = {'text': api.GetUTF8Text()}
+            if with_confidence:
+                confidences = api.AllWordConfidences()
+                result['confidence'] = sum(confidences) / len(confidences) if confidences else -1.0
+            return result
+        finally:
+            api.Clear()
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for api in idle:
+                    api.End()
+            self._idle.clear()
+
+
+OCR_BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend
+}
+
+_instances: Dict[tuple, OCRBackend] = {}
+
+
+def get_ocr_backend(name: Optional[str] = None) -> OCRBackend:
+    """Get process-wide OCR backend
+
+    name is 'pytesseract', 'tesserocr' or 'auto' (tesserocr when installed,
+    pytesseract otherwise); defaults to TREAD_CONFIG['ocr_backend'].
+    """
+    name = name or TREAD_CONFIG['ocr_backend']
+    if name == 'auto':
+        name = TesserocrBackend.name if tesserocr is not None else PytesseractBackend.name
+    if name not in OCR_BACKENDS:
+        raise ValueError(f'Unknown OCR backend: {name}')
+    # Keyed by pid: engine handles must not be shared with forked workers
+    key = (name, os.getpid())
+    if key not in _instances:
+        _instances[key] = OCR_BACKENDS[name]()
+    return _instances[key]
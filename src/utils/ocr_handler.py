@@ -1,39 +1,107 @@
-import pytesseract
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+from .ocr_backends import get_ocr_backend
 from .text_preprocessing import enhance_russian_text, apply_advanced_preprocessing
 import difflib
 
+# Порог средней уверенности Tesseract (0-100), при котором перебор вариантов прекращается
+CONFIDENCE_THRESHOLD = 80.0
+
+PREPROCESSINGS = {
+    'enhanced': enhance_russian_text,
+    'advanced': apply_advanced_preprocessing
+}
+
+# Варианты (предобработка, psm) по убыванию ожидаемого качества.
+# Следующий уровень запускается только для страниц с низкой уверенностью.
+VARIANT_TIERS: List[List[Tuple[str, int]]] = [
+    [('enhanced', 6), ('advanced', 6)],
+    [('enhanced', 3), ('advanced', 3), ('enhanced', 4), ('advanced', 4)]
+]
+
 def select_best_result(results):
     """
     Выбирает лучший результат OCR из нескольких вариантов
     """
     if not results:
         return ""
-    
+
     # Используем длину текста и количество русских символов как метрики
     def score_text(text):
         russian_chars = sum(1 for c in text if 'а' <= c.lower() <= 'я')
         return len(text) * 0.3 + russian_chars * 0.7
-    
+
     return max(results, key=score_text)
 
-def improve_russian_ocr(image):
+def _recognize_variant(img, psm: int) -> Dict[str, Any]:
+    config = f'--oem 3 --psm {psm} -l rus+eng'
+    return get_ocr_backend().recognize(img, lang='rus+eng', config=config)
+
+def run_ocr_variants(image, confidence_threshold: float = CONFIDENCE_THRESHOLD,
+                     max_workers: Optional[int] = None, tiers=None) -> Dict[str, Any]:
     """
-    Улучшенное OCR для русского текста
+    Параллельно распознает варианты изображения и останавливается, как только
+    один из них достигает порога уверенности
+
+    Returns:
+        Dict с ключами text, confidence, variant (предобработка, psm)
+        и passes (число выполненных проходов OCR)
     """
-    # 1. Настройка Tesseract для русского языка
-    custom_config = r'--oem 3 --psm 6 -l rus+eng'
-    
-    # 2. Предварительная обработка
-    preprocessed_img = enhance_russian_text(image)
-    advanced_preprocessed = apply_advanced_preprocessing(image)
-    
-    # 3. Множественное распознавание с разными параметрами
+    tiers = tiers or VARIANT_TIERS
+    max_workers = max_workers or max(len(tier) for tier in tiers)
+    preprocessed = {}
     results = []
-    for img in [preprocessed_img, advanced_preprocessed]:
-        for psm in [6, 3, 4]:
-            config = f'--oem 3 --psm {psm} -l rus+eng'
-            text = pytesseract.image_to_string(img, config=config)
-            results.append(text)
-    
-    # 4. Выбор лучшего результата
-    return select_best_result(results)
\ No newline at end of file
+
+    # Без with: __exit__ ждал бы уже запущенные варианты уровня даже после
+    # раннего выхода, и быстрый путь стоил бы как самый медленный вариант
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        for tier in tiers:
+            # 1. Предобработка только тех вариантов, что нужны на этом уровне
+            missing = {name for name, _ in tier if name not in preprocessed}
+            futures = {name: executor.submit(PREPROCESSINGS[name], image) for name in missing}
+            for name, future in futures.items():
+                preprocessed[name] = future.result()
+
+            # 2. Варианты уровня распознаются одновременно
+            pending = {
+                executor.submit(_recognize_variant, preprocessed[name], psm): (name, psm)
+                for name, psm in tier
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    variant = pending.pop(future)
+                    result = future.result()
+                    result['variant'] = variant
+                    results.append(result)
+
+                    # 3. Ранний выход: остальные варианты не запускаем и не ждем
+                    if result['confidence'] >= confidence_threshold:
+                        for other in pending:
+                            other.cancel()
+                        # Отмененные задачи не считаются проходами
+                        passes = len(results) + sum(1 for other in pending if not other.cancelled())
+                        return {**result, 'passes': passes}
+    finally:
+        # Запущенные варианты доработают в фоне, их результат не нужен
+        executor.shutdown(wait=False)
+
+    best = max(results, key=lambda result: result['confidence'])
+    if best['confidence'] < 0:
+        # Tesseract не вернул уверенность: используем эвристику по тексту
+        best_text = select_best_result([result['text'] for result in results])
+        best = next(result for result in results if result['text'] == best_text)
+    return {**best, 'passes': len(results)}
+
+def improve_russian_ocr(image, confidence_threshold: float = CONFIDENCE_THRESHOLD):
+    """
+    Улучшенное OCR для русского текста
+    """
+    return run_ocr_variants(image, confidence_threshold)['text']
+
+def text_accuracy(recognized: str, reference: str) -> float:
+    """
+    Доля совпадения распознанного текста с эталоном (0.0 - 1.0)
+    """
+    return difflib.SequenceMatcher(None, recognized, reference, autojunk=False).ratio()
@@ -0,0 +1,303 @@
+"""
+Legacy Office formats (.doc/.ppt) to OOXML through headless LibreOffice
+
+OfficePool keeps long-lived `soffice --headless` listeners and talks to them
+over UNO, so documents are converted in memory without starting an office
+process per file. Every conversion has a timeout: a listener that hangs is
+killed and replaced, and a listener that died or stopped answering is
+restarted before it is handed out again.
+
+Without the python-uno bindings each document is converted with a
+`soffice --convert-to` subprocess instead (same timeout, temporary files).
+"""
+import atexit
+import io
+import os
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from ..errors import ConversionError
+from ..tread.config import TREAD_CONFIG
+
+try:
+    import uno
+    import unohelper
+    from com.sun.star.beans import PropertyValue
+    from com.sun.star.io import XOutputStream
+except ImportError:
+    uno = None
+
+# Target format -> LibreOffice export filter
+OOXML_FILTERS = {
+    'docx': 'MS Word 2007 XML',
+    'pptx': 'Impress MS PowerPoint 2007 XML',
+}
+# Target format -> legacy source extension (for the CLI fallback)
+LEGACY_SUFFIXES = {'docx': 'doc', 'pptx': 'ppt'}
+
+# Seconds to wait for a new listener to accept connections
+START_TIMEOUT = 30
+# Seconds a health check may take before the listener counts as hung
+HEALTH_TIMEOUT = 5
+
+
+def _call_with_timeout(function: Callable, timeout: Optional[float]):
+    """Run function in a daemon thread; TimeoutError if it does not return in time"""
+    result = {}
+
+    def run():
+        try:
+            result['value'] = function()
+        except BaseException as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f'No result after {timeout} s')
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _soffice_args(binary: str, profile_dir: str):
+    return [
+        binary, '--headless', '--invisible', '--nologo', '--nodefault',
+        '--norestore', '--nolockcheck',
+        # Own profile: concurrent instances must not share one
+        f'-env:UserInstallation={Path(profile_dir).as_uri()}',
+    ]
+
+
+if uno is not None:
+    class _BytesOutputStream(unohelper.Base, XOutputStream):
+        """XOutputStream collecting the exported document in memory"""
+
+        def __init__(self):
+            self.buffer = io.BytesIO()
+
+        def writeBytes(self, data):
+            self.buffer.write(data.value)
+
+        def flush(self):
+            pass
+
+        def closeOutput(self):
+            pass
+
+
+def _properties(**values):
+    properties = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name = name
+        prop.Value = value
+        properties.append(prop)
+    return tuple(properties)
+
+
+class OfficeListener:
+    """One headless soffice process accepting UNO connections on a local port"""
+
+    def __init__(self, binary: str):
+        self.binary = binary
+        self.process = None
+        self._profile_dir = None
+        self._context = None
+        self._desktop = None
+
+    def start(self):
+        port = _free_port()
+        self._profile_dir = tempfile.mkdtemp(prefix='soffice-')
+        args = _soffice_args(self.binary, self._profile_dir)
+        args.append(f'--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext')
+        try:
+            self.process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            self.stop()
+            raise ConversionError(f'Failed to start LibreOffice ({self.binary}): {e}')
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext('com.sun.star.bridge.UnoUrlResolver', local)
+        url = f'uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext'
+        deadline = time.monotonic() + START_TIMEOUT
+        while True:
+            try:
+                self._context = resolver.resolve(url)
+                break
+            except Exception:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise ConversionError('LibreOffice listener did not start')
+                time.sleep(0.25)
+        self._desktop = self._context.ServiceManager.createInstanceWithContext(
+            'com.sun.star.frame.Desktop', self._context)
+
+    def is_healthy(self) -> bool:
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            _call_with_timeout(lambda: self._desktop.getComponents(), HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    def convert(self, data: bytes, target: str) -> bytes:
+        """Load a document from bytes and export it with the target's filter"""
+        stream = self._context.ServiceManager.createInstanceWithArgumentsAndContext(
+            'com.sun.star.io.SequenceInputStream', (uno.ByteSequence(data),), self._context)
+        document = self._desktop.loadComponentFromURL(
+            'private:stream', '_blank', 0, _properties(InputStream=stream, Hidden=True, ReadOnly=True))
+        if document is None:
+            raise ConversionError('LibreOffice could not load the document')
+        try:
+            output = _BytesOutputStream()
+            document.storeToURL('private:stream', _properties(FilterName=OOXML_FILTERS[target],
+                                                              OutputStream=output))
+            return output.buffer.getvalue()
+        finally:
+            document.close(True)
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+        self._context = self._desktop = None
+        if self._profile_dir:
+            shutil.rmtree(self._profile_dir, ignore_errors=True)
+            self._profile_dir = None
+
+
+def convert_with_cli(data: bytes, target: str, binary: str, timeout: Optional[float]) -> bytes:
+    """Convert with a one-off `soffice --convert-to` process (no UNO bindings)"""
+    with tempfile.TemporaryDirectory(prefix='soffice-') as work_dir:
+        source = Path(work_dir) / f'document.{LEGACY_SUFFIXES[target]}'
+        source.write_bytes(data)
+        args = _soffice_args(binary, os.path.join(work_dir, 'profile'))
+        args += ['--convert-to', target, '--outdir', work_dir, str(source)]
+        try:
+            completed = subprocess.run(args, capture_output=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise ConversionError(f'LibreOffice conversion timed out after {timeout} s')
+        except OSError as e:
+            raise ConversionError(f'Failed to start LibreOffice ({binary}): {e}')
+        output = source.with_suffix(f'.{target}')
+        if not output.exists():
+            message = completed.stderr.decode('utf-8', errors='replace').strip()
+            raise ConversionError(f'LibreOffice conversion failed: {message or completed.returncode}')
+        return output.read_bytes()
+
+
+class OfficePool:
+    """Fixed number of OfficeListener slots, started on first use
+
+    convert() takes an idle listener (waiting while all are busy), checks
+    its health, and converts under a per-document timeout.
+    """
+
+    def __init__(self, size: Optional[int] = None, timeout: Optional[float] = None,
+                 binary: Optional[str] = None,
+                 listener_factory: Optional[Callable[[], OfficeListener]] = None):
+        self.size = size or TREAD_CONFIG['office_pool_size']
+        self.timeout = timeout or TREAD_CONFIG['office_timeout']
+        self.binary = binary or TREAD_CONFIG['soffice_path']
+        self._factory = listener_factory or (lambda: OfficeListener(self.binary))
+        self._use_uno = uno is not None or listener_factory is not None
+        # Idle slots; None is a slot whose listener is not running (yet).
+        # LIFO: running listeners are reused before another one is started
+        self._idle = queue.LifoQueue()
+        for _ in range(self.size):
+            self._idle.put(None)
+
+    def _acquire(self) -> OfficeListener:
+        listener = self._idle.get()
+        try:
+            if listener is not None and not listener.is_healthy():
+                listener.stop()
+                listener = None
+            if listener is None:
+                listener = self._factory()
+                listener.start()
+        except BaseException:
+            self._idle.put(None)
+            raise
+        return listener
+
+    def convert(self, source: Union[str, bytes], target: str, timeout: Optional[float] = None) -> bytes:
+        """
+        Convert a legacy document to OOXML
+
+        Args:
+            source: path to the document or its content
+            target: 'docx' or 'pptx'
+            timeout: seconds per document (default: the pool's timeout)
+
+        Returns:
+            OOXML file content
+        """
+        if target not in OOXML_FILTERS:
+            raise ValueError(f'Unsupported target format: {target}')
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                source = f.read()
+        timeout = timeout or self.timeout
+
+        if not self._use_uno:
+            return convert_with_cli(source, target, self.binary, timeout)
+
+        listener = self._acquire()
+        try:
+            result = _call_with_timeout(lambda: listener.convert(source, target), timeout)
+        except TimeoutError:
+            # The listener is stuck on this document: kill it, the slot restarts on next use
+            listener.stop()
+            listener = None
+            raise ConversionError(f'LibreOffice conversion timed out after {timeout} s')
+        finally:
+            self._idle.put(listener)
+        return result
+
+    def close(self):
+        """Stop idle listeners"""
+        while True:
+            try:
+                listener = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if listener is not None:
+                listener.stop()
+
+
+_pools: Dict[int, OfficePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_office_pool() -> OfficePool:
+    """Process-wide pool configured from TREAD_CONFIG"""
+    # Keyed by pid: listener connections must not be shared with forked workers
+    with _pools_lock:
+        pool = _pools.get(os.getpid())
+        if pool is None:
+            pool = _pools[os.getpid()] = OfficePool()
+        return pool
+
+
+@atexit.register
+def _close_pools():
+    pool = _pools.pop(os.getpid(), None)
+    if pool is not None:
+        pool.close()
@@ -0,0 +1,252 @@
+"""
+Fast DOCX/PPTX text and table extraction straight from the OOXML zip parts
+
+Only the parts that carry content are opened, each parsed once:
+word/document.xml is streamed with iterparse (memory bounded by the largest
+top-level paragraph or table), slides and notes are small and parsed whole.
+The results match what python-docx/python-pptx return for the same
+documents (see DocxConverter and PptxConverter), so the readers can be used
+interchangeably with them.
+"""
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+P = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+R = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+DC = '{http://purl.org/dc/elements/1.1/}'
+
+NOTES_SLIDE_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide'
+
+# Text of run content elements other than w:t (as python-docx renders them)
+DOCX_RUN_TEXT = {
+    f'{W}tab': '\t',
+    f'{W}ptab': '\t',
+    f'{W}cr': '\n',
+    f'{W}noBreakHyphen': '-',
+}
+
+# Errors raised for files that are not the expected OOXML package
+OOXML_ERRORS = (zipfile.BadZipFile, KeyError, ET.ParseError)
+
+Source = Union[str, BinaryIO]
+
+
+def _iter_elements(stream) -> Iterator[Tuple[str, Any, List[str]]]:
+    """iterparse events with the stack of open tags (the element's own tag last)"""
+    stack = []
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem.tag)
+            yield event, elem, stack
+        else:
+            yield event, elem, stack
+            stack.pop()
+
+
+def _read_rels(package: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+    """Relationship id -> (type, target part name) for a part"""
+    directory, name = posixpath.split(part)
+    rels_name = posixpath.join(directory, '_rels', name + '.rels')
+    if rels_name not in package.NameToInfo:
+        return {}
+    rels = {}
+    with package.open(rels_name) as stream:
+        for rel in ET.parse(stream).getroot().iter(f'{REL}Relationship'):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(directory, target))
+            rels[rel.get('Id')] = (rel.get('Type'), target)
+    return rels
+
+
+def _core_title(package: zipfile.ZipFile) -> str:
+    if 'docProps/core.xml' not in package.NameToInfo:
+        return ''
+    with package.open('docProps/core.xml') as stream:
+        title = ET.parse(stream).getroot().find(f'{DC}title')
+    return (title.text or '') if title is not None else ''
+
+
+def read_docx(source: Source) -> Dict[str, Any]:
+    """
+    Body paragraphs and top-level tables of a DOCX file in one pass
+
+    Returns:
+        {'paragraphs': [str], 'tables': [[[cell text]]]} - like
+        doc.paragraphs and doc.tables in python-docx: a horizontally merged
+        cell repeats once per grid column it spans, a vertically merged one
+        repeats the text of the cell where the merge starts.
+    """
+    paragraphs = []
+    tables = []
+
+    body = (f'{W}document', f'{W}body')
+    body_p = body + (f'{W}p',)
+    table = body + (f'{W}tbl',)
+    row = table + (f'{W}tr',)
+    row_props = row + (f'{W}trPr',)
+    cell = row + (f'{W}tc',)
+    cell_props = cell + (f'{W}tcPr',)
+    cell_p = cell + (f'{W}p',)
+
+    parts = None  # text parts of the current paragraph
+    paragraph_depth = 0
+    cell_paragraphs = []
+    span, continued = 1, False
+    rows = []
+    row_cells = []
+    grid, above = {}, {}
+    position = 0
+
+    with zipfile.ZipFile(source) as package, package.open('word/document.xml') as stream:
+        for event, elem, stack in _iter_elements(stream):
+            tag = elem.tag
+            path = tuple(stack)
+            if event == 'start':
+                if path == body_p or path == cell_p:
+                    parts = []
+                    paragraph_depth = len(stack)
+                elif path == table:
+                    rows = []
+                    above = {}
+                elif path == row:
+                    row_cells = []
+                    grid = {}
+                    position = 0
+                elif path == cell:
+                    cell_paragraphs = []
+                    span, continued = 1, False
+                elif path[:-1] == row_props and tag == f'{W}gridBefore':
+                    position += int(elem.get(f'{W}val', '0'))
+                elif path[:-1] == cell_props:
+                    if tag == f'{W}gridSpan':
+                        span = int(elem.get(f'{W}val', '1'))
+                    elif tag == f'{W}vMerge':
+                        continued = elem.get(f'{W}val', 'continue') == 'continue'
+                continue
+
+            if parts is not None:
+                # Content of runs that are direct children of the paragraph
+                # or of its hyperlinks (what python-docx counts as its text)
+                depth = len(stack) - paragraph_depth
+                if stack[-2] == f'{W}r' and (depth == 2 or (depth == 3 and stack[-3] == f'{W}hyperlink')):
+                    if tag == f'{W}t':
+                        parts.append(elem.text or '')
+                    elif tag == f'{W}br':
+                        if elem.get(f'{W}type', 'textWrapping') == 'textWrapping':
+                            parts.append('\n')
+                    elif tag in DOCX_RUN_TEXT:
+                        parts.append(DOCX_RUN_TEXT[tag])
+
+            if path == body_p:
+                paragraphs.append(''.join(parts))
+                parts = None
+                elem.clear()
+            elif path == cell_p:
+                cell_paragraphs.append(''.join(parts))
+                parts = None
+            elif path == cell:
+                if continued:
+                    text = above.get(position, '')
+                else:
+                    text = '\n'.join(cell_paragraphs)
+                for _ in range(span):
+                    grid[position] = text
+                    row_cells.append(text)
+                    position += 1
+            elif path == row:
+                rows.append(row_cells)
+                above = grid
+            elif path == table:
+                tables.append(rows)
+                elem.clear()
+
+    return {'paragraphs': paragraphs, 'tables': tables}
+
+
+def _text_frame(body) -> str:
+    """Text of an a:txBody/p:txBody (TextFrame.text in python-pptx)"""
+    if body is None:
+        return ''
+    paragraphs = []
+    for paragraph in body.iterfind(f'{A}p'):
+        parts = []
+        for child in paragraph:
+            if child.tag == f'{A}r' or child.tag == f'{A}fld':
+                text = child.find(f'{A}t')
+                parts.append((text.text or '') if text is not None else '')
+            elif child.tag == f'{A}br':
+                parts.append('\v')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+def _read_part(package: zipfile.ZipFile, part: str):
+    # Slide parts are small: one C-level parse beats per-element iterparse events
+    with package.open(part) as stream:
+        return ET.parse(stream).getroot()
+
+
+def _read_slide(package: zipfile.ZipFile, part: str) -> Dict[str, Any]:
+    """Shape texts and tables of one slide (top-level shapes, as slide.shapes)"""
+    texts = []
+    tables = []
+    tree = _read_part(package, part).find(f'{P}cSld/{P}spTree')
+    for shape in (tree if tree is not None else []):
+        if shape.tag == f'{P}sp':
+            texts.append(_text_frame(shape.find(f'{P}txBody')))
+        elif shape.tag == f'{P}graphicFrame':
+            table = shape.find(f'{A}graphic/{A}graphicData/{A}tbl')
+            if table is not None:
+                tables.append([[_text_frame(cell.find(f'{A}txBody')) for cell in row.iterfind(f'{A}tc')]
+                               for row in table.iterfind(f'{A}tr')])
+    return {'texts': texts, 'tables': tables}
+
+
+def _read_notes(package: zipfile.ZipFile, part: str) -> Optional[str]:
+    """Text of the body placeholder of a notes slide"""
+    for shape in _read_part(package, part).iterfind(f'{P}cSld/{P}spTree/{P}sp'):
+        placeholder = shape.find(f'{P}nvSpPr/{P}nvPr/{P}ph')
+        if placeholder is not None and placeholder.get('type') == 'body':
+            return _text_frame(shape.find(f'{P}txBody'))
+    return None
+
+
+def read_pptx(source: Source) -> Dict[str, Any]:
+    """
+    Slides of a PPTX file, each part parsed once
+
+    Returns:
+        {'title': core title, 'slides': [{'texts': [shape text], 'tables':
+        [[[cell text]]], 'notes': notes text or None, 'has_notes': bool}]}.
+        Shape texts and tables come from top-level shapes in z-order, as
+        slide.shapes in python-pptx; line breaks are '\\v'.
+    """
+    slides = []
+    with zipfile.ZipFile(source) as package:
+        presentation_rels = _read_rels(package, 'ppt/presentation.xml')
+        with package.open('ppt/presentation.xml') as stream:
+            slide_ids = ET.parse(stream).getroot().find(f'{P}sldIdLst')
+            slide_parts = [presentation_rels[slide_id.get(f'{R}id')][1]
+                           for slide_id in (slide_ids if slide_ids is not None else [])]
+
+        for part in slide_parts:
+            slide = _read_slide(package, part)
+            notes_parts = [target for rel_type, target in _read_rels(package, part).values()
+                           if rel_type == NOTES_SLIDE_REL]
+            slide['has_notes'] = bool(notes_parts)
+            slide['notes'] = _read_notes(package, notes_parts[0]) if notes_parts else None
+            slides.append(slide)
+
+        title = _core_title(package)
+
+    return {'title': title, 'slides': slides}
@@ -0,0 +1,230 @@
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from .file_hash import file_digest
+from .ocr_backends import get_ocr_backend
+from .rasterizer import get_rasterizer
+from .text_layer import assess_text_layer, extract_page_text, is_usable_text_layer
+from ..tread.config import TREAD_CONFIG
+from ..tread.page_cache import PageCache
+
+DEFAULT_OCR_CONFIG = '--psm 6 --oem 3 -c tessedit_do_invert=0'
+
+
+def binarize(gray: np.ndarray, threshold: int = 127) -> np.ndarray:
+    """Threshold grayscale page in place (pixels above threshold become white)"""
+    mask = gray > threshold
+    gray[mask] = 255
+    gray[~mask] = 0
+    return gray
+
+
+_page_caches: Dict[str, PageCache] = {}
+
+
+def _get_page_cache(path: str) -> PageCache:
+    """Page cache per database path; PageCache reconnects in forked workers"""
+    cache = _page_caches.get(path)
+    if cache is None:
+        cache = _page_caches[path] = PageCache(path=path)
+    return cache
+
+
+def _page_cache_key(pdf_path: str, page_number: int, options: Dict[str, Any]) -> str:
+    """Key of a page's OCR result: file content, page number and OCR options"""
+    ocr_options = {key: value for key, value in options.items() if key not in ('use_text_layer', 'page_cache')}
+    return PageCache.make_key(f'{file_digest(pdf_path)}:{page_number}'.encode('utf-8'),
+                              json.dumps(ocr_options, sort_keys=True))
+
+
+def _render_page(task: Tuple[str, int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Pipeline stage 1: use the text layer or a cached result, or rasterize the page to 'image'
+
+    Stage durations are collected in 'timings' (seconds), so the parent
+    process can record them as instrumentation spans. With a page cache
+    (options['page_cache']) a page OCRed before, in any run, is neither
+    rendered nor recognized again; its metadata has 'cached': True.
+    """
+    pdf_path, page_number, options = task
+    state = {'page': page_number, 'text': '', 'metadata': {'source': 'ocr'},
+             'timings': {}, 'options': options}
+    started = time.perf_counter()
+    if options['use_text_layer']:
+        try:
+            text = extract_page_text(pdf_path, page_number)
+            state['metadata'].update(assess_text_layer(text))
+            if is_usable_text_layer(state['metadata']):
+                # Born-digital page: the embedded text is exact, OCR is not needed
+                state['metadata']['source'] = 'text_layer'
+                state['text'] = text
+                state['timings']['text_layer'] = time.perf_counter() - started
+                return state
+        except Exception:
+            # Unreadable text layer: fall back to OCR
+            pass
+
+    if options.get('page_cache'):
+        started = time.perf_counter()
+        try:
+            key = _page_cache_key(pdf_path, page_number, options)
+            cached = _get_page_cache(options['page_cache']).get(key)
+            state['timings']['page_cache'] = time.perf_counter() - started
+        except Exception:
+            # Unreadable file or cache database: OCR the page as usual
+            key = cached = None
+        if cached is not None:
+            state['metadata']['cached'] = True
+            state['text'] = cached['text']
+            return state
+        state['cache_key'] = key
+
+    started = time.perf_counter()
+    try:
+        rasterizer = get_rasterizer(options['rasterizer'])
+        state['image'] = rasterizer.render(pdf_path, page_number, options['dpi'], options['width'])
+    except Exception as e:
+        state['error'] = str(e)
+    state['timings']['rasterize'] = time.perf_counter() - started
+    return state
+
+
+def _preprocess_page(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage 2: binarize the rendered page"""
+    if 'image' in state:
+        started = time.perf_counter()
+        try:
+            binarize(state['image'])
+        except Exception as e:
+            del state['image']
+            state['error'] = str(e)
+        state['timings']['preprocess'] = time.perf_counter() - started
+    return state
+
+
+def _recognize_page(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Pipeline stage 3: OCR the page image; returns the final page result"""
+    options = state.pop('options')
+    cache_key = state.pop('cache_key', None)
+    img = state.pop('image', None)
+    if img is not None:
+        started = time.perf_counter()
+        try:
+            state['text'] = get_ocr_backend(options['ocr_backend']).image_to_string(
+                img,
+                lang=options['lang'],
+                config=options['config']
+            )
+        except Exception as e:
+            state['error'] = str(e)
+        state['timings']['ocr'] = time.perf_counter() - started
+    if cache_key is not None and 'error' not in state:
+        try:
+            _get_page_cache(options['page_cache']).set(cache_key, {'text': state['text']})
+        except Exception:
+            pass
+    return state
+
+
+def _ocr_page(task: Tuple[str, int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Rasterize and OCR a single PDF page (runs inside a worker process)
+
+    A failure of one page must not abort the whole batch: the result then
+    carries an 'error' message and empty text. 'timings' holds the seconds
+    spent per stage.
+    """
+    return _recognize_page(_preprocess_page(_render_page(task)))
+
+
+class PageOCREngine:
+    """Rasterizes and OCRs PDF pages in parallel across a process pool"""
+
+    def __init__(self, num_workers: Optional[int] = None, dpi: int = 150,
+                 width: int = 800, lang: str = 'eng+rus',
+                 config: str = DEFAULT_OCR_CONFIG, rasterizer: Optional[str] = None,
+                 use_text_layer: Optional[bool] = None, ocr_backend: Optional[str] = None,
+                 use_cache: Optional[bool] = None):
+        self.num_workers = num_workers or TREAD_CONFIG['num_workers']
+        use_cache = TREAD_CONFIG['use_cache'] if use_cache is None else use_cache
+        self.options = {
+            'rasterizer': rasterizer or TREAD_CONFIG['rasterizer'],
+            'use_text_layer': TREAD_CONFIG['use_text_layer'] if use_text_layer is None else use_text_layer,
+            'ocr_backend': ocr_backend or TREAD_CONFIG['ocr_backend'],
+            'dpi': dpi,
+            'width': width,
+            'lang': lang,
+            'config': config,
+            # SQLite page cache shared by all workers and runs (None: disabled)
+            'page_cache': TREAD_CONFIG['page_cache_path'] if use_cache else None
+        }
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the worker pool lazily so idle engines cost nothing"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self._executor
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """The worker pool, shared with AsyncProcessor page stages"""
+        return self._get_executor()
+
+    def page_count(self, pdf_path: str) -> int:
+        """Get number of pages using the configured rasterizer"""
+        return get_rasterizer(self.options['rasterizer']).page_count(pdf_path)
+
+    def iter_pages(self, pdf_path: str, first_page: int, last_page: int,
+                   window: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield OCR results for pages first_page..last_page (inclusive) in page order
+
+        At most `window` pages (default: twice the worker count) are in
+        flight at once, so memory stays constant regardless of page count.
+        Each result is a dict with 'page', 'text', 'metadata' and per-stage
+        'timings' (seconds); pages that failed
+        carry an additional 'error' message and empty text.
+        """
+        pages = range(first_page, last_page + 1)
+        if self.num_workers <= 1 or len(pages) <= 1:
+            for page in pages:
+                yield _ocr_page((pdf_path, page, self.options))
+            return
+
+        window = window or self.num_workers * 2
+        executor = self._get_executor()
+        pending = deque()
+        page_iter = iter(pages)
+        try:
+            for page in page_iter:
+                pending.append(executor.submit(_ocr_page, (pdf_path, page, self.options)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                # Waiting on the oldest future keeps results in page order
+                result = pending.popleft().result()
+                next_page = next(page_iter, None)
+                if next_page is not None:
+                    pending.append(executor.submit(_ocr_page, (pdf_path, next_page, self.options)))
+                yield result
+        finally:
+            # Consumer stopped early: drop pages that have not started yet
+            for future in pending:
+                future.cancel()
+
+    def process_pages(self, pdf_path: str, first_page: int, last_page: int) -> List[Dict[str, Any]]:
+        """OCR pages first_page..last_page (inclusive), results in page order"""
+        return list(self.iter_pages(pdf_path, first_page, last_page))
+
+    def shutdown(self):
+        """Stop worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
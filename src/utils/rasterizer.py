@@ -0,0 +1,138 @@
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+from pdf2image import convert_from_path
+from pdf2image.pdf2image import pdfinfo_from_path
+
+try:
+    import pymupdf as fitz
+except ImportError:
+    try:
+        import fitz  # PyMuPDF < 1.24
+    except ImportError:
+        fitz = None
+
+
+class BaseRasterizer(ABC):
+    """Renders PDF pages into grayscale uint8 NumPy arrays"""
+
+    name = ''
+
+    @abstractmethod
+    def page_count(self, pdf_path: str) -> int:
+        """Return number of pages in the document"""
+        pass
+
+    @abstractmethod
+    def render(self, pdf_path: str, page_number: int, dpi: int,
+               width: Optional[int] = None) -> np.ndarray:
+        """Render 1-based page_number as a writable 2D grayscale array
+
+        If width is given the page is scaled to that many pixels wide.
+        """
+        pass
+
+    def close(self):
+        """Release resources held between calls"""
+        pass
+
+
+class Pdf2ImageRasterizer(BaseRasterizer):
+    """pdf2image/poppler backend: spawns pdftoppm for every call"""
+
+    name = 'pdf2image'
+
+    def page_count(self, pdf_path: str) -> int:
+        return pdfinfo_from_path(pdf_path)['Pages']
+
+    def render(self, pdf_path: str, page_number: int, dpi: int,
+               width: Optional[int] = None) -> np.ndarray:
+        images = convert_from_path(
+            pdf_path,
+            first_page=page_number,
+            last_page=page_number,
+            dpi=dpi,
+            grayscale=True,
+            size=(width, None) if width else None
+        )
+        if not images:
+            raise ValueError(f'page {page_number} was not rendered')
+        return np.array(images[0].convert('L'))
+
+
+class _PixmapArray:
+    """Exposes pixmap samples to NumPy without copying and keeps the pixmap alive"""
+
+    def __init__(self, pix):
+        self._pix = pix
+        self.__array_interface__ = {
+            'shape': (pix.height, pix.width),
+            'strides': (pix.stride, pix.n),
+            'typestr': '|u1',
+            'data': (pix.samples_ptr, False),
+            'version': 3
+        }
+
+
+class PyMuPDFRasterizer(BaseRasterizer):
+    """PyMuPDF backend: documents stay open, pages render straight to memory"""
+
+    name = 'pymupdf'
+
+    def __init__(self, max_open_documents: int = 4):
+        if fitz is None:
+            raise ImportError('PyMuPDF is required for the pymupdf rasterizer')
+        self.max_open_documents = max_open_documents
+        self._documents: 'OrderedDict[tuple, object]' = OrderedDict()
+
+    def open_document(self, pdf_path: str):
+        """Open document once and reuse it while the file is unchanged"""
+        stat = os.stat(pdf_path)
+        key = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+        doc = self._documents.get(key)
+        if doc is not None:
+            self._documents.move_to_end(key)
+            return doc
+
+        doc = fitz.open(pdf_path)
+        self._documents[key] = doc
+        while len(self._documents) > self.max_open_documents:
+            _, old_doc = self._documents.popitem(last=False)
+            old_doc.close()
+        return doc
+
+    def page_count(self, pdf_path: str) -> int:
+        return self.open_document(pdf_path).page_count
+
+    def render(self, pdf_path: str, page_number: int, dpi: int,
+               width: Optional[int] = None) -> np.ndarray:
+        page = self.open_document(pdf_path)[page_number - 1]
+        zoom = width / page.rect.width if width else dpi / 72
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+        return np.asarray(_PixmapArray(pix))
+
+    def close(self):
+        for doc in self._documents.values():
+            doc.close()
+        self._documents.clear()
+
+
+RASTERIZERS = {
+    Pdf2ImageRasterizer.name: Pdf2ImageRasterizer,
+    PyMuPDFRasterizer.name: PyMuPDFRasterizer
+}
+
+_instances: Dict[tuple, BaseRasterizer] = {}
+
+
+def get_rasterizer(name: str) -> BaseRasterizer:
+    """Get process-wide rasterizer instance by name ('pdf2image' or 'pymupdf')"""
+    if name not in RASTERIZERS:
+        raise ValueError(f'Unknown rasterizer: {name}')
+    # Keyed by pid: documents opened before a fork must not be shared with workers
+    key = (name, os.getpid())
+    if key not in _instances:
+        _instances[key] = RASTERIZERS[name]()
+    return _instances[key]
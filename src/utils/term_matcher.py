@@ -0,0 +1,128 @@
+from collections import deque
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+# Dashes and whitespace all fold to one separator, so "анти-ВИЧ", "анти ВИЧ"
+# and "анти\nВИЧ" hit the same automaton path
+_SEPARATOR = ' '
+_SEPARATOR_CHARS = set('-‐‑‒–—­')
+
+
+def _fold_char(char: str) -> str:
+    """Case-fold one character; separators become _SEPARATOR"""
+    if char.isspace() or char in _SEPARATOR_CHARS:
+        return _SEPARATOR
+    return char.casefold().replace('ё', 'е')
+
+
+def normalize_term(term: str) -> str:
+    """Normalize term the same way text is normalized during matching"""
+    folded = []
+    for char in term:
+        char = _fold_char(char)
+        if char == _SEPARATOR and (not folded or folded[-1] == _SEPARATOR):
+            continue
+        folded.append(char)
+    return ''.join(folded).rstrip(_SEPARATOR)
+
+
+class TermMatcher:
+    """Aho–Corasick automaton over a term dictionary
+
+    Compiled once from {term: value}; find() reports every occurrence of
+    every term in a single pass over the text, case-insensitively and
+    treating hyphens and whitespace runs as equal. Like a substring search,
+    terms also match inside longer words, so inflected forms ("диабета",
+    "гипертонии") are found; whole_words=True keeps only matches bounded
+    by non-alphanumeric characters.
+    """
+
+    def __init__(self, terms: Mapping[str, Any], whole_words: bool = False):
+        self.whole_words = whole_words
+        # Node i: _goto[i] transitions, _fail[i] suffix link, _out[i] pattern ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        # Pattern id -> (term, value, normalized length)
+        self._patterns: List[Tuple[str, Any, int]] = []
+
+        for term, value in terms.items():
+            self._add(term, value)
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def _add(self, term: str, value: Any):
+        key = normalize_term(term)
+        if not key:
+            return
+        node = 0
+        for char in key:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        if self._out[node]:
+            # Same normalized spelling already added (e.g. "Ретинопатия"/"ретинопатия")
+            return
+        self._out[node].append(len(self._patterns))
+        self._patterns.append((term, value, len(key)))
+
+    def _build(self):
+        """Compute suffix links breadth-first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str, Any]]:
+        """Yield (start, end, term, value) for every match, in order of end offset
+
+        Offsets index into the original text; term is the dictionary key.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        # Original offset of every normalized character fed to the automaton
+        positions: List[int] = []
+        node = 0
+        previous_separator = True
+
+        for index, raw in enumerate(text):
+            folded = _fold_char(raw)
+            if folded == _SEPARATOR:
+                if previous_separator:
+                    continue
+                previous_separator = True
+            else:
+                previous_separator = False
+
+            for char in folded:
+                positions.append(index)
+                while node and char not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(char, 0)
+                for pattern_id in out[node]:
+                    term, value, length = self._patterns[pattern_id]
+                    start = positions[len(positions) - length]
+                    end = index + 1
+                    if self.whole_words and not self._at_word_boundary(text, start, end):
+                        continue
+                    yield start, end, term, value
+
+    def find(self, text: str) -> List[Tuple[int, int, str, Any]]:
+        """All matches sorted by start offset, longer matches first"""
+        return sorted(self.iter_matches(text), key=lambda match: (match[0], -match[1]))
+
+    @staticmethod
+    def _at_word_boundary(text: str, start: int, end: int) -> bool:
+        return ((start == 0 or not text[start - 1].isalnum())
+                and (end == len(text) or not text[end].isalnum()))
@@ -0,0 +1,62 @@
+import io
+import unicodedata
+from typing import Dict, Iterator, Optional
+from .rasterizer import fitz, get_rasterizer
+from ..tread.config import TREAD_CONFIG
+
+# Unicode categories that never appear in a sound text layer:
+# control, unassigned and private-use code points (broken font encodings)
+INVALID_CATEGORIES = {'Cc', 'Cn', 'Co', 'Cs'}
+
+
+def assess_text_layer(text: str) -> Dict:
+    """Measure embedded text layer: visible character count and valid-glyph ratio"""
+    chars = 0
+    valid = 0
+    for char in text:
+        if char.isspace():
+            continue
+        chars += 1
+        if char != '\ufffd' and unicodedata.category(char) not in INVALID_CATEGORIES:
+            valid += 1
+    return {
+        'text_layer_chars': chars,
+        'text_layer_valid_ratio': valid / chars if chars else 0.0
+    }
+
+
+def is_usable_text_layer(quality: Dict, min_chars: Optional[int] = None,
+                         min_valid_ratio: Optional[float] = None) -> bool:
+    """Decide whether the text layer is good enough to skip OCR"""
+    if min_chars is None:
+        min_chars = TREAD_CONFIG['text_layer_min_chars']
+    if min_valid_ratio is None:
+        min_valid_ratio = TREAD_CONFIG['text_layer_min_valid_ratio']
+    return (quality['text_layer_chars'] >= min_chars
+            and quality['text_layer_valid_ratio'] >= min_valid_ratio)
+
+
+def extract_page_text(pdf_path: str, page_number: int) -> str:
+    """Get embedded text of 1-based page_number (empty string for image-only pages)"""
+    if fitz is not None:
+        # Shares the open document with the PyMuPDF rasterizer of this process
+        doc = get_rasterizer('pymupdf').open_document(pdf_path)
+        return doc[page_number - 1].get_text()
+
+    import pdfplumber
+    with pdfplumber.open(pdf_path, pages=[page_number]) as pdf:
+        return pdf.pages[0].extract_text() or ''
+
+
+def iter_page_texts(file_data: bytes) -> Iterator[str]:
+    """Yield embedded text of every page of an in-memory PDF"""
+    if fitz is not None:
+        with fitz.open(stream=file_data, filetype='pdf') as doc:
+            for page in doc:
+                yield page.get_text()
+        return
+
+    import pdfplumber
+    with pdfplumber.open(io.BytesIO(file_data)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ''
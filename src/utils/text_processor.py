@@ -1,5 +1,59 @@
 import re
-from typing import List, Dict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Dict, Optional
+
+# Entity kinds with their alternatives, in priority order: at a given
+# position the first alternative that matches wins. Each alternative is
+# (group name, pattern).
+ENTITY_PATTERNS = {
+    'date': [
+        ('date_dot', r'\b\d{2}\.\d{2}\.\d{4}\b'),  # DD.MM.YYYY
+        ('date_slash', r'\b\d{2}/\d{2}/\d{4}\b'),  # DD/MM/YYYY
+        ('date_iso', r'\b\d{4}-\d{2}-\d{2}\b'),  # YYYY-MM-DD
+    ],
+    'measurement': [
+        # Numbers with units
+        ('measurement', r'(?i:\b\d+(?:\.\d+)?\s*(?:mg|ml|g|kg|mm|cm|%|мг|мл|г|кг|мм|см)\b)'),
+    ],
+    'abbreviation': [
+        # Potential abbreviations
+        ('abbreviation', r'\b[A-ZА-Я]{2,}\b'),
+    ],
+}
+ENTITY_KINDS = tuple(ENTITY_PATTERNS)
+# Kinds whose entities report the matching pattern as their 'format'
+FORMAT_KINDS = frozenset({'date'})
+
+@dataclass(frozen=True)
+class Entity:
+    """Span of an extracted entity; strings are only sliced on request"""
+    kind: str
+    start: int
+    end: int
+    source: str = field(repr=False, compare=False)
+    format: Optional[str] = None
+
+    @property
+    def value(self) -> str:
+        return self.source[self.start:self.end]
+
+    def context(self, width: int = 50) -> str:
+        """Up to width chars before and after the entity"""
+        return self.source[max(0, self.start - width):self.end + width].strip()
+
+@lru_cache(maxsize=None)
+def _compile_entities(kinds: tuple):
+    """One regex with a named group per alternative of the requested kinds"""
+    groups = {}
+    alternatives = []
+    for kind in ENTITY_KINDS:
+        if kind not in kinds:
+            continue
+        for name, pattern in ENTITY_PATTERNS[kind]:
+            groups[name] = (kind, pattern if kind in FORMAT_KINDS else None)
+            alternatives.append(f'(?P<{name}>{pattern})')
+    return re.compile('|'.join(alternatives)), groups
 
 class TextProcessor:
     """Class for text processing and analysis"""
@@ -20,76 +74,49 @@ class TextProcessor:
         sentences = re.split(r'(?<=[.!?])\s+', text)
         return [s.strip() for s in sentences if s.strip()]
     
+    @staticmethod
+    def extract_entities(text: str, kinds: Iterable[str] = ENTITY_KINDS) -> List[Entity]:
+        """Extract dates, measurements and abbreviations in one pass
+
+        Returns spans ordered by position; spans do not overlap (a date or
+        measurement is not also reported as an abbreviation).
+        """
+        return list(TextProcessor.iter_entities(text, kinds))
+
+    @staticmethod
+    def iter_entities(text: str, kinds: Iterable[str] = ENTITY_KINDS) -> Iterator[Entity]:
+        """Lazily yield entity spans (see extract_entities)"""
+        if isinstance(kinds, str):
+            kinds = (kinds,)
+        kinds = tuple(sorted(set(kinds)))
+        unknown = set(kinds) - set(ENTITY_KINDS)
+        if unknown:
+            raise ValueError(f'Unknown entity kinds: {sorted(unknown)}')
+        pattern, groups = _compile_entities(kinds)
+        for match in pattern.finditer(text):
+            kind, format = groups[match.lastgroup]
+            yield Entity(kind, match.start(), match.end(), text, format)
+
     @staticmethod
     def find_abbreviations(text: str) -> List[Dict[str, str]]:
         """Find medical abbreviations in text"""
-        # Pattern for potential abbreviations
-        pattern = r'\b[A-ZА-Я]{2,}\b'
-        
-        abbreviations = []
-        matches = re.finditer(pattern, text)
-        
-        for match in matches:
-            abbr = match.group(0)
-            # Get context (up to 50 chars before and after)
-            start = max(0, match.start() - 50)
-            end = min(len(text), match.end() + 50)
-            context = text[start:end].strip()
-            
-            abbreviations.append({
-                'abbreviation': abbr,
-                'context': context
-            })
-        
-        return abbreviations
+        return [
+            {'abbreviation': entity.value, 'context': entity.context()}
+            for entity in TextProcessor.iter_entities(text, ('abbreviation',))
+        ]
     
     @staticmethod
     def extract_measurements(text: str) -> List[Dict[str, str]]:
         """Extract medical measurements and values"""
-        # Pattern for numbers with units
-        pattern = r'\b\d+(?:\.\d+)?\s*(?:mg|ml|g|kg|mm|cm|%|мг|мл|г|кг|мм|см)\b'
-        
-        measurements = []
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        
-        for match in matches:
-            value = match.group(0)
-            # Get context
-            start = max(0, match.start() - 50)
-            end = min(len(text), match.end() + 50)
-            context = text[start:end].strip()
-            
-            measurements.append({
-                'value': value,
-                'context': context
-            })
-        
-        return measurements
+        return [
+            {'value': entity.value, 'context': entity.context()}
+            for entity in TextProcessor.iter_entities(text, ('measurement',))
+        ]
     
     @staticmethod
     def extract_dates(text: str) -> List[Dict[str, str]]:
         """Extract dates from text"""
-        # Pattern for various date formats
-        patterns = [
-            r'\b\d{2}\.\d{2}\.\d{4}\b',  # DD.MM.YYYY
-            r'\b\d{2}/\d{2}/\d{4}\b',  # DD/MM/YYYY
-            r'\b\d{4}-\d{2}-\d{2}\b',  # YYYY-MM-DD
+        return [
+            {'date': entity.value, 'format': entity.format, 'context': entity.context()}
+            for entity in TextProcessor.iter_entities(text, ('date',))
         ]
-        
-        dates = []
-        for pattern in patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                date = match.group(0)
-                # Get context
-                start = max(0, match.start() - 50)
-                end = min(len(text), match.end() + 50)
-                context = text[start:end].strip()
-                
-                dates.append({
-                    'date': date,
-                    'format': pattern,
-                    'context': context
-                })
-        
-        return dates
\ No newline at end of file
@@ -0,0 +1,8 @@
+import pytest
+from src.tread.config import TREAD_CONFIG
+
+
+@pytest.fixture(autouse=True)
+def isolated_page_cache(tmp_path, monkeypatch):
+    # Page engines cache OCR results on disk; keep them out of the working tree
+    monkeypatch.setitem(TREAD_CONFIG, 'page_cache_path', str(tmp_path / 'pages.db'))
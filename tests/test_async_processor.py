@@ -0,0 +1,191 @@
+import asyncio
+import os
+import threading
+import time
+import numpy as np
+import pytest
+from src.async_processor import AsyncProcessor, Stage, StageError, page_stages
+from src.utils import page_engine
+
+
+def square(x):
+    return x * x
+
+
+def worker_pid(x):
+    return os.getpid()
+
+
+def collect(processor, items, stages, **kwargs):
+    async def run():
+        return [result async for result in processor.stream(items, stages, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_results_in_input_order():
+    # Later items finish first
+    slow_first = Stage('sleep', lambda x: time.sleep(0.01 * (5 - x)) or x, concurrency=5)
+    with AsyncProcessor(queue_size=2) as processor:
+        assert collect(processor, range(5), [slow_first, Stage('square', square)]) == [0, 1, 4, 9, 16]
+        unordered = collect(processor, range(5), [slow_first], ordered=False)
+    assert sorted(unordered) == list(range(5))
+    assert unordered != list(range(5))
+
+
+def test_stage_concurrency_limit():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def tracked(x):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.005)
+        with lock:
+            running[0] -= 1
+        return x
+
+    with AsyncProcessor() as processor:
+        assert collect(processor, range(30), [Stage('tracked', tracked, concurrency=3)]) == list(range(30))
+    assert running[1] == 3
+
+
+def test_backpressure_bounds_items_in_flight():
+    taken = []
+
+    def source():
+        for i in range(100):
+            taken.append(i)
+            yield i
+
+    async def consume():
+        lag = 0
+        processor = AsyncProcessor(queue_size=2)
+        stages = [Stage('a', abs, concurrency=2), Stage('b', abs, concurrency=2)]
+        async for result in processor.stream(source(), stages, max_in_flight=4):
+            # Slow consumer: the source must not run ahead
+            await asyncio.sleep(0.001)
+            lag = max(lag, len(taken) - (result + 1))
+        processor.close()
+        return lag
+
+    # One item may be pulled from the source while it waits for room
+    assert asyncio.run(consume()) <= 5
+    assert len(taken) == 100
+
+
+def test_close_cancels_pipeline():
+    taken = []
+    cancelled = []
+
+    def source():
+        for i in range(1000):
+            taken.append(i)
+            yield i
+
+    async def slow(x):
+        try:
+            await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+        return x
+
+    async def run():
+        results = AsyncProcessor(queue_size=2).stream(source(), [Stage('slow', slow, 2, 'inline')])
+        first = [await results.__anext__() for _ in range(3)]
+        await results.aclose()
+        return first
+
+    assert asyncio.run(run()) == [0, 1, 2]
+    assert len(taken) < 20
+    assert cancelled
+
+
+def test_stage_error():
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError('bad item')
+        return x
+
+    stages = [Stage('check', fail_on_three, concurrency=2), Stage('square', square)]
+    with AsyncProcessor() as processor:
+        results = collect(processor, range(6), stages, return_exceptions=True)
+        assert results[:3] == [0, 1, 4] and results[4:] == [16, 25]
+        assert isinstance(results[3], StageError)
+        assert (results[3].stage, results[3].index) == ('check', 3)
+
+        with pytest.raises(StageError, match='bad item'):
+            collect(processor, range(6), stages)
+        with pytest.raises(ValueError, match='bad item'):
+            processor.process_batch_sync(range(6), fail_on_three)
+
+
+def test_process_stage():
+    with AsyncProcessor(max_workers=2) as processor:
+        assert processor.process_batch_sync(range(10), square, executor='process') == [x * x for x in range(10)]
+        pids = collect(processor, range(4), [Stage('pid', worker_pid, 2, 'process')])
+    assert os.getpid() not in pids
+
+
+def test_invalid_stage():
+    with pytest.raises(ValueError):
+        Stage('x', square, executor='gpu')
+    with pytest.raises(ValueError):
+        Stage('x', square, concurrency=0)
+
+
+class FakeRasterizer:
+    def render(self, pdf_path, page_number, dpi, width=None):
+        if page_number == 3:
+            raise RuntimeError('broken page')
+        return np.full((10, 10), 200, dtype=np.uint8)
+
+
+class FakeOCRBackend:
+    def image_to_string(self, image, lang='eng+rus', config=''):
+        # The preprocess stage binarized the page
+        return f'text {image.max()}'
+
+
+def test_stream_pages(monkeypatch):
+    # Worker processes are forked after patching, so they see the fakes too
+    monkeypatch.setattr(page_engine, 'get_rasterizer', lambda name: FakeRasterizer())
+    monkeypatch.setattr(page_engine, 'get_ocr_backend', lambda name: FakeOCRBackend())
+    options = dict(page_engine.PageOCREngine(use_text_layer=False).options)
+
+    def mark(result):
+        result['post_processed'] = True
+        return result
+
+    async def run(processor):
+        return [r async for r in processor.stream_pages('doc.pdf', 1, 5, options, post_process=mark)]
+
+    with AsyncProcessor(max_workers=2) as processor:
+        results = asyncio.run(run(processor))
+
+    assert [r['page'] for r in results] == [1, 2, 3, 4, 5]
+    assert results[0]['text'] == 'text 255'
+    assert 'broken page' in results[2]['error'] and results[2]['text'] == ''
+    assert all(r['post_processed'] for r in results)
+    assert [s.name for s in page_stages(2, mark)] == ['ocr_page', 'post_process']
+
+
+def test_stream_pages_uses_given_pool(monkeypatch):
+    monkeypatch.setattr(page_engine, 'get_rasterizer', lambda name: FakeRasterizer())
+    monkeypatch.setattr(page_engine, 'get_ocr_backend', lambda name: FakeOCRBackend())
+    engine = page_engine.PageOCREngine(num_workers=2, use_text_layer=False)
+
+    async def run(processor):
+        pages = processor.stream_pages('doc.pdf', 1, 2, engine.options, executor=engine.executor)
+        return [r async for r in pages]
+
+    with engine:
+        with AsyncProcessor(max_workers=2) as processor:
+            results = asyncio.run(run(processor))
+            # No pool of its own: pages ran on the engine's workers
+            assert processor._executors == {}
+        assert engine.executor.submit(square, 3).result() == 9
+
+    assert [r['text'] for r in results] == ['text 255', 'text 255']
+    assert set(results[0]['timings']) == {'rasterize', 'preprocess', 'ocr'}
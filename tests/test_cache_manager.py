@@ -0,0 +1,60 @@
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+from src.utils.cache_backends import DirectoryBackend, SQLiteBackend
+from src.utils.cache_manager import CacheManager
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / 'document.txt'
+    path.write_text('гемоглобин 120 г/л', encoding='utf-8')
+    return str(path)
+
+
+@pytest.mark.parametrize('backend', ['directory', 'sqlite'])
+def test_set_get_invalidate(tmp_path, source_file, backend):
+    cache = CacheManager(cache_dir=str(tmp_path / 'cache'), backend=backend)
+    params = {'format': 'txt'}
+
+    assert cache.get(source_file, params) is None
+    cache.set(source_file, params, {'text': 'гемоглобин'})
+    assert cache.get(source_file, params) == {'text': 'гемоглобин'}
+    assert cache.get(source_file, {'format': 'html'}) is None
+
+    cache.invalidate(source_file, params)
+    assert cache.get(source_file, params) is None
+
+
+@pytest.mark.parametrize('backend_cls', [DirectoryBackend, SQLiteBackend])
+def test_purge_expired(tmp_path, backend_cls):
+    location = str(tmp_path / 'cache.db') if backend_cls is SQLiteBackend else str(tmp_path)
+    backend = backend_cls(location, timedelta(0))
+    backend.set('old', {'text': 'x'})
+    if backend_cls is DirectoryBackend:
+        # Age the file so the mtime fast-path does not skip it
+        os.utime(backend._get_cache_path('old'), (0, 0))
+
+    assert backend.purge_expired() == 1
+    assert backend.purge_expired() == 0
+    assert backend.get('old') is None
+
+
+def test_directory_backend_reads_legacy_files(tmp_path):
+    legacy = {'text': 'старый формат', '_cached_at': datetime.now().isoformat()}
+    with open(tmp_path / 'key.json', 'w', encoding='utf-8') as f:
+        json.dump(legacy, f, ensure_ascii=False, indent=2)
+
+    backend = DirectoryBackend(str(tmp_path), timedelta(hours=1))
+    assert backend.get('key') == {'text': 'старый формат'}
+
+
+def test_sqlite_values_are_compressed(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / 'cache.db'), timedelta(hours=1), compression='zlib')
+    value = {'text': 'гемоглобин ' * 1000}
+    backend.set('key', value)
+
+    blob = backend._conn.execute('SELECT value FROM entries').fetchone()[0]
+    assert len(blob) < len(json.dumps(value, ensure_ascii=False).encode('utf-8')) / 10
+    assert backend.get('key') == value
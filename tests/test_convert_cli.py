@@ -0,0 +1,140 @@
+import json
+import os
+import pytest
+from click.testing import CliRunner
+from src.cli.convert import convert, iter_input_files, load_manifest, run_batch
+from src.converters import registry
+from src.tread.instrumentation import Instrumentation
+from src.tread.monitoring import TREADMonitor
+
+
+class EchoConverter:
+    """Converts any file to its own text"""
+
+    calls = []
+
+    def convert(self, file_path, **kwargs):
+        EchoConverter.calls.append(file_path)
+        with open(file_path, encoding='utf-8') as f:
+            text = f.read()
+        if 'broken' in text:
+            raise ValueError('unreadable document')
+        if 'crash' in text:
+            # A worker killed mid-file (segfault, OOM killer)
+            os._exit(1)
+        return {'text': text, 'tables': [[['a', 'b'], ['1', '2']]], 'terms': []}
+
+    def get_supported_formats(self):
+        return ['.csv', '.json']
+
+
+@pytest.fixture(autouse=True)
+def echo_converter(monkeypatch):
+    EchoConverter.calls = []
+    monkeypatch.setattr('src.cli.convert.get_converter', lambda extension: EchoConverter())
+
+
+@pytest.fixture(autouse=True)
+def monitor(tmp_path, monkeypatch):
+    # Not the process-wide monitor: that one would serve on the configured port
+    monkeypatch.chdir(tmp_path)
+    monitor = TREADMonitor(instrumentation=Instrumentation())
+    monkeypatch.setattr('src.cli.convert.get_monitor', lambda: monitor)
+    yield monitor
+    monitor.close()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    root = tmp_path / 'in'
+    (root / 'nested').mkdir(parents=True)
+    (root / 'a.csv').write_text('анемия', encoding='utf-8')
+    (root / 'nested' / 'b.json').write_text('{"x": 1}', encoding='utf-8')
+    (root / 'nested' / 'copy.csv').write_text('анемия', encoding='utf-8')
+    (root / 'notes.unknown').write_text('skip me', encoding='utf-8')
+    return root
+
+
+def test_iter_input_files(inputs):
+    found = list(iter_input_files([str(inputs), str(inputs / '*.csv')]))
+    assert [p.replace(str(inputs), '') for p in found] == ['/a.csv', '/nested/b.json', '/nested/copy.csv']
+    assert list(iter_input_files([str(inputs)], recursive=False)) == [str(inputs / 'a.csv')]
+    assert list(iter_input_files([str(inputs / '**' / '*.json')])) == [str(inputs / 'nested' / 'b.json')]
+
+
+def test_directory_output_and_resume(inputs, tmp_path):
+    out = tmp_path / 'out'
+    summary = run_batch([str(inputs)], str(out), output_format='md', workers=0)
+    # copy.csv has the same content as a.csv
+    assert summary == {'converted': 2, 'skipped': 1, 'failed': 0}
+    outputs = sorted(p.name for p in out.glob('*.md'))
+    assert len(outputs) == 2 and outputs[0].startswith('a-')
+    assert '| a | b |' in (out / outputs[0]).read_text(encoding='utf-8')
+
+    (inputs / 'c.csv').write_text('новый', encoding='utf-8')
+    EchoConverter.calls = []
+    summary = run_batch([str(inputs)], str(out), output_format='md', workers=0)
+    assert summary == {'converted': 1, 'skipped': 3, 'failed': 0}
+    assert EchoConverter.calls == [str(inputs / 'c.csv')]
+
+
+def test_jsonl_output_and_failures(inputs, tmp_path):
+    (inputs / 'd.csv').write_text('broken', encoding='utf-8')
+    out = tmp_path / 'results.jsonl'
+    summary = run_batch([str(inputs)], str(out), workers=0, queue_size=1)
+    assert summary == {'converted': 2, 'skipped': 1, 'failed': 1}
+
+    records = [json.loads(line) for line in out.read_text(encoding='utf-8').splitlines()]
+    assert {r['source'] for r in records} == {str(inputs / 'a.csv'), str(inputs / 'nested' / 'b.json')}
+    assert records[0]['result']['tables'] == [[['a', 'b'], ['1', '2']]]
+    # The failed file is not in the manifest, so a rerun retries it
+    assert len(load_manifest(str(out) + '.manifest')) == 2
+
+
+def test_process_pool(inputs, tmp_path, monkeypatch):
+    # Real converters in the worker processes
+    monkeypatch.setattr('src.cli.convert.get_converter', registry.get_converter)
+    out = tmp_path / 'results.jsonl'
+    (inputs / 'a.csv').write_text('patient,diagnosis\n1,анемия\n', encoding='utf-8')
+    summary = run_batch([str(inputs / 'a.csv'), str(inputs / 'nested' / 'b.json')], str(out),
+                        workers=2, queue_size=1)
+    assert summary == {'converted': 2, 'skipped': 0, 'failed': 0}
+    records = {json.loads(line)['source']: json.loads(line) for line in out.read_text(encoding='utf-8').splitlines()}
+    assert records[str(inputs / 'a.csv')]['result']['tables'] == [[['patient', 'diagnosis'], [1, 'анемия']]]
+
+
+def test_dead_worker_fails_its_file_and_pool_is_replaced(inputs, tmp_path):
+    (inputs / 'b_crash.csv').write_text('crash', encoding='utf-8')
+    out = tmp_path / 'results.jsonl'
+    summary = run_batch([str(inputs)], str(out), workers=1, queue_size=1)
+
+    assert summary == {'converted': 2, 'skipped': 1, 'failed': 1}
+    sources = {json.loads(line)['source'] for line in out.read_text(encoding='utf-8').splitlines()}
+    assert sources == {str(inputs / 'a.csv'), str(inputs / 'nested' / 'b.json')}
+
+
+def test_worker_timings_reach_the_parent_monitor(inputs, tmp_path, monitor):
+    summary = run_batch([str(inputs)], str(tmp_path / 'results.jsonl'), workers=2)
+
+    assert summary['converted'] == 2
+    assert monitor.instrumentation.stage_stats()['format']['count'] == 2
+    files = {span.attrs['file'] for span in monitor.instrumentation.recent_spans()}
+    assert files == {'a.csv', 'b.json'}
+
+
+def test_plain_text_converters_are_normalized(inputs, tmp_path, monkeypatch):
+    # DocxConverter and DocConverter return a bare string
+    monkeypatch.setattr('src.cli.convert.get_converter', lambda extension: type(
+        'TextConverter', (), {'convert': lambda self, path: 'просто текст'})())
+    out = tmp_path / 'out'
+    assert run_batch([str(inputs / 'a.csv')], str(out), output_format='txt', workers=0)['converted'] == 1
+    assert 'просто текст' in next(out.glob('*.txt')).read_text(encoding='utf-8')
+    assert registry.normalize_result({'text': 'x'}) == {'text': 'x'}
+
+
+def test_cli(inputs, tmp_path):
+    out = tmp_path / 'out'
+    result = CliRunner().invoke(convert, [str(inputs), '-o', str(out), '-f', 'txt', '-w', '0'])
+    assert result.exit_code == 0, result.output
+    assert 'Converted 2, skipped 1' in result.output
+    assert len(list(out.glob('*.txt'))) == 2
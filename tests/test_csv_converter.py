@@ -0,0 +1,107 @@
+import pytest
+from src.converters import csv_converter
+from src.converters.csv_converter import CsvConverter, CsvRowStream
+from src.utils.document_formatter import DocumentFormatter
+
+
+@pytest.fixture(autouse=True)
+def fake_terms(monkeypatch):
+    batches = []
+
+    def fake_batch(texts):
+        batches.append(list(texts))
+        return [[{'term': word} for word in text.split() if word == 'анемия'] for text in texts]
+
+    monkeypatch.setattr(csv_converter, 'extract_medical_terms_batch', fake_batch)
+    return batches
+
+
+@pytest.fixture
+def lab_csv(tmp_path):
+    path = tmp_path / 'labs.csv'
+    lines = ['patient,hb,diagnosis']
+    for i in range(25):
+        hb = '' if i == 20 else f'{100 + i}.5'
+        lines.append(f'{i},{hb},{"анемия" if i % 10 == 0 else "норма"}')
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_chunked_mode_streams_rows(lab_csv, fake_terms):
+    converter = CsvConverter()
+    converter.PREVIEW_ROWS = 3
+    result = converter.convert(str(lab_csv), chunked=True, chunksize=10)
+
+    assert result['metadata']['rows'] == 25
+    assert result['metadata']['dtypes'] == {'patient': 'Int64', 'hb': 'float64', 'diagnosis': 'object'}
+    assert result['metadata']['has_nulls'] == {'patient': False, 'hb': True, 'diagnosis': False}
+    assert result['structure']['text_columns'] == ['diagnosis']
+
+    # Bounded text preview instead of the whole frame
+    assert result['text'].count('норма') + result['text'].count('анемия') == 3
+    assert result['text'].endswith('... (22 more rows)')
+
+    # One term batch per chunk
+    assert len(fake_terms) == 3
+    assert len(result['terms']) == 3
+
+    table = result['tables'][0]
+    assert isinstance(table, CsvRowStream)
+    rows = list(table)
+    assert rows[0] == ['patient', 'hb', 'diagnosis']
+    assert rows[1] == [0, 100.5, 'анемия']
+    assert rows[21] == [20, None, 'анемия']
+    assert list(table) == rows
+
+
+def test_chunked_matches_full_mode(lab_csv):
+    full = CsvConverter().convert(str(lab_csv), chunked=False)
+    chunked = CsvConverter().convert(str(lab_csv), chunked=True, chunksize=7)
+
+    assert chunked['metadata']['columns'] == full['metadata']['columns']
+    assert chunked['metadata']['has_nulls'] == full['metadata']['has_nulls']
+    assert [term['term'] for term in chunked['terms']] == [term['term'] for term in full['terms']]
+    full_rows = [[None if cell != cell else cell for cell in row] for row in full['tables'][0]]
+    assert list(chunked['tables'][0]) == full_rows
+
+
+def test_dtype_fallback_when_sample_misleads(tmp_path, monkeypatch):
+    monkeypatch.setattr(CsvConverter, 'SAMPLE_ROWS', 2)
+    path = tmp_path / 'mixed.csv'
+    path.write_text('code,value\n1,2\n3,4\nA7,5\n', encoding='utf-8')
+
+    result = CsvConverter().convert(str(path), chunked=True, chunksize=2)
+
+    assert result['metadata']['dtypes'] == {'code': 'object', 'value': 'object'}
+    assert list(result['tables'][0])[-1] == ['A7', '5']
+
+
+def test_large_files_default_to_chunked(lab_csv, monkeypatch):
+    monkeypatch.setattr(CsvConverter, 'CHUNKED_THRESHOLD', 0)
+    result = CsvConverter().convert(str(lab_csv))
+
+    assert result['metadata']['chunked'] is True
+    assert '| patient | hb | diagnosis |' in DocumentFormatter.to_markdown(result)
+    assert '"анемия"' in DocumentFormatter.to_json(result)
+
+
+def test_chunk_text_stays_under_spacy_limit(tmp_path, monkeypatch):
+    from src.utils import medical_terms
+    # Real term extraction on a full-size chunk (~1.2M chars in one text column)
+    monkeypatch.setattr(csv_converter, 'extract_medical_terms_batch', medical_terms.extract_medical_terms_batch)
+    monkeypatch.setattr(CsvConverter, 'MAX_TERMS', 1_000)
+    path = tmp_path / 'notes.csv'
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('patient,note\n')
+        for i in range(CsvConverter.CHUNK_SIZE):
+            note = 'гипергликемия натощак' if i % 10 == 0 else 'осмотр без особенностей'
+            f.write(f'{i},{note} {i}\n')
+
+    result = CsvConverter().convert(str(path), chunked=True)
+
+    assert len(result['terms']) == 1_000
+    assert result['metadata']['terms_truncated'] is True
+    assert result['terms'][1]['context'] == 'гипергликемия натощак 10'
+    assert all(piece for piece in csv_converter.iter_text_pieces(['a' * 250], 100))
+    assert [len(p) for p in csv_converter.iter_text_pieces(['a' * 60, 'b' * 60, 'c' * 250], 100)] == \
+        [60, 60, 100, 100, 50]
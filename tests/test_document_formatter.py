@@ -0,0 +1,92 @@
+import io
+import json
+import pytest
+from src.utils.document_formatter import DocumentFormatter
+
+DATA = {
+    'metadata': {'total_pages': 3, 'source': '<scan>'},
+    'pages': [{'text': 'Выявлена анемия.'}, {'text': 'Без изменений.'}, {'text': 'Анемия & ретинопатия'}],
+    'tables': [[['Показатель', 'Значение'], ['Hb', '<90']]],
+    'terms': [{'term': 'анемия', 'definition': 'Снижение гемоглобина', 'context': 'Выявлена анемия.'}]
+}
+
+
+@pytest.mark.parametrize('name', ['html', 'plain_text', 'markdown'])
+def test_write_matches_to_string(name):
+    stream = io.StringIO()
+    getattr(DocumentFormatter, f'write_{name}')(DATA, stream)
+
+    assert stream.getvalue() == getattr(DocumentFormatter, f'to_{name}')(DATA)
+
+
+def test_write_json_round_trips():
+    stream = io.StringIO()
+    DocumentFormatter.write_json(DATA, stream)
+    assert json.loads(stream.getvalue()) == DATA
+
+
+def test_html_streams_page_by_page():
+    chunks = list(DocumentFormatter.iter_html(DATA, include_styles=False))
+    pages = [chunk for chunk in chunks if 'ретинопатия' in chunk or 'изменений' in chunk]
+
+    assert len(pages) == 2
+    assert '<span class="term" title="Снижение гемоглобина">Анемия</span> &amp; ретинопатия' in pages[1]
+    assert '<td>&lt;90</td>' in ''.join(chunks)
+    assert '&lt;scan&gt;' in ''.join(chunks)
+
+
+def test_plain_text_separates_pages():
+    text = DocumentFormatter.to_plain_text(DATA, include_metadata=False)
+    assert 'ТЕКСТ:\nВыявлена анемия.\n\nБез изменений.\n\nАнемия & ретинопатия\n' in text
+
+
+def test_tables_and_highlighting_can_be_turned_off():
+    html = DocumentFormatter.to_html(DATA, include_tables=False, highlight_terms=False)
+    assert '<table>' not in html and '<span' not in html
+    assert 'Анемия &amp; ретинопатия' in html
+
+    text = DocumentFormatter.to_plain_text(DATA, include_metadata=False, include_tables=False)
+    assert 'ТАБЛИЦЫ:' not in text and 'Выявлена анемия.' in text
+
+
+def test_single_text_documents_still_supported():
+    data = {'text': 'Диагноз: анемия', 'terms': [{'term': 'анемия', 'start': 9, 'end': 15}]}
+    assert 'Диагноз: <span class="term" title="">анемия</span>' in DocumentFormatter.to_html(data)
+    assert DocumentFormatter.to_markdown(data).startswith('# Текст\n\nДиагноз: анемия')
+
+
+class RowStream:
+    """Lazy table; records how far it has been read"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.read = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.read += 1
+            yield row
+
+
+@pytest.mark.parametrize('pretty', [True, False])
+def test_json_matches_json_module(pretty):
+    data = {**DATA, 'empty': {'list': [], 'dict': {}}, 1: None}
+    expected = json.dumps(data, ensure_ascii=False, indent=2 if pretty else None)
+    assert DocumentFormatter.to_json(data, pretty) == expected
+
+    rows = [['a', 'b'], [1, None], ['анемия', 2.5]]
+    lazy = {**data, 'tables': [RowStream(rows), RowStream([])]}
+    eager = {**data, 'tables': [rows, []]}
+    assert DocumentFormatter.to_json(lazy, pretty) == json.dumps(eager, ensure_ascii=False,
+                                                                 indent=2 if pretty else None)
+
+
+def test_json_streams_lazy_tables_row_by_row():
+    table = RowStream([['row', i] for i in range(1000)])
+    chunks = DocumentFormatter.iter_json({'tables': [table]}, pretty=False)
+    # Output starts before the table has been read to the end
+    text = ''
+    while '["row", 0]' not in text:
+        text += next(chunks)
+    assert table.read < 3
+    assert json.loads(text + ''.join(chunks))['tables'][0][-1] == ['row', 999]
@@ -0,0 +1,32 @@
+import hashlib
+import io
+import os
+from src.utils import file_hash
+from src.utils.file_hash import FileDigestIndex, hash_file, hash_stream
+
+
+def test_chunked_hash_matches_whole_content(tmp_path):
+    data = os.urandom(300_000)
+    path = tmp_path / 'scan.pdf'
+    path.write_bytes(data)
+
+    assert hash_file(str(path), chunk_size=4096) == hash_stream(io.BytesIO(data))
+    if file_hash.xxhash is None:
+        assert hash_file(str(path)) == hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def test_index_reuses_digest_for_unchanged_file(tmp_path, monkeypatch):
+    path = tmp_path / 'scan.pdf'
+    path.write_bytes(b'first version')
+    index = FileDigestIndex()
+    calls = []
+    original = file_hash.hash_file
+    monkeypatch.setattr(file_hash, 'hash_file', lambda p: calls.append(p) or original(p))
+
+    first = index.digest(str(path))
+    assert index.digest(str(path)) == first
+    assert len(calls) == 1
+
+    path.write_bytes(b'second version, longer')
+    assert index.digest(str(path)) != first
+    assert len(calls) == 2
@@ -0,0 +1,46 @@
+import time
+from src.utils.document_formatter import DocumentFormatter
+from src.utils.highlighter import TermHighlighter, highlight_terms, merge_spans
+
+
+def test_uses_offsets_and_escapes():
+    text = 'Диагноз: <ретинопатия> & "диабет"'
+    terms = [
+        {'term': 'ретинопатия', 'definition': 'Поражение "сетчатки"', 'start': 10, 'end': 21},
+        {'term': 'диабет', 'definition': 'a < b'}
+    ]
+
+    assert highlight_terms(text, terms, {'class': 'term'}) == (
+        'Диагноз: &lt;<span class="term" title="Поражение &quot;сетчатки&quot;">ретинопатия</span>&gt; '
+        '&amp; "<span class="term" title="a &lt; b">диабет</span>"'
+    )
+
+
+def test_stale_offsets_fall_back_to_search():
+    spans = TermHighlighter([{'term': 'анемия', 'start': 3, 'end': 9}]).spans('анемия, анемия')
+    assert sorted(span[:2] for span in spans) == [(0, 6), (8, 14)]
+
+
+def test_overlaps_are_merged_not_nested():
+    terms = [{'term': 'сахарный диабет', 'definition': 'A'}, {'term': 'диабет', 'definition': 'B'}]
+    html = highlight_terms('сахарный диабет', terms)
+
+    assert html == '<span title="A">сахарный диабет</span>'
+    assert merge_spans([(5, 9, 'b'), (0, 6, 'a'), (9, 10, 'c')]) == [(0, 9, 'a'), (9, 10, 'c')]
+
+
+def test_term_inside_inserted_markup_is_not_rewritten():
+    # Old replace() loop also rewrote "span"/"term" inside already inserted tags
+    terms = [{'term': 'term', 'definition': 'span'}, {'term': 'span', 'definition': ''}]
+    assert highlight_terms('term span', terms, {'class': 'term'}).count('<span') == 2
+
+
+def test_formatter_renders_many_hits_quickly():
+    text = 'Выявлена анемия и ретинопатия. ' * 5000
+    terms = [{'term': 'анемия', 'definition': 'x'}, {'term': 'ретинопатия', 'definition': 'y'}] * 500
+
+    start = time.perf_counter()
+    html = DocumentFormatter.to_html({'text': text, 'terms': terms, 'metadata': {'pages': 1}})
+    assert time.perf_counter() - start < 2
+
+    assert html.count('<span class="term"') == 10000
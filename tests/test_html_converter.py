@@ -0,0 +1,95 @@
+import pytest
+from src.converters import html_converter
+from src.converters.html_converter import HtmlConverter
+
+pytest.importorskip('lxml')
+
+EHR_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Выписка</title>
+    <meta name="description" content="Выписной эпикриз">
+    <meta name="keywords" content="анемия, гемоглобин">
+    <style>.x { color: red; }</style>
+    <script>var secret = 'hidden';</script>
+</head>
+<body>
+    <h1>Пациент <b>Иванов</b></h1>
+    <!-- служебный комментарий -->
+    <p>Диагноз: <a href="#dx">анемия</a> лёгкой степени.</p>
+    <img src="chart.png">
+    <h2>Анализы</h2>
+    <table>
+        <tr><th>Показатель</th><th>Значение</th></tr>
+        <tr><td> Hb </td><td>95 <i>г/л</i></td></tr>
+        <tr><td>Вложенная</td><td><table><tr><td>a</td><td>b</td></tr></table></td></tr>
+    </table>
+    <p>Рекомендации <a href="#r">см. ниже</a></p>
+</body>
+</html>"""
+
+
+@pytest.fixture(autouse=True)
+def fake_terms(monkeypatch):
+    monkeypatch.setattr(html_converter, 'extract_medical_terms', lambda text: [])
+
+
+@pytest.fixture
+def ehr_page(tmp_path):
+    path = tmp_path / 'page.html'
+    path.write_text(EHR_PAGE, encoding='utf-8')
+    return str(path)
+
+
+def _lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def test_lxml_matches_beautifulsoup(ehr_page):
+    converter = HtmlConverter()
+    fast = converter.convert(ehr_page)
+    soup = converter.convert(ehr_page, parser='html.parser')
+
+    assert fast['metadata'] == soup['metadata'] == {
+        'title': 'Выписка',
+        'meta_description': 'Выписной эпикриз',
+        'meta_keywords': 'анемия, гемоглобин',
+    }
+    assert fast['tables'] == soup['tables']
+    assert fast['tables'][0][1] == ['Hb', '95г/л']
+    # Rows of the nested table also belong to the outer one
+    assert fast['tables'][0][-1] == ['a', 'b']
+    assert fast['tables'][1] == [['a', 'b']]
+    assert fast['structure'] == soup['structure']
+    assert fast['structure']['headings'] == ['Пациент Иванов', 'Анализы']
+    assert fast['structure']['links'] == 2
+    assert fast['structure']['images'] == 1
+    assert _lines(fast['text']) == _lines(soup['text'])
+    assert 'hidden' not in fast['text']
+    assert 'комментарий' not in fast['text']
+
+
+def test_deeply_nested_page(tmp_path):
+    # Deeper than both the recursion limit and libxml2's default depth limit
+    depth = 1500
+    path = tmp_path / 'deep.html'
+    path.write_text('<html><body>' + '<div>' * depth + 'текст' + '</div>' * depth + '</body></html>',
+                    encoding='utf-8')
+    result = HtmlConverter().convert(str(path))
+    assert _lines(result['text']) == ['текст']
+
+
+def test_empty_document_falls_back_to_beautifulsoup(tmp_path):
+    path = tmp_path / 'empty.html'
+    path.write_text('', encoding='utf-8')
+    result = HtmlConverter().convert(str(path))
+    assert result['text'] == ''
+    assert result['tables'] == []
+    assert result['metadata']['title'] is None
+
+
+def test_without_lxml(ehr_page, monkeypatch):
+    monkeypatch.setattr(html_converter, 'etree', None)
+    result = HtmlConverter().convert(ehr_page)
+    assert result['structure']['links'] == 2
+    assert len(result['tables']) == 2
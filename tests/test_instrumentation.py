@@ -0,0 +1,150 @@
+import time
+import pytest
+from src.tread import instrumentation
+from src.tread.instrumentation import (Instrumentation, ResourceSampler, RingBuffer,
+                                       fetch_snapshot, instrumented)
+from src.tread.monitoring import TREADMonitor
+
+
+class FakeSampler:
+    """Canned resource samples; fails if the monitor samples synchronously"""
+
+    started = False
+
+    def start(self):
+        self.started = True
+
+    def stop(self):
+        self.started = False
+
+    def latest(self):
+        return {'time': time.time(), 'cpu_percent': 12.5, 'memory_mb': 100.0}
+
+    def sample(self):
+        raise AssertionError('sampling belongs to the sampler thread')
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(instrumentation.TREAD_CONFIG, 'monitor_buffer_size', 3)
+    monitor = TREADMonitor(instrumentation=Instrumentation(), sampler=FakeSampler())
+    yield monitor
+    monitor.close()
+
+
+def test_ring_buffer_drops_oldest():
+    buffer = RingBuffer(3)
+    for i in range(5):
+        buffer.append(i)
+    assert buffer.snapshot() == [2, 3, 4]
+    assert buffer.latest() == 4 and len(buffer) == 3
+
+
+def test_spans_and_stage_totals():
+    recorder = Instrumentation(capacity=2)
+    with recorder.span('ocr', page=1) as attrs:
+        attrs['lang'] = 'rus'
+    with pytest.raises(ValueError):
+        with recorder.span('ocr', page=2):
+            raise ValueError('bad page')
+    recorder.record_timings({'rasterize': 0.5, 'preprocess': 0.25}, page=3)
+
+    spans = recorder.recent_spans()
+    # Capacity 2: only the newest spans are kept...
+    assert [(s.seq, s.stage) for s in spans] == [(3, 'rasterize'), (4, 'preprocess')]
+    assert [s.seq for s in recorder.recent_spans(since=3)] == [4]
+    # ...but the totals cover every span
+    stats = recorder.stage_stats()
+    assert stats['ocr']['count'] == 2
+    assert stats['rasterize'] == {'count': 1, 'total_sec': 0.5, 'mean_ms': 500.0, 'max_ms': 500.0}
+
+
+def test_span_records_error_and_attributes():
+    recorder = Instrumentation()
+    with pytest.raises(KeyError):
+        with recorder.span('plugins', page=7):
+            raise KeyError('x')
+    span = recorder.recent_spans()[0]
+    assert span.attrs == {'page': 7, 'error': 'KeyError'}
+    assert span.duration >= 0
+
+
+def test_instrumented_converter(monkeypatch):
+    recorder = Instrumentation()
+    monkeypatch.setattr(instrumentation, 'get_instrumentation', lambda: recorder)
+
+    class Converter:
+        @instrumented('convert')
+        def convert(self, file_path, **kwargs):
+            return kwargs
+
+    assert Converter().convert('/data/report.docx', fast=True) == {'fast': True}
+    span = recorder.recent_spans()[0]
+    assert (span.stage, span.attrs) == ('convert', {'converter': 'Converter', 'file': 'report.docx'})
+
+
+def test_resource_sampler_thread():
+    sampler = ResourceSampler(interval=0.01, capacity=5)
+    sampler.start()
+    time.sleep(0.1)
+    sampler.stop()
+    samples = sampler.samples.snapshot()
+    assert len(samples) == 5
+    assert samples[-1]['memory_mb'] > 0
+
+
+def test_monitor_metrics_are_bounded(monitor):
+    monitor.start_file_processing('scan.pdf')
+    for _ in range(5):
+        monitor.log_page_processed(100)
+
+    assert len(monitor.metrics) == 3
+    stats = monitor.get_current_stats()
+    assert stats['pages_processed'] == 5
+    assert stats['bytes_processed'] == 500
+    assert stats['cpu_usage_percent'] == 12.5
+
+
+def test_monitor_server_round_trip(monitor):
+    monitor.start_file_processing('scan.pdf')
+    monitor.instrumentation.record('ocr', 0.2, page=1)
+    monitor.log_page_processed(100)
+    # The sampler thread starts with the server, not with the monitor
+    assert not monitor.sampler.started
+    server = monitor.serve(port=0)
+    assert monitor.sampler.started
+    host, port = server.address
+
+    snapshot = fetch_snapshot(host, port)
+    assert snapshot['stats']['file_name'] == 'scan.pdf'
+    assert snapshot['stages']['ocr']['count'] == 1
+    assert snapshot['spans'][0]['attrs'] == {'page': 1}
+    assert snapshot['resources']['memory_mb'] == 100.0
+
+    monitor.instrumentation.record('plugins', 0.01, page=1)
+    newer = fetch_snapshot(host, port, since=snapshot['spans'][-1]['seq'])
+    assert [s['stage'] for s in newer['spans']] == ['plugins']
+
+    monitor.close()
+    with pytest.raises(OSError):
+        fetch_snapshot(host, port, timeout=0.5)
+
+
+def test_document_processor_records_page_stages(monitor, monkeypatch):
+    processor_module = pytest.importorskip('src.processor')
+    monkeypatch.setattr(processor_module, 'get_monitor', lambda: monitor)
+    monkeypatch.setattr(processor_module, 'get_instrumentation', lambda: monitor.instrumentation)
+    monkeypatch.setattr(instrumentation, 'get_instrumentation', lambda: monitor.instrumentation)
+
+    processor = processor_module.DocumentProcessor(num_workers=1)
+    try:
+        page = {'page': 2, 'text': 'анемия', 'metadata': {'source': 'ocr'},
+                'timings': {'rasterize': 0.1, 'preprocess': 0.01, 'ocr': 0.3}}
+        result = processor._process_page_result(page)
+    finally:
+        processor.cleanup()
+
+    assert 'timings' not in result
+    assert list(monitor.instrumentation.stage_stats()) == ['rasterize', 'preprocess', 'ocr', 'plugins']
+    assert monitor.get_current_stats()['bytes_processed'] == len('анемия'.encode('utf-8'))
@@ -0,0 +1,112 @@
+import json
+import pytest
+from src.utils import medical_dictionary
+from src.utils.medical_dictionary import MedicalDictionary, compile_dictionary, get_medical_dictionary
+
+
+@pytest.fixture
+def sources(tmp_path):
+    terms = tmp_path / 'terms.txt'
+    terms.write_text(
+        '# Русские медицинские термины\n'
+        '# Формат: термин | категория | определение\n\n'
+        'гемоглобин|биохимия|белок эритроцитов\n'
+        'Сахарный диабет | эндокринология | нарушение обмена глюкозы\n'
+        'анти-ВИЧ|иммунология\n'
+        '[More terms continue...]\n',
+        encoding='utf-8'
+    )
+    extra = tmp_path / 'terms.json'
+    extra.write_text(json.dumps({
+        'гемоглобин': {'category': 'другое', 'definition': 'не должен перекрыть txt'},
+        'анемия': {'category': 'заболевания', 'definition': 'Снижение гемоглобина'}
+    }, ensure_ascii=False), encoding='utf-8')
+    patterns = tmp_path / 'patterns.txt'
+    patterns.write_text(
+        '# Medical Term Patterns\n\n'
+        '# Prefixes\n'
+        'гипер[а-я]+          # Terms starting with "гипер"\n'
+        '[а-я]+ит\\b\n'
+        'broken(   # unbalanced\n'
+        '[More patterns continue...]\n',
+        encoding='utf-8'
+    )
+    return [terms, extra], [patterns]
+
+
+@pytest.fixture
+def dictionary(tmp_path, sources):
+    term_sources, pattern_sources = sources
+    summary = compile_dictionary(tmp_path / 'dict.bin', term_sources, pattern_sources)
+    assert summary['terms'] == 4 and summary['patterns'] == 2
+    dictionary = MedicalDictionary(tmp_path / 'dict.bin')
+    yield dictionary
+    dictionary.close()
+
+
+def test_lookup_is_normalized(dictionary):
+    assert dictionary['САХАРНЫЙ-ДИАБЕТ'] == {
+        'category': 'эндокринология', 'definition': 'нарушение обмена глюкозы'
+    }
+    assert dictionary.lookup('анти вич')['term'] == 'анти-ВИЧ'
+    assert 'гемоглобин' in dictionary and 'гематокрит' not in dictionary
+    with pytest.raises(KeyError):
+        dictionary['гематокрит']
+
+
+def test_first_source_wins(dictionary):
+    assert dictionary['гемоглобин']['category'] == 'биохимия'
+    assert sorted(dictionary) == ['Сахарный диабет', 'анемия', 'анти-ВИЧ', 'гемоглобин']
+    assert dict(dictionary.items())['анемия']['definition'] == 'Снижение гемоглобина'
+
+
+def test_patterns_keep_section_category(dictionary):
+    assert dictionary.patterns() == [
+        {'pattern': 'гипер[а-я]+', 'category': 'prefixes', 'description': 'Terms starting with "гипер"'},
+        {'pattern': '[а-я]+ит\\b', 'category': 'prefixes', 'description': ''}
+    ]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a dictionary at all')
+    with pytest.raises(ValueError):
+        MedicalDictionary(path)
+
+
+def test_artifact_rebuilt_only_when_sources_change(tmp_path, sources, monkeypatch):
+    term_sources, pattern_sources = sources
+    monkeypatch.setattr(medical_dictionary, 'TERM_SOURCES', tuple(term_sources))
+    monkeypatch.setattr(medical_dictionary, 'PATTERN_SOURCES', tuple(pattern_sources))
+    monkeypatch.setattr(medical_dictionary, '_dictionaries', {})
+    builds = []
+    real_compile = medical_dictionary.compile_dictionary
+    monkeypatch.setattr(medical_dictionary, 'compile_dictionary',
+                        lambda path: builds.append(path) or real_compile(path, term_sources, pattern_sources))
+    artifact = tmp_path / 'auto.bin'
+
+    first = get_medical_dictionary(artifact)
+    assert get_medical_dictionary(artifact) is first
+    assert len(first) == 4 and len(builds) == 1
+
+    monkeypatch.setattr(medical_dictionary, '_dictionaries', {})
+    get_medical_dictionary(artifact)
+    assert len(builds) == 1
+
+
+def test_term_matcher_reads_definitions_from_mapped_file(dictionary, monkeypatch):
+    spacy = pytest.importorskip('spacy')
+    from src.utils import medical_terms
+    monkeypatch.setattr(medical_terms, 'get_medical_dictionary', lambda: dictionary)
+    monkeypatch.setattr(medical_terms, '_matcher', None)
+
+    matcher = medical_terms.get_term_matcher()
+    # Only spellings live in the automaton; definitions stay in the mapping
+    assert {value for _, value, _ in matcher._patterns} == {None, *medical_terms.BASE_TERMS.values()}
+
+    nlp = spacy.blank('ru')
+    nlp.add_pipe('sentencizer')
+    found = medical_terms.find_terms_in_context(nlp('Анемия и ретинопатия.'), matcher)
+    assert [(term['term'], term['definition']) for term in found] == [
+        ('анемия', 'Снижение гемоглобина'), ('ретинопатия', 'Поражение сетчатки глаза')
+    ]
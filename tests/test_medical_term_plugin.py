@@ -0,0 +1,114 @@
+import random
+import re
+import time
+import pytest
+from src.plugins import medical_term
+from src.plugins.medical_term import MedicalTermPlugin
+
+
+class FakeDictionary:
+    def __init__(self, patterns):
+        self._patterns = patterns
+
+    def patterns(self):
+        return self._patterns
+
+
+@pytest.fixture
+def make_plugin(monkeypatch):
+    def make(patterns):
+        monkeypatch.setattr(medical_term, 'get_medical_dictionary', lambda: FakeDictionary(patterns))
+        return MedicalTermPlugin()
+    return make
+
+
+def _per_pattern_scan(terms, content):
+    """Reference: one re.finditer per pattern, as before the combined regex"""
+    found = []
+    for term in terms:
+        for match in re.finditer(term['pattern'], content, re.IGNORECASE):
+            found.append((match.start(), match.group(), term['category']))
+    return sorted(found)
+
+
+def test_finds_all_categories_in_order(make_plugin):
+    plugin = make_plugin([
+        {'pattern': 'гипер[а-я]+', 'category': 'prefixes', 'description': 'Terms starting with "гипер"'}
+    ])
+    result = plugin.process('Arthritis и ГИПЕРГЛИКЕМИЯ; carcinoma, appendectomy.'.encode('utf-8'))
+
+    assert [(term['term'], term['category']) for term in result['terms']] == [
+        ('Arthritis', 'inflammation'),
+        ('ГИПЕРГЛИКЕМИЯ', 'prefixes'),
+        ('carcinoma', 'tumor'),
+        ('appendectomy', 'surgical_removal')
+    ]
+    assert result['terms'][1]['position'] == 12
+    assert result['terms'][1]['description'] == 'Terms starting with "гипер"'
+
+
+def test_invalid_pattern_is_skipped(make_plugin, capsys):
+    plugin = make_plugin([
+        {'pattern': 'broken(', 'category': 'bad'},
+        {'pattern': r'\bгипо\w+', 'category': 'prefixes'}
+    ])
+
+    assert [term['term'] for term in plugin.process('гипотония')['terms']] == ['гипотония']
+    assert 'broken(' in capsys.readouterr().out
+
+
+def test_special_patterns_keep_their_meaning(make_plugin):
+    plugin = make_plugin([
+        {'pattern': r'\b(\w)\1\w*', 'category': 'double'},
+        {'pattern': r'(?P<num>\d+)\s*мг', 'category': 'dose'},
+        {'pattern': r'(?i)ЭКГ', 'category': 'exam'},
+        {'pattern': r'\bfoo|bar\b', 'category': 'alternation'}
+    ])
+    terms = plugin.process('ааорта 500 мг ЭКГ sidebar')['terms']
+
+    assert [(term['term'], term['category']) for term in terms] == [
+        ('ааорта', 'double'), ('500 мг', 'dose'), ('ЭКГ', 'exam'), ('bar', 'alternation')
+    ]
+
+
+def test_single_scan_benchmark(make_plugin):
+    """Micro-benchmark: one combined scan against a scan per pattern"""
+    random.seed(7)
+    patterns = (
+        [{'pattern': rf'\b\w*{suffix}\b', 'category': 'suffix'}
+         for suffix in ('algia', 'emia', 'osis', 'pathy', 'алгия', 'емия', 'оз', 'патия')]
+        + [{'pattern': rf'\b{prefix}\w+', 'category': 'prefix'}
+           for prefix in ('кардио', 'нейро', 'гастро', 'гепато', 'hyper', 'neuro')]
+        + [{'pattern': rf'\bdrug{i}\b', 'category': 'drug'} for i in range(150)]
+    )
+    plugin = make_plugin(patterns)
+    words = ('пациент жалобы боль кардиограмма гастроскопия arthritis carcinoma '
+             'the patient is fine drug7 drug120').split()
+    content = ' '.join(random.choice(words) for _ in range(20000))
+
+    start = time.perf_counter()
+    reference = _per_pattern_scan(plugin.medical_terms, content)
+    per_pattern = time.perf_counter() - start
+
+    start = time.perf_counter()
+    found = plugin.process(content)['terms']
+    combined = time.perf_counter() - start
+
+    print(f'\n{len(plugin.medical_terms)} patterns: per-pattern {per_pattern:.3f}s, combined {combined:.3f}s')
+    # The synthetic patterns never overlap, so both scans must agree exactly
+    assert [(term['position'], term['term'], term['category']) for term in found] == reference
+    # Timings are only printed (wall clock is noisy on CI); every pattern went into the single scan
+    assert plugin._combined is not None and plugin._separate == []
+
+
+def test_alternation_without_word_boundary_is_not_bucketed(make_plugin):
+    plugin = make_plugin([
+        {'pattern': 'ОРВИ|грипп', 'category': 'infection'},
+        {'pattern': r'\bинсульт\b', 'category': 'vascular'},
+        {'pattern': r'\bинфаркт\b', 'category': 'vascular'}
+    ])
+    content = 'инсульт; грипп; инфаркт; ОРВИ'
+    found = [(term['position'], term['term'], term['category']) for term in plugin.process(content)['terms']]
+
+    assert ('грипп', 'infection') in [(name, category) for _, name, category in found]
+    assert found == _per_pattern_scan(plugin.medical_terms, content)
@@ -0,0 +1,67 @@
+import pytest
+from src.utils import nlp_models
+from src.utils.medical_terms import extract_medical_terms, extract_medical_terms_batch
+
+
+@pytest.fixture
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(nlp_models, '_models', {})
+    loads = []
+    real_load = nlp_models._load
+
+    def counting_load(name):
+        loads.append(name)
+        return real_load(name)
+
+    monkeypatch.setattr(nlp_models, '_load', counting_load)
+    return loads
+
+
+def test_pipeline_loaded_once_per_process(fresh_registry):
+    first = nlp_models.get_nlp()
+    nlp_models.warm_up()
+
+    assert nlp_models.get_nlp() is first
+    assert fresh_registry == [None]
+
+
+def test_fallback_pipeline_splits_sentences(fresh_registry, monkeypatch):
+    monkeypatch.setattr(nlp_models, 'SPACY_MODELS', ('not_installed_model',))
+    nlp = nlp_models.get_nlp()
+
+    assert 'ner' not in nlp.pipe_names and 'parser' not in nlp.pipe_names
+    assert [sent.text for sent in nlp('Первое. Второе.').sents] == ['Первое.', 'Второе.']
+
+
+def test_explicit_missing_model_raises(fresh_registry):
+    with pytest.raises(OSError):
+        nlp_models.get_nlp('not_installed_model')
+
+
+def test_batch_keeps_text_order(fresh_registry):
+    results = extract_medical_terms_batch(['Без терминов.', 'Выявлена ретинопатия.', 'Гипергликемия натощак.'])
+
+    assert [[term['term'] for term in terms] for terms in results] == [
+        [], ['ретинопатия'], ['гипергликемия']
+    ]
+    assert extract_medical_terms('Выявлена ретинопатия.')[0]['context'] == 'Выявлена ретинопатия.'
+    assert fresh_registry == [None]
+
+
+def test_csv_converter_extracts_terms_in_one_batch(tmp_path, monkeypatch):
+    from src.converters import csv_converter
+
+    batches = []
+
+    def fake_batch(texts):
+        batches.append(list(texts))
+        return [[{'term': text}] for text in texts]
+
+    monkeypatch.setattr(csv_converter, 'extract_medical_terms_batch', fake_batch)
+    path = tmp_path / 'labs.csv'
+    path.write_text('diagnosis,value,note\nретинопатия,1,a\nгипергликемия,2,b\n', encoding='utf-8')
+
+    result = csv_converter.CsvConverter().convert(str(path))
+
+    assert batches == [['ретинопатия\nгипергликемия', 'a\nb']]
+    assert len(result['terms']) == 2
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from src.utils import ocr_backends
+from src.utils.ocr_backends import (
+    PytesseractBackend, TesserocrBackend, get_ocr_backend, parse_tesseract_config
+)
+
+
+def test_parse_tesseract_config():
+    options = parse_tesseract_config('--oem 1 --psm 6 -l rus+eng --dpi 300 -c tessedit_do_invert=0')
+    assert options == {
+        'oem': 1,
+        'psm': 6,
+        'lang': 'rus+eng',
+        'dpi': 300,
+        'variables': {'tessedit_do_invert': '0'}
+    }
+    assert parse_tesseract_config('') == {'variables': {}}
+
+
+def test_auto_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setattr(ocr_backends, 'tesserocr', None)
+    monkeypatch.setattr(ocr_backends, '_instances', {})
+    backend = get_ocr_backend('auto')
+    assert isinstance(backend, PytesseractBackend)
+    assert get_ocr_backend('auto') is backend
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_ocr_backend('cuneiform')
+
+
+def test_pytesseract_backend_respects_config_lang(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ocr_backends.pytesseract, 'image_to_string',
+                        lambda image, lang, config: calls.append((lang, config)) or 'text')
+    backend = PytesseractBackend()
+    image = np.zeros((4, 4), dtype=np.uint8)
+
+    backend.image_to_string(image, lang='eng+rus', config='--psm 6')
+    backend.image_to_string(image, lang='eng+rus', config='--psm 6 -l rus')
+    assert calls == [('eng+rus', '--psm 6'), (None, '--psm 6 -l rus')]
+
+
+@pytest.mark.skipif(ocr_backends.tesserocr is not None, reason='tesserocr is installed')
+def test_tesserocr_backend_requires_module():
+    with pytest.raises(ImportError):
+        TesserocrBackend()
+
+
+class FakeTessAPI:
+    created = []
+
+    def __init__(self, lang, oem, psm):
+        # Real tesserocr only accepts plain ints here
+        assert all(type(value) is int for value in (oem, psm))
+        self.options = (lang, oem, psm)
+        self.variables = {}
+        self.ended = False
+        FakeTessAPI.created.append(self)
+
+    def SetVariable(self, name, value):
+        self.variables[name] = value
+
+    def SetImageBytes(self, *args):
+        pass
+
+    def GetUTF8Text(self):
+        return 'text'
+
+    def Clear(self):
+        pass
+
+    def End(self):
+        self.ended = True
+
+
+def test_tesserocr_handles_are_pooled(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    FakeTessAPI.created = []
+    monkeypatch.setattr(ocr_backends, 'tesserocr', type('tesserocr', (), {'PyTessBaseAPI': FakeTessAPI}))
+    backend = TesserocrBackend(max_idle=2)
+    image = np.zeros((4, 4), dtype=np.uint8)
+
+    # Fresh thread pools on every call reuse the same handles
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(lambda config: backend.image_to_string(image, config=config),
+                                     ['--psm 6 -c a=1'] * 4)) == ['text'] * 4
+    assert 1 <= len(FakeTessAPI.created) <= 2
+    assert FakeTessAPI.created[0].options == ('eng+rus', 3, 6)
+    assert FakeTessAPI.created[0].variables == {'a': '1'}
+
+    backend.close()
+    assert all(api.ended for api in FakeTessAPI.created)
+
+
+@pytest.mark.skipif(ocr_backends.tesserocr is None, reason='tesserocr is not installed')
+def test_tesserocr_backend_builds_api():
+    backend = TesserocrBackend()
+    image = np.full((32, 64), 255, dtype=np.uint8)
+    assert backend.image_to_string(image, lang='eng', config='--oem 1 --psm 6').strip() == ''
+    backend.close()
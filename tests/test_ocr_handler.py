@@ -0,0 +1,87 @@
+import threading
+import time
+import numpy as np
+import pytest
+from src.utils import ocr_handler
+from src.utils.ocr_handler import improve_russian_ocr, run_ocr_variants, text_accuracy
+
+
+class FakeBackend:
+    """Confidence depends on the psm; counts recognition passes"""
+
+    def __init__(self, confidences):
+        self.confidences = confidences
+        self.passes = []
+        self.lock = threading.Lock()
+
+    def recognize(self, image, lang='rus+eng', config=''):
+        psm = int(config.split('--psm ')[1].split()[0])
+        with self.lock:
+            self.passes.append(psm)
+        return {'text': f'psm {psm}', 'confidence': self.confidences[psm]}
+
+
+@pytest.fixture
+def patch_backend(monkeypatch):
+    monkeypatch.setattr(ocr_handler, 'PREPROCESSINGS', {
+        'enhanced': lambda image: image,
+        'advanced': lambda image: image
+    })
+
+    def install(confidences):
+        backend = FakeBackend(confidences)
+        monkeypatch.setattr(ocr_handler, 'get_ocr_backend', lambda: backend)
+        return backend
+    return install
+
+
+def test_confident_page_stops_after_first_tier(patch_backend):
+    backend = patch_backend({6: 95.0, 3: 99.0, 4: 99.0})
+    result = run_ocr_variants(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    assert result['text'] == 'psm 6'
+    assert result['passes'] <= 2
+    assert 3 not in backend.passes and 4 not in backend.passes
+
+
+def test_low_confidence_page_tries_all_variants(patch_backend):
+    backend = patch_backend({6: 40.0, 3: 55.0, 4: 70.0})
+    result = run_ocr_variants(np.zeros((4, 4, 3), dtype=np.uint8))
+
+    assert result['passes'] == 6
+    assert len(backend.passes) == 6
+    assert result['text'] == 'psm 4'
+    assert result['confidence'] == 70.0
+
+
+def test_early_exit_does_not_wait_for_running_variants(patch_backend, monkeypatch):
+    release = threading.Event()
+    backend = patch_backend({6: 95.0, 3: 0.0, 4: 0.0})
+    fast = backend.recognize
+
+    def recognize(image, lang='rus+eng', config=''):
+        # The 'advanced' variant of the first tier is still running on exit
+        if image.max():
+            release.wait(5)
+        return fast(image, lang, config)
+
+    backend.recognize = recognize
+    monkeypatch.setitem(ocr_handler.PREPROCESSINGS, 'advanced', lambda image: image + 1)
+
+    start = time.perf_counter()
+    result = run_ocr_variants(np.zeros((4, 4, 3), dtype=np.uint8))
+    elapsed = time.perf_counter() - start
+    release.set()
+
+    assert result['variant'] == ('enhanced', 6)
+    assert elapsed < 1
+
+
+def test_improve_russian_ocr_returns_text(patch_backend):
+    patch_backend({6: 90.0, 3: 0.0, 4: 0.0})
+    assert improve_russian_ocr(np.zeros((4, 4, 3), dtype=np.uint8)) == 'psm 6'
+
+
+def test_text_accuracy():
+    assert text_accuracy('гемоглобин', 'гемоглобин') == 1.0
+    assert 0.0 < text_accuracy('гемогл0бин', 'гемоглобин') < 1.0
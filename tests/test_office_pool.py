@@ -0,0 +1,143 @@
+import io
+import shutil
+import threading
+import pytest
+from src.errors import ConversionError
+from src.utils import office_pool
+from src.utils.office_pool import OfficePool
+
+
+class FakeListener:
+    """Stands in for a soffice listener; convert() returns canned OOXML bytes"""
+
+    started = 0
+
+    def __init__(self, result=b'ooxml', hang=None):
+        self.result = result
+        self.hang = hang
+        self.healthy = True
+        self.stopped = False
+        self.converted = []
+
+    def start(self):
+        FakeListener.started += 1
+
+    def is_healthy(self):
+        return self.healthy and not self.stopped
+
+    def convert(self, data, target):
+        self.converted.append((data, target))
+        if self.hang is not None:
+            self.hang.wait()
+        return self.result
+
+    def stop(self):
+        self.stopped = True
+        if self.hang is not None:
+            self.hang.set()
+
+
+class Listeners(list):
+    """Listeners created by the pool, in order"""
+
+    def factory(self, **options):
+        def create():
+            listener = FakeListener(**options)
+            self.append(listener)
+            return listener
+        return create
+
+
+@pytest.fixture
+def listeners():
+    FakeListener.started = 0
+    return Listeners()
+
+
+@pytest.fixture
+def legacy_file(tmp_path):
+    path = tmp_path / 'old.doc'
+    path.write_bytes(b'legacy bytes')
+    return str(path)
+
+
+def test_listeners_are_reused(listeners, legacy_file):
+    pool = OfficePool(size=2, timeout=5, listener_factory=listeners.factory())
+    for _ in range(5):
+        assert pool.convert(legacy_file, 'docx') == b'ooxml'
+    # Sequential conversions keep using the first started listener
+    assert FakeListener.started == 1
+    assert listeners[0].converted == [(b'legacy bytes', 'docx')] * 5
+
+
+def test_unhealthy_listener_is_restarted(listeners, legacy_file):
+    pool = OfficePool(size=1, timeout=5, listener_factory=listeners.factory())
+    pool.convert(legacy_file, 'docx')
+    listeners[0].healthy = False
+    pool.convert(legacy_file, 'pptx')
+    assert listeners[0].stopped
+    assert len(listeners) == 2
+    assert listeners[1].converted == [(b'legacy bytes', 'pptx')]
+
+
+def test_hung_conversion_times_out_and_frees_the_slot(listeners, legacy_file):
+    hang = threading.Event()
+    pool = OfficePool(size=1, timeout=5, listener_factory=listeners.factory(hang=hang))
+    with pytest.raises(ConversionError, match='timed out'):
+        pool.convert(legacy_file, 'docx', timeout=0.2)
+    assert listeners[0].stopped
+
+    # The only slot is usable again, with a fresh listener (stop() released the hang)
+    assert pool.convert(legacy_file, 'docx') == b'ooxml'
+    assert len(listeners) == 2
+
+
+def test_unknown_target(listeners, legacy_file):
+    pool = OfficePool(size=1, listener_factory=listeners.factory())
+    with pytest.raises(ValueError):
+        pool.convert(legacy_file, 'odt')
+
+
+def test_cli_fallback_reports_missing_soffice(monkeypatch, legacy_file):
+    monkeypatch.setattr(office_pool, 'uno', None)
+    pool = OfficePool(size=1, binary='/nonexistent/soffice')
+    with pytest.raises(ConversionError, match='Failed to start LibreOffice'):
+        pool.convert(legacy_file, 'docx')
+
+
+@pytest.mark.skipif(shutil.which('soffice') is None, reason='LibreOffice is not installed')
+def test_cli_fallback_converts(tmp_path):
+    docx = pytest.importorskip('docx')
+    document = docx.Document()
+    document.add_paragraph('Диагноз: анемия')
+    path = tmp_path / 'report.docx'
+    document.save(str(path))
+    # DOCX in, DOCX out is enough to exercise the soffice round trip
+    data = office_pool.convert_with_cli(path.read_bytes(), 'docx', 'soffice', timeout=120)
+    assert 'анемия' in docx.Document(io.BytesIO(data)).paragraphs[0].text
+
+
+def test_doc_converter_hands_ooxml_to_docx_converter(monkeypatch, legacy_file):
+    docx = pytest.importorskip('docx')
+    from src.converters import doc_converter
+    from src.converters.doc_converter import DocConverter
+
+    document = docx.Document()
+    document.add_paragraph('Диагноз: анемия')
+    buffer = io.BytesIO()
+    document.save(buffer)
+
+    calls = []
+
+    class FakePool:
+        def convert(self, source, target, timeout=None):
+            calls.append((source, target, timeout))
+            return buffer.getvalue()
+
+    monkeypatch.setattr(doc_converter, 'get_office_pool', lambda: FakePool())
+    assert DocConverter().convert(legacy_file, timeout=30) == 'Диагноз: анемия'
+    assert calls == [(legacy_file, 'docx', 30)]
+    assert DocConverter().get_supported_formats() == ['.doc']
+
+    with pytest.raises(ConversionError, match='File not found'):
+        DocConverter().convert(legacy_file + '.missing')
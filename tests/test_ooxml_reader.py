@@ -0,0 +1,118 @@
+import zipfile
+import pytest
+from src.utils.ooxml_reader import read_docx, read_pptx
+
+docx = pytest.importorskip('docx')
+pptx = pytest.importorskip('pptx')
+from pptx.util import Inches
+from src.converters import docx_converter, pptx_converter
+from src.converters.docx_converter import DocxConverter
+from src.converters.pptx_converter import PptxConverter
+
+
+@pytest.fixture(autouse=True)
+def fake_terms(monkeypatch):
+    monkeypatch.setattr(pptx_converter, 'extract_medical_terms', lambda text: [])
+
+
+@pytest.fixture
+def docx_file(tmp_path):
+    document = docx.Document()
+    document.add_paragraph('Выписной эпикриз')
+    paragraph = document.add_paragraph('Диагноз: ')
+    paragraph.add_run('анемия').add_break()
+    paragraph.add_run('\tлёгкая')
+    document.add_paragraph('')
+
+    table = document.add_table(rows=3, cols=3)
+    for i in range(3):
+        for j in range(3):
+            table.cell(i, j).text = f'{i}{j}'
+    table.cell(0, 0).merge(table.cell(0, 1))
+    table.cell(1, 2).merge(table.cell(2, 2))
+    table.cell(2, 0).add_paragraph('второй абзац')
+    table.cell(2, 1).add_table(rows=1, cols=1).cell(0, 0).text = 'вложенная'
+    document.add_paragraph('После таблицы')
+
+    path = tmp_path / 'report.docx'
+    document.save(str(path))
+    return str(path)
+
+
+@pytest.fixture
+def pptx_file(tmp_path):
+    prs = pptx.Presentation()
+    prs.core_properties.title = 'Лекция'
+    for number in range(3):
+        slide = prs.slides.add_slide(prs.slide_layouts[5])
+        slide.shapes.title.text = f'Слайд {number}'
+        frame = slide.shapes.add_textbox(0, 0, 100, 100).text_frame
+        frame.text = 'строка\vперенос'
+        frame.add_paragraph().text = 'абзац'
+        if number == 1:
+            table = slide.shapes.add_table(2, 2, Inches(1), Inches(1), Inches(3), Inches(1)).table
+            table.cell(0, 0).text = 'Hb'
+            table.cell(1, 1).text = '95\nг/л'
+            table.cell(0, 0).merge(table.cell(0, 1))
+            slide.notes_slide.notes_text_frame.text = 'Заметки лектора'
+        group = slide.shapes.add_group_shape()
+        group.shapes.add_textbox(0, 0, 10, 10).text = 'в группе'
+
+    path = tmp_path / 'lecture.pptx'
+    prs.save(str(path))
+    return str(path)
+
+
+def test_read_docx_matches_python_docx(docx_file):
+    content = read_docx(docx_file)
+    assert content == DocxConverter._read_with_python_docx(docx_file)
+    assert content['paragraphs'][1] == 'Диагноз: анемия\n\tлёгкая'
+    # Merged cells repeat; the nested table is not part of the cell text
+    assert content['tables'] == [[
+        ['00\n01', '00\n01', '02'],
+        ['10', '11', '12\n22'],
+        ['20\nвторой абзац', '21\n', '12\n22'],
+    ]]
+
+
+def test_docx_converter_modes_agree(docx_file):
+    converter = DocxConverter()
+    text = converter.convert(docx_file)
+    assert text == converter.convert(docx_file, fast=False)
+    assert text.startswith('Выписной эпикриз\n\nДиагноз: анемия')
+    assert '00\n01 | 00\n01 | 02' in text
+
+
+def test_read_pptx_matches_python_pptx(pptx_file):
+    content = read_pptx(pptx_file)
+    assert content == PptxConverter._read_with_python_pptx(pptx_file)
+    assert content['title'] == 'Лекция'
+    slide = content['slides'][1]
+    # Group shapes are not walked (slide.shapes does not descend into them)
+    assert slide['texts'] == ['Слайд 1', 'строка\vперенос\nабзац']
+    assert slide['tables'] == [[['Hb', ''], ['', '95\nг/л']]]
+    assert slide['notes'] == 'Заметки лектора'
+    assert [s['has_notes'] for s in content['slides']] == [False, True, False]
+
+
+def test_pptx_converter_modes_agree(pptx_file):
+    converter = PptxConverter()
+    result = converter.convert(pptx_file)
+    assert result == converter.convert(pptx_file, fast=False)
+    assert result['structure'] == {'total_slides': 3, 'tables_count': 1, 'has_notes': True}
+    assert result['metadata'] == {'slide_count': 3, 'title': 'Лекция'}
+
+
+def test_broken_package_falls_back(tmp_path, monkeypatch):
+    path = tmp_path / 'broken.docx'
+    with zipfile.ZipFile(path, 'w') as package:
+        package.writestr('other.xml', '<x/>')
+    with pytest.raises(KeyError):
+        read_docx(str(path))
+
+    calls = []
+    monkeypatch.setattr(DocxConverter, '_read_with_python_docx',
+                        staticmethod(lambda file_path: calls.append(file_path) or
+                                     {'paragraphs': ['текст'], 'tables': []}))
+    assert DocxConverter().convert(str(path)) == 'текст'
+    assert calls == [str(path)]
@@ -0,0 +1,74 @@
+import pytest
+from PIL import Image
+from src.tread.page_cache import PageCache
+from src.tread.processor import TREADProcessor
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageCache(path=str(tmp_path / 'pages.db'), max_entries=3, max_bytes=1024 * 1024)
+
+
+def test_key_depends_on_page_and_config():
+    key = PageCache.make_key(b'page', '--psm 6')
+    assert key == PageCache.make_key(b'page', '--psm 6')
+    assert key != PageCache.make_key(b'page', '--psm 3')
+    assert key != PageCache.make_key(b'other', '--psm 6')
+
+
+def test_hit_miss_counters(cache):
+    assert cache.get('a') is None
+    cache.set('a', {'text': 'hello'})
+    assert cache.get('a') == {'text': 'hello'}
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert stats['hit_ratio'] == 0.5
+
+
+def test_lru_eviction_by_entries(cache):
+    for key in 'abc':
+        cache.set(key, {'text': key})
+    cache.get('a')
+    cache.set('d', {'text': 'd'})
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_eviction_by_bytes(tmp_path):
+    cache = PageCache(path=str(tmp_path / 'pages.db'), max_entries=100, max_bytes=100)
+    cache.set('a', {'text': 'x' * 60})
+    cache.set('b', {'text': 'y' * 60})
+
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] <= 100
+
+
+def test_zero_budget_is_not_replaced_by_default(tmp_path):
+    cache = PageCache(path=str(tmp_path / 'pages.db'), max_entries=0)
+    assert cache.max_entries == 0
+    cache.set('a', {'text': 'x'})
+    assert cache.get('a') is None
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / 'pages.db')
+    PageCache(path=path).set('a', {'text': 'kept'})
+    assert PageCache(path=path).get('a') == {'text': 'kept'}
+
+
+def test_processor_skips_ocr_for_cached_pages(tmp_path, monkeypatch):
+    processor = TREADProcessor({'page_cache_path': str(tmp_path / 'pages.db')})
+    page = Image.new('L', (20, 20), color=255)
+    calls = []
+
+    monkeypatch.setattr(processor, '_pdf_to_images', lambda path: [page, page.copy()])
+    monkeypatch.setattr(processor, '_process_page', lambda image: calls.append(image) or {'text': 'ocr'})
+
+    result = processor.process_pdf('doc.pdf')
+
+    assert len(calls) == 1
+    assert result['text'] == 'ocr\n\nocr'
+    assert result['cache']['hits'] == 1
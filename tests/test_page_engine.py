@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from src.utils import page_engine
+from src.utils.page_engine import PageOCREngine, binarize
+
+
+class FakeRasterizer:
+    def render(self, pdf_path, page_number, dpi, width=None):
+        if page_number == 3:
+            raise RuntimeError('broken page')
+        return np.full((10, 10), 255, dtype=np.uint8)
+
+
+class FakeOCRBackend:
+    def image_to_string(self, image, lang='eng+rus', config=''):
+        return 'text'
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    monkeypatch.setattr(page_engine, 'get_rasterizer', lambda name: FakeRasterizer())
+    monkeypatch.setattr(page_engine, 'get_ocr_backend', lambda name: FakeOCRBackend())
+
+
+def test_engine_defaults_to_tread_workers():
+    engine = PageOCREngine()
+    assert engine.num_workers == page_engine.TREAD_CONFIG['num_workers']
+
+
+def test_page_failure_does_not_abort_batch(fake_ocr):
+    engine = PageOCREngine(num_workers=1)
+    results = engine.process_pages('doc.pdf', 1, 5)
+
+    assert [r['page'] for r in results] == [1, 2, 3, 4, 5]
+    assert 'broken page' in results[2]['error']
+    assert results[2]['text'] == ''
+    assert all('error' not in r for i, r in enumerate(results) if i != 2)
+    assert set(results[0]['timings']) == {'rasterize', 'preprocess', 'ocr'}
+    assert set(results[2]['timings']) == {'rasterize'}
+
+
+def test_pool_results_in_page_order(fake_ocr):
+    with PageOCREngine(num_workers=2) as engine:
+        results = engine.process_pages('doc.pdf', 1, 8)
+
+    assert [r['page'] for r in results] == list(range(1, 9))
+    assert 'error' in results[2]
+
+
+def test_iter_pages_streams_in_order(fake_ocr):
+    with PageOCREngine(num_workers=2) as engine:
+        pages = engine.iter_pages('doc.pdf', 1, 20, window=3)
+        first = next(pages)
+        second = next(pages)
+        pages.close()
+
+    assert (first['page'], second['page']) == (1, 2)
+
+
+def test_cached_pages_are_not_rendered_again(tmp_path, monkeypatch):
+    rendered = []
+
+    class CountingRasterizer(FakeRasterizer):
+        def render(self, pdf_path, page_number, dpi, width=None):
+            rendered.append(page_number)
+            return super().render(pdf_path, page_number, dpi, width)
+
+    monkeypatch.setattr(page_engine, 'get_rasterizer', lambda name: CountingRasterizer())
+    monkeypatch.setattr(page_engine, 'get_ocr_backend', lambda name: FakeOCRBackend())
+    pdf = tmp_path / 'scan.pdf'
+    pdf.write_bytes(b'%PDF-1.4 scanned pages')
+
+    engine = PageOCREngine(num_workers=1, use_text_layer=False)
+    first = engine.process_pages(str(pdf), 1, 3)
+    second = PageOCREngine(num_workers=1, use_text_layer=False).process_pages(str(pdf), 1, 3)
+
+    # Page 3 failed, so it was not cached and is tried again
+    assert rendered == [1, 2, 3, 3]
+    assert [r['text'] for r in second] == [r['text'] for r in first] == ['text', 'text', '']
+    assert second[0]['metadata']['cached'] is True and 'cached' not in first[0]['metadata']
+    assert 'rasterize' not in second[0]['timings']
+
+    # Different OCR options do not share entries; the cache can be turned off
+    PageOCREngine(num_workers=1, use_text_layer=False, lang='rus').process_pages(str(pdf), 1, 1)
+    PageOCREngine(num_workers=1, use_text_layer=False, use_cache=False).process_pages(str(pdf), 1, 1)
+    assert rendered[4:] == [1, 1]
+
+
+def test_binarize_in_place():
+    gray = np.array([[0, 127, 128, 255]], dtype=np.uint8)
+    assert binarize(gray) is gray
+    assert gray.tolist() == [[0, 0, 255, 255]]
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from src.utils.rasterizer import PyMuPDFRasterizer, fitz, get_rasterizer
+
+pytestmark = pytest.mark.skipif(fitz is None, reason='PyMuPDF is not installed')
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    doc = fitz.open()
+    for number in range(3):
+        page = doc.new_page()
+        page.insert_text((72, 72), f'Page {number + 1}: hemoglobin 120 g/L')
+    path = tmp_path / 'scan.pdf'
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_pymupdf_renders_grayscale_in_memory(pdf_path):
+    rasterizer = PyMuPDFRasterizer()
+    assert rasterizer.page_count(pdf_path) == 3
+
+    page = rasterizer.render(pdf_path, 2, dpi=150, width=800)
+    assert page.dtype == np.uint8
+    assert page.ndim == 2
+    assert page.shape[1] == 800
+    assert page.flags.writeable
+    # Samples are shared with the pixmap rather than copied
+    assert not page.flags.owndata
+    assert page.min() < 128 < page.max()
+    rasterizer.close()
+
+
+def test_pymupdf_keeps_document_open(pdf_path):
+    rasterizer = PyMuPDFRasterizer()
+    rasterizer.render(pdf_path, 1, dpi=72)
+    rasterizer.render(pdf_path, 3, dpi=72)
+    assert len(rasterizer._documents) == 1
+    rasterizer.close()
+
+
+def test_get_rasterizer_is_cached_per_process():
+    assert get_rasterizer('pymupdf') is get_rasterizer('pymupdf')
+    with pytest.raises(ValueError):
+        get_rasterizer('unknown')
@@ -0,0 +1,64 @@
+import pytest
+from src.cache import ResultCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(cache_dir=str(tmp_path), memory_limit=1024, disk_limit=10 * 1024)
+
+
+def test_miss_returns_none(cache):
+    assert cache.get('missing') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_memory_then_disk_hits(tmp_path, cache):
+    cache.set('key', {'text': 'анемия'})
+    assert cache.get('key') == {'text': 'анемия'}
+    assert cache.stats()['memory_hits'] == 1
+
+    # A new instance (e.g. another worker) only has the disk tier
+    other = ResultCache(cache_dir=str(tmp_path))
+    assert other.get('key') == {'text': 'анемия'}
+    assert other.get('key') == {'text': 'анемия'}
+    stats = other.stats()
+    assert (stats['disk_hits'], stats['memory_hits']) == (1, 1)
+    assert stats['hit_ratio'] == 1.0
+
+
+def test_results_are_not_shared_between_callers(cache):
+    cache.set('key', {'pages': []})
+    cache.get('key')['pages'].append('mutated')
+    assert cache.get('key') == {'pages': []}
+
+
+def test_memory_tier_is_bounded(cache):
+    for i in range(10):
+        cache.set(f'key{i}', {'text': 'x' * 200})
+
+    stats = cache.stats()
+    assert stats['memory_bytes'] <= 1024
+    assert stats['memory_evictions'] > 0
+    assert cache.get('key0') is not None  # still on disk
+
+
+def test_disk_quota_lru(cache):
+    for i in range(20):
+        cache.set(f'key{i}', {'text': 'x' * 1000})
+
+    stats = cache.stats()
+    assert stats['disk_bytes'] <= 10 * 1024
+    assert stats['disk_evictions'] > 0
+    assert cache.get('key0') is None
+    assert cache.get('key19') is not None
+
+
+def test_disk_quota_lfu_keeps_frequent_entries(tmp_path):
+    cache = ResultCache(cache_dir=str(tmp_path), memory_limit=0, disk_limit=5 * 1024, policy='lfu')
+    cache.set('hot', {'text': 'x' * 1000})
+    for _ in range(3):
+        cache.get('hot')
+    for i in range(10):
+        cache.set(f'cold{i}', {'text': 'x' * 1000})
+
+    assert cache.get('hot') is not None
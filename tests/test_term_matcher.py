@@ -0,0 +1,63 @@
+import spacy
+import pytest
+from src.utils.medical_terms import find_terms_in_context
+from src.utils.term_matcher import TermMatcher, normalize_term
+
+
+@pytest.fixture
+def matcher():
+    return TermMatcher({
+        'сахарный диабет': 'Нарушение обмена глюкозы',
+        'диабет': 'Группа эндокринных заболеваний',
+        'анти-ВИЧ': 'Антитела к ВИЧ',
+        'ретинопатия': 'Поражение сетчатки глаза'
+    })
+
+
+def test_normalize_term():
+    assert normalize_term('  Анти -- ВИЧ ') == 'анти вич'
+    assert normalize_term('Ёж') == 'еж'
+
+
+def test_finds_overlapping_terms_in_one_pass(matcher):
+    text = 'У пациента Сахарный  диабет.'
+    matches = matcher.find(text)
+
+    assert [(text[start:end], term) for start, end, term, _ in matches] == [
+        ('Сахарный  диабет', 'сахарный диабет'),
+        ('диабет', 'диабет')
+    ]
+
+
+def test_hyphen_and_space_variants_match(matcher):
+    for text in ('анализ анти-ВИЧ отрицательный', 'анализ Анти ВИЧ', 'анализ анти–\nвич'):
+        assert [term for _, _, term, _ in matcher.find(text)] == ['анти-ВИЧ']
+
+
+def test_matches_inflected_forms_by_default(matcher):
+    text = 'В анамнезе сахарного диабета нет'
+    assert [(text[start:end], term) for start, end, term, _ in matcher.find(text)] == [('диабет', 'диабет')]
+
+
+def test_whole_words_is_opt_in():
+    assert TermMatcher({'диабет': ''}, whole_words=True).find('диабетология') == []
+    assert TermMatcher({'диабет': ''}).find('диабетология')[0][:2] == (0, 6)
+
+
+def test_case_duplicates_collapse():
+    assert len(TermMatcher({'Ретинопатия': 'a', 'ретинопатия': 'b'})) == 1
+
+
+def test_find_terms_in_context_maps_sentences(matcher):
+    nlp = spacy.blank('ru')
+    nlp.add_pipe('sentencizer')
+    doc = nlp('Жалоб нет. Выявлена ретинопатия. Диабет в анамнезе.')
+
+    found = find_terms_in_context(doc, matcher)
+
+    assert [(item['term'], item['matched'], item['context']) for item in found] == [
+        ('ретинопатия', 'ретинопатия', 'Выявлена ретинопатия.'),
+        ('диабет', 'Диабет', 'Диабет в анамнезе.')
+    ]
+    assert doc.text[found[0]['start']:found[0]['end']] == 'ретинопатия'
+    assert found[1]['definition'] == 'Группа эндокринных заболеваний'
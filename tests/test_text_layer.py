@@ -0,0 +1,92 @@
+import os
+import pytest
+from src.utils import page_engine
+from src.utils.chunked_processor import ChunkedProcessor
+from src.utils.page_engine import PageOCREngine
+from src.utils.rasterizer import fitz
+from src.utils.text_layer import assess_text_layer, is_usable_text_layer
+
+DISCHARGE_TEXT = 'Patient discharged in stable condition. Hemoglobin 120 g/L, glucose 5.4 mmol/L.'
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    if fitz is None:
+        pytest.skip('PyMuPDF is not installed')
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), DISCHARGE_TEXT)
+    doc.new_page().draw_rect(fitz.Rect(72, 72, 300, 300), fill=(0, 0, 0))  # scanned-like page
+    path = tmp_path / 'mixed.pdf'
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+class FakeOCRBackend:
+    def __init__(self):
+        self.calls = []
+
+    def image_to_string(self, image, lang='eng+rus', config=''):
+        self.calls.append(image)
+        return 'ocr text'
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    backend = FakeOCRBackend()
+    monkeypatch.setattr(page_engine, 'get_ocr_backend', lambda name: backend)
+    return backend
+
+
+def test_assess_text_layer():
+    quality = assess_text_layer('Гемоглобин 120 г/л')
+    assert quality['text_layer_chars'] == 16
+    assert quality['text_layer_valid_ratio'] == 1.0
+
+    broken = assess_text_layer('��ab')
+    assert broken['text_layer_valid_ratio'] == pytest.approx(0.4)
+
+
+def test_is_usable_text_layer():
+    assert is_usable_text_layer(assess_text_layer(DISCHARGE_TEXT))
+    assert not is_usable_text_layer(assess_text_layer('  12 '))
+    assert not is_usable_text_layer(assess_text_layer('�' * 100))
+
+
+def test_engine_routes_pages(mixed_pdf, fake_ocr):
+    engine = PageOCREngine(num_workers=1, rasterizer='pymupdf')
+    text_page, scanned_page = engine.process_pages(mixed_pdf, 1, 2)
+
+    assert text_page['metadata']['source'] == 'text_layer'
+    assert 'Hemoglobin 120' in text_page['text']
+    assert scanned_page['metadata']['source'] == 'ocr'
+    assert scanned_page['text'] == 'ocr text'
+
+
+def test_engine_can_disable_text_layer(mixed_pdf, fake_ocr):
+    engine = PageOCREngine(num_workers=1, rasterizer='pymupdf', use_text_layer=False)
+    assert engine.process_pages(mixed_pdf, 1, 1)[0]['metadata']['source'] == 'ocr'
+
+
+def test_chunked_processor_skips_ocr_for_text_pages(mixed_pdf, monkeypatch):
+    from src.utils import chunked_processor
+    backend = FakeOCRBackend()
+    rendered = []
+
+    class FakeRasterizer:
+        def render(self, pdf_path, page_number, dpi, width=None):
+            rendered.append((pdf_path, page_number))
+            return object()
+
+    monkeypatch.setattr(chunked_processor, 'get_rasterizer', lambda name: FakeRasterizer())
+    monkeypatch.setattr(chunked_processor, 'get_ocr_backend', lambda: backend)
+    monkeypatch.setattr(chunked_processor.time, 'sleep', lambda seconds: None)
+
+    with open(mixed_pdf, 'rb') as f:
+        pages = list(ChunkedProcessor.iter_pdf_pages(f.read()))
+
+    assert [page['metadata']['source'] for page in pages] == ['text_layer', 'ocr']
+    assert len(backend.calls) == 1
+    # Rendered from a temporary copy, removed once the pages are consumed
+    assert [page for _, page in rendered] == [2]
+    assert not os.path.exists(rendered[0][0])
@@ -0,0 +1,47 @@
+import pytest
+from src.utils.text_processor import Entity, TextProcessor
+
+TEXT = ('Пациент поступил 12.05.2023 с жалобами. ЭКГ: без патологии. '
+        'Назначено 500 мг дважды, контроль 2023-06-01. Инфузия 7.5 мл.')
+
+
+def test_extract_entities_single_pass_in_order():
+    entities = TextProcessor.extract_entities(TEXT)
+
+    assert [(entity.kind, entity.value) for entity in entities] == [
+        ('date', '12.05.2023'),
+        ('abbreviation', 'ЭКГ'),
+        ('measurement', '500 мг'),
+        ('date', '2023-06-01'),
+        ('measurement', '7.5 мл')
+    ]
+    assert all(isinstance(entity, Entity) for entity in entities)
+    assert TEXT[entities[0].start:entities[0].end] == '12.05.2023'
+
+
+def test_kinds_filter_and_lazy_context():
+    entities = TextProcessor.extract_entities(TEXT, kinds='measurement')
+
+    assert [entity.value for entity in entities] == ['500 мг', '7.5 мл']
+    assert entities[0].context(width=8) == 'значено 500 мг дважды,'
+    assert 'source' not in repr(entities[0])
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        TextProcessor.extract_entities(TEXT, kinds=('drug',))
+
+
+def test_legacy_methods_keep_their_shape():
+    dates = TextProcessor.extract_dates('Визит 01/02/2024, анализ 2024-02-03.')
+    assert [(date['date'], date['format']) for date in dates] == [
+        ('01/02/2024', r'\b\d{2}/\d{2}/\d{4}\b'),
+        ('2024-02-03', r'\b\d{4}-\d{2}-\d{2}\b')
+    ]
+    assert dates[0]['context'] == 'Визит 01/02/2024, анализ 2024-02-03.'
+
+    assert TextProcessor.find_abbreviations('Сделать МРТ и КТ') == [
+        {'abbreviation': 'МРТ', 'context': 'Сделать МРТ и КТ'},
+        {'abbreviation': 'КТ', 'context': 'Сделать МРТ и КТ'}
+    ]
+    assert TextProcessor.extract_measurements('Доза 10 ML') == [{'value': '10 ML', 'context': 'Доза 10 ML'}]
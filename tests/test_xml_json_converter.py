@@ -0,0 +1,124 @@
+import json
+import pytest
+from src.converters import xml_json_converter
+from src.converters.xml_json_converter import XmlJsonConverter, StructuredTable
+
+
+@pytest.fixture(autouse=True)
+def fake_terms(monkeypatch):
+    calls = []
+
+    def fake_extract(text):
+        calls.append(text)
+        return [{'term': word} for word in text.split() if word == 'анемия']
+
+    monkeypatch.setattr(xml_json_converter, 'extract_medical_terms', fake_extract)
+    return calls
+
+
+@pytest.fixture
+def json_backend():
+    return pytest.importorskip('ijson')
+
+
+@pytest.fixture
+def export_json(tmp_path):
+    data = {
+        'source': 'lab',
+        'patients': [
+            {'id': i, 'diagnosis': 'анемия' if i % 2 else 'норма', 'hb': 100.5 + i}
+            for i in range(5)
+        ],
+        'notes': ['анемия', 'контроль'],
+    }
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    return path, data
+
+
+def test_streaming_json_matches_full_mode(export_json, json_backend):
+    path, data = export_json
+    converter = XmlJsonConverter()
+    full = converter.convert(str(path), streaming=False)
+    result = converter.convert(str(path), streaming=True)
+
+    assert result['metadata']['streaming'] is True
+    assert result['structure'] == full['structure']
+    assert len(result['terms']) == 3
+
+    assert len(result['tables']) == 1
+    table = result['tables'][0]
+    assert isinstance(table, StructuredTable)
+    rows = list(table)
+    assert rows[0] == ['id', 'diagnosis', 'hb']
+    assert rows[1:] == [[str(p['id']), p['diagnosis'], str(p['hb'])] for p in data['patients']]
+    # Re-iterable: the file is read again
+    assert list(table) == rows
+
+    # Top-level array of records, the usual export shape
+    path.write_text(json.dumps(data['patients']), encoding='utf-8')
+    full = converter.convert(str(path), streaming=False)
+    result = converter.convert(str(path), streaming=True)
+    assert list(result['tables'][0]) == full['tables'][0] == rows
+
+
+def test_streaming_json_skips_mixed_arrays(tmp_path, json_backend):
+    path = tmp_path / 'mixed.json'
+    path.write_text(json.dumps([{'a': 1}, 2, {'a': 3}]), encoding='utf-8')
+    result = XmlJsonConverter().convert(str(path), streaming=True)
+    assert result['tables'] == []
+    assert result['structure']['type'] == 'list'
+
+
+def test_deep_nesting_does_not_recurse(tmp_path, json_backend):
+    depth = 5000
+    path = tmp_path / 'deep.json'
+    path.write_text('[' * depth + ']' * depth, encoding='utf-8')
+    result = XmlJsonConverter().convert(str(path), streaming=True)
+    assert result['structure']['depth'] == depth - 1
+    assert result['structure']['array_counts'] == depth
+
+
+def test_streaming_json_requires_ijson(export_json, monkeypatch):
+    path, _ = export_json
+    monkeypatch.setattr(xml_json_converter, 'ijson', None)
+    converter = XmlJsonConverter()
+    with pytest.raises(ImportError, match='ijson'):
+        converter.convert(str(path), streaming=True)
+
+    # Size-based default: no silent full read in "streaming" mode
+    monkeypatch.setattr(XmlJsonConverter, 'STREAMING_THRESHOLD', 0)
+    assert 'streaming' not in converter.convert(str(path))['metadata']
+
+
+def test_streaming_xml_tables_and_terms(tmp_path, fake_terms):
+    records = ''.join(
+        f'<ns:patient id="{i}"><ns:diagnosis>{"анемия" if i % 2 else "норма"}</ns:diagnosis>'
+        f'<ns:hb>{100 + i}</ns:hb></ns:patient>'
+        for i in range(4)
+    )
+    path = tmp_path / 'export.xml'
+    path.write_text(f'<ns:root xmlns:ns="urn:lab"><ns:source>lab</ns:source>{records}</ns:root>',
+                    encoding='utf-8')
+
+    result = XmlJsonConverter().convert(str(path), streaming=True)
+
+    assert result['metadata']['format'] == 'XML'
+    assert result['structure']['depth'] == 2
+    assert result['structure']['array_counts'] == 1
+    assert len(result['terms']) == 2
+
+    assert len(result['tables']) == 1
+    rows = list(result['tables'][0])
+    assert rows[0] == ['@id', 'diagnosis', 'hb']
+    assert rows[1:] == [[str(i), 'анемия' if i % 2 else 'норма', str(100 + i)] for i in range(4)]
+
+
+def test_streaming_text_is_bounded_preview(export_json):
+    path, _ = export_json
+    converter = XmlJsonConverter()
+    converter.PREVIEW_CHARS = 20
+    result = converter.convert(str(path), streaming=True)
+    assert result['text'].startswith(path.read_text(encoding='utf-8')[:20])
+    assert result['text'].endswith(f'({path.stat().st_size} bytes total)')
+    assert result['metadata']['size'] == path.stat().st_size